@@ -9,9 +9,6 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 
-import pandas as pd
-
-from quantbacktest.core.events import MarketEvent
 from quantbacktest.data import DataRequest, DataSettings
 from quantbacktest.engine import BacktestRunner, BacktestSettings, EngineMode
 from quantbacktest.metrics.analyzer import analyze_engine_result
@@ -29,18 +26,6 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def dataframe_to_events(frame: pd.DataFrame, symbol: str) -> list[MarketEvent]:
-    events = []
-    for row in frame.itertuples():
-        ts = row.timestamp
-        if not isinstance(ts, datetime):
-            ts = datetime.fromisoformat(str(ts))
-        if ts.tzinfo is None:
-            ts = ts.replace(tzinfo=timezone.utc)
-        events.append(MarketEvent(symbol=symbol, price=float(row.close), timestamp=ts.timestamp()))
-    return events
-
-
 def main() -> None:
     args = parse_args()
     symbol = "AAPL"
@@ -49,8 +34,8 @@ def main() -> None:
     data_manager = data_settings.build_manager()
     start = datetime(2020, 1, 1, tzinfo=timezone.utc)
     end = datetime(2020, 12, 31, tzinfo=timezone.utc)
-    frame = data_manager.fetch(DataRequest(symbol=symbol, start=start, end=end))
-    events = dataframe_to_events(frame, symbol)
+    arrays = data_manager.fetch_arrays(DataRequest(symbol=symbol, start=start, end=end), fields=("close",))
+    events = arrays.to_events()
 
     runner = BacktestRunner(
         strategy=AAPLMomentumStrategy(lookback=args.lookback, threshold=args.threshold),
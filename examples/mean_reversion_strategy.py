@@ -6,12 +6,12 @@ from __future__ import annotations
 
 import argparse
 import json
-from datetime import datetime, timezone
+from datetime import timezone
 from pathlib import Path
 
 import pandas as pd
 
-from quantbacktest.core.events import MarketEvent
+from quantbacktest.data import MarketArrays
 from quantbacktest.engine import BacktestRunner, BacktestSettings
 from quantbacktest.metrics.analyzer import analyze_engine_result
 from quantbacktest.strategy.mean_reversion import MeanReversionStrategy
@@ -32,22 +32,10 @@ def synthetic_msft_dataframe() -> pd.DataFrame:
     return pd.DataFrame({"timestamp": dates, "close": prices})
 
 
-def dataframe_to_events(frame: pd.DataFrame, symbol: str) -> list[MarketEvent]:
-    events = []
-    for row in frame.itertuples():
-        ts = row.timestamp
-        if isinstance(ts, str):
-            ts = datetime.fromisoformat(ts)
-        if ts.tzinfo is None:
-            ts = ts.replace(tzinfo=timezone.utc)
-        events.append(MarketEvent(symbol=symbol, price=float(row.close), timestamp=ts.timestamp()))
-    return events
-
-
 def main() -> None:
     args = parse_args()
     frame = synthetic_msft_dataframe()
-    events = dataframe_to_events(frame, "MSFT")
+    events = MarketArrays.from_frame("MSFT", frame, fields=("close",)).to_events()
     runner = BacktestRunner(
         strategy=MeanReversionStrategy(lookback=args.lookback, z_threshold=args.threshold, weights={"MSFT": 1.0}),
         settings=BacktestSettings(run_id=args.run_id),
@@ -1,8 +1,8 @@
 """Core event definitions and processing queues."""
 
-from .events import Event, EventType, FillEvent, MarketEvent, OrderEvent, SignalEvent
-from .execution import ExecutionConfig, ExecutionHandler, SimulatedExecutionHandler
-from .queue import EventQueue
+from .events import Event, EventType, FillEvent, MarketEvent, OrderEvent, SignalEvent, TimerEvent
+from .execution import ExecutionConfig, ExecutionHandler, FillBatch, SimulatedExecutionHandler, SquareRootImpactModel
+from .queue import EventQueue, EventScheduler
 
 __all__ = [
     "Event",
@@ -11,8 +11,12 @@ __all__ = [
     "MarketEvent",
     "OrderEvent",
     "SignalEvent",
+    "TimerEvent",
     "EventQueue",
+    "EventScheduler",
     "ExecutionHandler",
     "SimulatedExecutionHandler",
     "ExecutionConfig",
+    "FillBatch",
+    "SquareRootImpactModel",
 ]
@@ -10,6 +10,7 @@ class EventType(str, Enum):
     SIGNAL = "SIGNAL"
     ORDER = "ORDER"
     FILL = "FILL"
+    TIMER = "TIMER"
 
 
 @dataclass(slots=True)
@@ -23,10 +24,21 @@ class MarketEvent(Event):
     price: float
     timestamp: float
     metadata: Optional[Dict[str, float]] = None
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    volume: Optional[float] = None
 
     def __post_init__(self) -> None:
         self.event_type = EventType.MARKET
 
+    def bar_range(self) -> tuple[float, float]:
+        """(low, high) of the bar, falling back to `metadata` and then to `price`."""
+        metadata = self.metadata or {}
+        low = self.low if self.low is not None else metadata.get("low", self.price)
+        high = self.high if self.high is not None else metadata.get("high", self.price)
+        return min(low, self.price), max(high, self.price)
+
 
 @dataclass(slots=True)
 class SignalEvent(Event):
@@ -35,6 +47,11 @@ class SignalEvent(Event):
     direction: Literal["LONG", "SHORT"]
     signal_id: Optional[str] = None
     timestamp: Optional[float] = None
+    order_type: Literal["MARKET", "LIMIT", "STOP"] = "MARKET"
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    time_in_force: Literal["GTC", "DAY", "IOC"] = "GTC"
+    target_weight: Optional[float] = None
 
     def __post_init__(self) -> None:
         self.event_type = EventType.SIGNAL
@@ -46,11 +63,14 @@ class OrderEvent(Event):
     symbol: str
     quantity: int
     direction: Literal["BUY", "SELL"]
-    order_type: Literal["MARKET", "LIMIT"] = "MARKET"
+    order_type: Literal["MARKET", "LIMIT", "STOP"] = "MARKET"
     limit_price: Optional[float] = None
     signal_id: Optional[str] = None
     timestamp: Optional[float] = None
     allow_partial: bool = True
+    stop_price: Optional[float] = None
+    time_in_force: Literal["GTC", "DAY", "IOC"] = "GTC"
+    expire_at: Optional[float] = None
 
     def __post_init__(self) -> None:
         self.event_type = EventType.ORDER
@@ -70,3 +90,13 @@ class FillEvent(Event):
 
     def __post_init__(self) -> None:
         self.event_type = EventType.FILL
+
+
+@dataclass(slots=True)
+class TimerEvent(Event):
+    name: str
+    timestamp: float
+    payload: Optional[Dict[str, float]] = None
+
+    def __post_init__(self) -> None:
+        self.event_type = EventType.TIMER
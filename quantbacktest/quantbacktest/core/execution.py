@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import math
+
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .events import FillEvent, MarketEvent, OrderEvent
 
@@ -14,6 +18,10 @@ class SlippageModel:
         adjust = self.bps / 10_000
         return price * (1 + adjust) if direction == "BUY" else price * (1 - adjust)
 
+    def adjust_array(self, prices: np.ndarray, buy: np.ndarray) -> np.ndarray:
+        adjust = self.bps / 10_000
+        return np.where(buy, prices * (1 + adjust), prices * (1 - adjust))
+
 
 @dataclass(slots=True)
 class SpreadModel:
@@ -23,6 +31,10 @@ class SpreadModel:
         half = (self.bps / 10_000) * mid
         return mid - half, mid + half
 
+    def bid_ask_array(self, mid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        half = (self.bps / 10_000) * mid
+        return mid - half, mid + half
+
 
 @dataclass(slots=True)
 class CommissionModel:
@@ -31,6 +43,84 @@ class CommissionModel:
     def cost(self, quantity: int) -> float:
         return abs(quantity) * self.per_share
 
+    def cost_array(self, quantity: np.ndarray) -> np.ndarray:
+        return np.abs(quantity) * self.per_share
+
+
+@dataclass(slots=True)
+class SquareRootImpactModel:
+    """
+    Square-root market impact: `coefficient * volatility * sqrt(quantity / adv)`.
+
+    `add_series` precomputes, for every bar, the mean volume (`adv`) and the
+    standard deviation of log close-to-close returns over the `window` bars
+    before it, so pricing a fill is one bisect plus arithmetic. The result
+    is in basis points and is zero until a symbol has enough history.
+    """
+
+    coefficient: float = 1.0
+    window: int = 20
+    series: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    def add_series(self, symbol: str, timestamps: np.ndarray, close: np.ndarray, volume: np.ndarray) -> None:
+        """Register a symbol's bars; `timestamps` are ascending epoch seconds."""
+        close = np.asarray(close, dtype=float)
+        returns = np.full(len(close), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = np.log(close[1:] / close[:-1])
+        adv, _ = _trailing_moments(np.asarray(volume, dtype=float), self.window, min_periods=1)
+        _, volatility = _trailing_moments(returns, self.window, min_periods=2)
+        self.series[symbol] = (np.asarray(timestamps, dtype=float), adv, volatility)
+
+    def add_arrays(self, arrays: Any) -> None:
+        """Register a `MarketArrays` bundle with `close` and `volume` fields."""
+        self.add_series(arrays.symbol, arrays.epoch_seconds(), arrays.fields["close"], arrays.fields["volume"])
+
+    def bps(self, symbol: str, timestamp: Optional[float], quantity: int) -> float:
+        series = self.series.get(symbol)
+        if series is None or timestamp is None:
+            return 0.0
+        stamps, adv, volatility = series
+        bar = int(np.searchsorted(stamps, timestamp, side="right")) - 1
+        if bar < 0 or not adv[bar] > 0:
+            return 0.0
+        impact = self.coefficient * float(volatility[bar]) * math.sqrt(abs(quantity) / float(adv[bar])) * 10_000
+        return impact if math.isfinite(impact) else 0.0
+
+    def bps_array(self, symbols: np.ndarray, timestamps: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        out = np.zeros(len(symbols))
+        for symbol in set(symbols.tolist()):
+            series = self.series.get(symbol)
+            if series is None:
+                continue
+            rows = np.flatnonzero(symbols == symbol)
+            stamps, adv, volatility = series
+            bar = np.searchsorted(stamps, timestamps[rows], side="right") - 1
+            known = bar >= 0
+            bar = np.maximum(bar, 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                impact = self.coefficient * volatility[bar] * np.sqrt(np.abs(quantities[rows]) / adv[bar]) * 10_000
+            out[rows] = np.where(known & np.isfinite(impact), impact, 0.0)
+        return out
+
+
+def _trailing_moments(values: np.ndarray, window: int, min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and sample std of the `window` values before each position (NaN-aware)."""
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    sums = np.concatenate(([0.0], np.cumsum(filled)))
+    squares = np.concatenate(([0.0], np.cumsum(filled * filled)))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(len(values))
+    start = np.maximum(0, end - window)
+    n = counts[end] - counts[start]
+    total = sums[end] - sums[start]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(n >= max(min_periods, 1), total / n, np.nan)
+        variance = (squares[end] - squares[start] - total * total / n) / (n - 1)
+        std = np.where(n >= max(min_periods, 2), np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    return mean, std
+
 
 @dataclass(slots=True)
 class ExecutionConfig:
@@ -39,6 +129,65 @@ class ExecutionConfig:
     commissions: CommissionModel = field(default_factory=CommissionModel)
     fill_on_limit_touch: bool = True
     partial_fill_ratio: float = 1.0  # 0-1 fraction filled per event
+    resting_fill_ratio: float = 1.0  # 0-1 fraction of a resting order's remainder filled per bar
+    max_participation: Optional[float] = None  # cap on fills per bar as a fraction of bar volume
+    impact: Optional[SquareRootImpactModel] = None
+
+
+@dataclass(slots=True)
+class FillBatch:
+    """
+    Columnar fills from `SimulatedExecutionHandler.execute_batch`.
+
+    Row i is the fill `events()[i]`; rows for one order are contiguous and in
+    slice order, matching the sequence the scalar `execute` path returns.
+    """
+
+    order_id: np.ndarray
+    symbol: np.ndarray
+    quantity: np.ndarray
+    buy: np.ndarray
+    fill_price: np.ndarray
+    commission: np.ndarray
+    timestamp: np.ndarray
+    slippage_bps: float = 0.0
+    spread_bps: float = 0.0
+    impact_bps: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+    def __iter__(self) -> Iterator[FillEvent]:
+        return iter(self.events())
+
+    def signed_quantity(self) -> np.ndarray:
+        return np.where(self.buy, self.quantity, -self.quantity)
+
+    def events(self) -> List[FillEvent]:
+        impact = self.impact_bps if self.impact_bps is not None else np.zeros(len(self))
+        return [
+            FillEvent(
+                order_id=order_id,
+                symbol=symbol,
+                quantity=quantity,
+                direction="BUY" if buy else "SELL",
+                fill_price=price,
+                commission=commission,
+                slippage_bps=self.slippage_bps + impact_bps,
+                spread_bps=self.spread_bps,
+                timestamp=timestamp,
+            )
+            for order_id, symbol, quantity, buy, price, commission, timestamp, impact_bps in zip(
+                self.order_id.tolist(),
+                self.symbol.tolist(),
+                self.quantity.tolist(),
+                self.buy.tolist(),
+                self.fill_price.tolist(),
+                self.commission.tolist(),
+                self.timestamp.tolist(),
+                impact.tolist(),
+            )
+        ]
 
 
 class ExecutionHandler:
@@ -51,7 +200,10 @@ class ExecutionHandler:
 class SimulatedExecutionHandler(ExecutionHandler):
     """
     Deterministic execution model with configurable slippage/spread/commission assumptions.
-    Supports partial fills using `partial_fill_ratio`.
+    Supports partial fills using `partial_fill_ratio`. With `max_participation`
+    and a bar `volume`, at most that fraction of the bar trades; `OrderBook`
+    carries the remainder to later bars. An `impact` model adds square-root
+    market impact on top of the fixed slippage.
     """
 
     def __init__(self, config: ExecutionConfig | None = None) -> None:
@@ -65,30 +217,132 @@ class SimulatedExecutionHandler(ExecutionHandler):
         if execution_price is None:
             return []
 
-        fills: List[FillEvent] = []
-        remaining = order.quantity
+        quantity = order.quantity
+        capacity = self.capacity(market)
+        if capacity is not None:
+            quantity = min(quantity, capacity)
+        return [self.fill(order, part, execution_price, market.timestamp) for part in self.slices(quantity)]
+
+    def slices(self, quantity: int) -> List[int]:
+        """Split `quantity` into the partial fills `partial_fill_ratio` produces."""
+        parts: List[int] = []
+        remaining = quantity
         while remaining > 0:
             fill_qty = max(1, int(remaining * self.config.partial_fill_ratio))
             fill_qty = min(fill_qty, remaining)
-            price = self._apply_transaction_costs(order.direction, execution_price)
-            commission = self.config.commissions.cost(fill_qty)
-            fills.append(
-                FillEvent(
-                    order_id=order.order_id,
-                    symbol=order.symbol,
-                    quantity=fill_qty,
-                    direction=order.direction,
-                    fill_price=price,
-                    commission=commission,
-                    slippage_bps=self.config.slippage.bps,
-                    spread_bps=self.config.spread.bps,
-                    timestamp=market.timestamp,
-                )
-            )
+            parts.append(fill_qty)
             remaining -= fill_qty
             if self.config.partial_fill_ratio >= 1.0:
                 break
-        return fills
+        return parts
+
+    def execute_batch(self, orders: Sequence[OrderEvent], markets: Mapping[str, MarketEvent]) -> FillBatch:
+        """
+        Execute many orders against the latest `MarketEvent` per symbol in one pass.
+
+        Bid/ask, limit checks, slippage, commission and partial-fill slicing are
+        numpy operations over all orders, so the result matches calling
+        `execute` order by order (same fills, same order, same floats) without
+        per-order Python work. Orders whose symbol has no market are skipped.
+        Custom cost models must implement the `*_array` counterparts.
+        """
+        config = self.config
+        count = len(orders)
+        mid = np.full(count, np.nan)
+        stamps = np.full(count, np.nan)
+        volume = np.full(count, np.nan)
+        for row, order in enumerate(orders):
+            market = markets.get(order.symbol)
+            if market is not None:
+                mid[row] = market.price
+                stamps[row] = market.timestamp
+                if market.volume is not None:
+                    volume[row] = market.volume
+        buy = np.fromiter((order.direction == "BUY" for order in orders), dtype=bool, count=count)
+        is_market = np.fromiter((order.order_type == "MARKET" for order in orders), dtype=bool, count=count)
+        limit = np.fromiter(
+            (np.nan if order.limit_price is None else order.limit_price for order in orders), dtype=float, count=count
+        )
+        quantity = np.fromiter((order.quantity for order in orders), dtype=np.int64, count=count)
+        if config.max_participation is not None:
+            capped = ~np.isnan(volume)
+            capacity = np.maximum(0, np.where(capped, volume * config.max_participation, 0.0).astype(np.int64))
+            quantity = np.where(capped, np.minimum(quantity, capacity), quantity)
+
+        bid, ask = config.spread.bid_ask_array(mid)
+        if config.fill_on_limit_touch:
+            limit_ok = np.where(buy, mid <= limit, mid >= limit)
+        else:
+            limit_ok = np.where(buy, mid < limit, mid > limit)
+        price = np.where(is_market, np.where(buy, ask, bid), limit)
+        rows = np.flatnonzero(~np.isnan(mid) & (is_market | limit_ok) & (quantity > 0))
+
+        # Slice every order at once; iterations scale with the slice count, not the order count.
+        ratio = config.partial_fill_ratio
+        parts_row, parts_qty, parts_step = [], [], []
+        remaining, active, step = quantity[rows], rows, 0
+        while len(active):
+            sliced = np.minimum(np.maximum(1, (remaining * ratio).astype(np.int64)), remaining)
+            parts_row.append(active)
+            parts_qty.append(sliced)
+            parts_step.append(np.full(len(active), step))
+            if ratio >= 1.0:
+                break
+            remaining = remaining - sliced
+            keep = remaining > 0
+            active, remaining, step = active[keep], remaining[keep], step + 1
+        fill_rows = np.concatenate(parts_row) if parts_row else rows
+        fill_qty = np.concatenate(parts_qty) if parts_qty else np.zeros(0, dtype=np.int64)
+        if parts_step:
+            ranking = np.lexsort((np.concatenate(parts_step), fill_rows))
+            fill_rows, fill_qty = fill_rows[ranking], fill_qty[ranking]
+
+        fill_buy = buy[fill_rows]
+        fill_symbols = np.array([orders[row].symbol for row in fill_rows.tolist()], dtype=object)
+        fill_stamps = stamps[fill_rows]
+        fill_price = config.slippage.adjust_array(price[fill_rows], fill_buy)
+        impact = None
+        if config.impact is not None:
+            impact = config.impact.bps_array(fill_symbols, fill_stamps, fill_qty)
+            fill_price = np.where(impact != 0, _apply_impact_array(fill_price, fill_buy, impact), fill_price)
+        return FillBatch(
+            order_id=np.array([orders[row].order_id for row in fill_rows.tolist()], dtype=object),
+            symbol=fill_symbols,
+            quantity=fill_qty,
+            buy=fill_buy,
+            fill_price=fill_price,
+            commission=config.commissions.cost_array(fill_qty),
+            timestamp=fill_stamps,
+            slippage_bps=config.slippage.bps,
+            spread_bps=config.spread.bps,
+            impact_bps=impact,
+        )
+
+    def fill(self, order: OrderEvent, quantity: int, execution_price: float, timestamp: Optional[float]) -> FillEvent:
+        """Build a fill for `quantity` at `execution_price` plus slippage, impact and commission."""
+        impact = 0.0 if self.config.impact is None else self.config.impact.bps(order.symbol, timestamp, quantity)
+        return FillEvent(
+            order_id=order.order_id,
+            symbol=order.symbol,
+            quantity=quantity,
+            direction=order.direction,
+            fill_price=self._apply_transaction_costs(order.direction, execution_price, impact),
+            commission=self.config.commissions.cost(quantity),
+            slippage_bps=self.config.slippage.bps + impact,
+            spread_bps=self.config.spread.bps,
+            timestamp=timestamp,
+        )
+
+    def capacity(self, market: MarketEvent) -> Optional[int]:
+        """Shares one bar can absorb under `max_participation`, or None when uncapped."""
+        if self.config.max_participation is None or market.volume is None:
+            return None
+        return max(0, int(market.volume * self.config.max_participation))
+
+    def market_price(self, direction: str, mid: float) -> float:
+        """Price a marketable order crosses at: the ask for buys, the bid for sells."""
+        bid, ask = self.config.spread.bid_ask(mid)
+        return ask if direction == "BUY" else bid
 
     def _price_with_limit_checks(self, order: OrderEvent, market_price: float) -> Optional[float]:
         bid, ask = self.config.spread.bid_ask(market_price)
@@ -110,5 +364,14 @@ class SimulatedExecutionHandler(ExecutionHandler):
                 return order.limit_price
         return None
 
-    def _apply_transaction_costs(self, direction: str, price: float) -> float:
-        return self.config.slippage.adjust(price, direction)
+    def _apply_transaction_costs(self, direction: str, price: float, impact_bps: float = 0.0) -> float:
+        price = self.config.slippage.adjust(price, direction)
+        if impact_bps:
+            adjust = impact_bps / 10_000
+            price = price * (1 + adjust) if direction == "BUY" else price * (1 - adjust)
+        return price
+
+
+def _apply_impact_array(price: np.ndarray, buy: np.ndarray, impact_bps: np.ndarray) -> np.ndarray:
+    adjust = impact_bps / 10_000
+    return np.where(buy, price * (1 + adjust), price * (1 - adjust))
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right, insort
+import dataclasses
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .events import FillEvent, MarketEvent, OrderEvent
+from .execution import SimulatedExecutionHandler
+
+_SECONDS_PER_DAY = 86_400.0
+
+# Each side book is a list of (key, sequence, order_id) kept sorted ascending, where
+# the key is chosen so that "crossed" always means key <= threshold:
+#   buy limit  key=-limit  crossed when low  <= limit
+#   sell limit key=+limit  crossed when high >= limit
+#   buy stop   key=+stop   crossed when high >= stop
+#   sell stop  key=-stop   crossed when low  <= stop
+# Market orders only rest while a participation cap holds them back; they
+# queue by time (key 0.0) and are matched on every bar.
+_Entry = Tuple[float, int, str]
+
+
+@dataclass(slots=True)
+class _SymbolBook:
+    buy_limits: List[_Entry] = field(default_factory=list)
+    sell_limits: List[_Entry] = field(default_factory=list)
+    buy_stops: List[_Entry] = field(default_factory=list)
+    sell_stops: List[_Entry] = field(default_factory=list)
+    market_orders: List[_Entry] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _Resting:
+    order: OrderEvent
+    remaining: int
+    side: List[_Entry]
+    entry: _Entry
+
+
+class OrderBook:
+    """
+    Resting LIMIT and STOP orders, per symbol, in price-sorted books.
+
+    On each `MarketEvent` only orders whose price was crossed are visited:
+    a bisect finds the crossed prefix of each side book, so matching costs
+    O(log n + k) for k crossed orders. The bar's range comes from
+    `metadata["low"]`/`metadata["high"]` when present, else the event price.
+    A new order was created at the close of the bar it is submitted with, so
+    on submit it is only checked against that bar's close; its range is
+    used from the next bar on.
+    Limits fill at their limit price; triggered stops fill as market orders
+    at the worse of the stop and the bar price. Crossed orders fill in
+    price-time priority within each side. Without a volume model each
+    resting order fills `resting_fill_ratio` of its remainder per bar (all
+    of it by default), and the rest carries over. With
+    `ExecutionConfig.max_participation`, all orders on a symbol share that
+    fraction of each bar's volume; market orders that exceed it rest too and
+    fill from later bars. DAY orders expire at the next UTC midnight, and IOC
+    orders are cancelled if they cannot fill on submission. `on_close` is
+    called with the order id whenever an order leaves the book, whether it
+    filled, was cancelled or expired (but not when it is replaced).
+    `on_replace` sees each amended order before it is resubmitted and
+    returns the order to submit (possibly resized), or None to drop it.
+    """
+
+    def __init__(
+        self,
+        handler: SimulatedExecutionHandler,
+        on_close: Optional[Callable[[str], None]] = None,
+        on_replace: Optional[Callable[[OrderEvent], Optional[OrderEvent]]] = None,
+    ) -> None:
+        self.handler = handler
+        self.on_close = on_close
+        self.on_replace = on_replace
+        self._books: Dict[str, _SymbolBook] = {}
+        self._orders: Dict[str, _Resting] = {}
+        self._expiries: List[Tuple[float, int, str]] = []
+        self._sequence = count()
+        self._volume_used: Dict[str, Tuple[float, int]] = {}
+        self.expired: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._orders
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[OrderEvent]:
+        return [
+            dataclasses.replace(resting.order, quantity=resting.remaining)
+            for resting in self._orders.values()
+            if symbol is None or resting.order.symbol == symbol
+        ]
+
+    def submit(self, order: OrderEvent, market: Optional[MarketEvent] = None) -> List[FillEvent]:
+        """Execute a marketable order now, or rest it until its price is crossed."""
+        if order.order_type == "MARKET" and (market is None or self.handler.capacity(market) is None):
+            return self.handler.execute(order, market) if market is not None else []
+        if order.order_type == "LIMIT" and order.limit_price is None:
+            raise ValueError(f"limit order {order.order_id} needs a limit_price")
+        if order.order_type == "STOP" and order.stop_price is None:
+            raise ValueError(f"stop order {order.order_id} needs a stop_price")
+        if order.order_id in self._orders:
+            raise ValueError(f"order {order.order_id} is already resting")
+
+        resting = self._rest(order)
+        fills: List[FillEvent] = []
+        # Only the new order is checked here; the rest of the book already saw this bar.
+        if market is not None and self._crossed(resting, market, on_submit=True):
+            fills.extend(self._fill(resting, market))
+            if resting.remaining == 0:
+                self.cancel(order.order_id)
+        if order.time_in_force == "IOC" and order.order_id in self._orders:
+            self.cancel(order.order_id)
+        return fills
+
+    def cancel(self, order_id: str) -> Optional[OrderEvent]:
+        cancelled = self._remove(order_id)
+        if cancelled is not None and self.on_close is not None:
+            self.on_close(order_id)
+        return cancelled
+
+    def replace(
+        self,
+        order_id: str,
+        quantity: Optional[int] = None,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        market: Optional[MarketEvent] = None,
+    ) -> List[FillEvent]:
+        """Cancel/replace: the amended order loses its time priority, as on a venue."""
+        original = self._remove(order_id)
+        if original is None:
+            raise KeyError(order_id)
+        amended = dataclasses.replace(
+            original,
+            quantity=original.quantity if quantity is None else quantity,
+            limit_price=original.limit_price if limit_price is None else limit_price,
+            stop_price=original.stop_price if stop_price is None else stop_price,
+        )
+        if self.on_replace is not None:
+            checked = self.on_replace(amended)
+            if checked is None:
+                if self.on_close is not None:
+                    self.on_close(order_id)
+                return []
+            amended = checked
+        return self.submit(amended, market)
+
+    def on_market(self, market: MarketEvent) -> List[FillEvent]:
+        """Expire due orders, then fill every resting order this bar crossed."""
+        self._expire(market.timestamp)
+        if market.symbol not in self._books:
+            return []
+        return self._match(market.symbol, market)
+
+    # --- internal helpers -------------------------------------------------
+    def _remove(self, order_id: str) -> Optional[OrderEvent]:
+        resting = self._orders.pop(order_id, None)
+        if resting is None:
+            return None
+        index = bisect_left(resting.side, resting.entry)
+        if index < len(resting.side) and resting.side[index] == resting.entry:
+            del resting.side[index]
+        return dataclasses.replace(resting.order, quantity=resting.remaining)
+
+    def _rest(self, order: OrderEvent) -> _Resting:
+        book = self._books.setdefault(order.symbol, _SymbolBook())
+        buy = order.direction == "BUY"
+        if order.order_type == "MARKET":
+            side, key = book.market_orders, 0.0
+        elif order.order_type == "LIMIT":
+            price = float(order.limit_price)  # type: ignore[arg-type]
+            side, key = (book.buy_limits, -price) if buy else (book.sell_limits, price)
+        else:
+            price = float(order.stop_price)  # type: ignore[arg-type]
+            side, key = (book.buy_stops, price) if buy else (book.sell_stops, -price)
+        entry = (key, next(self._sequence), order.order_id)
+        insort(side, entry)
+        resting = _Resting(order=order, remaining=order.quantity, side=side, entry=entry)
+        self._orders[order.order_id] = resting
+        expire_at = order.expire_at
+        if expire_at is None and order.time_in_force == "DAY" and order.timestamp is not None:
+            expire_at = (math.floor(order.timestamp / _SECONDS_PER_DAY) + 1) * _SECONDS_PER_DAY
+        if expire_at is not None:
+            heapq.heappush(self._expiries, (expire_at, entry[1], order.order_id))
+        return resting
+
+    def _expire(self, now: float) -> None:
+        while self._expiries and self._expiries[0][0] <= now:
+            _, _, order_id = heapq.heappop(self._expiries)
+            if self.cancel(order_id) is not None:
+                self.expired.append(order_id)
+
+    def _match(self, symbol: str, market: MarketEvent) -> List[FillEvent]:
+        book = self._books[symbol]
+        low, high = market.bar_range()
+        touch = self.handler.config.fill_on_limit_touch
+        crossed: List[_Entry] = list(book.market_orders)
+        for side, threshold, inclusive in (
+            (book.buy_limits, -low, touch),
+            (book.sell_limits, high, touch),
+            (book.buy_stops, high, True),
+            (book.sell_stops, -low, True),
+        ):
+            if inclusive:
+                end = bisect_right(side, (threshold, math.inf, ""))
+            else:
+                end = bisect_left(side, (threshold, -math.inf, ""))
+            crossed.extend(side[:end])
+
+        fills: List[FillEvent] = []
+        for entry in crossed:
+            resting = self._orders.get(entry[2])
+            if resting is None:
+                continue
+            fills.extend(self._fill(resting, market))
+            if resting.remaining == 0:
+                self.cancel(resting.order.order_id)
+        return fills
+
+    def _crossed(self, resting: _Resting, market: MarketEvent, on_submit: bool = False) -> bool:
+        order = resting.order
+        if order.order_type == "MARKET":
+            return True
+        # The bar's earlier range happened before the order existed.
+        low, high = (market.price, market.price) if on_submit else market.bar_range()
+        # Buy limits and sell stops trigger on the bar's low (keys are negated prices).
+        threshold = -low if (order.direction == "BUY") == (order.order_type == "LIMIT") else high
+        key = resting.entry[0]
+        inclusive = order.order_type == "STOP" or self.handler.config.fill_on_limit_touch
+        return key <= threshold if inclusive else key < threshold
+
+    def _fill(self, resting: _Resting, market: MarketEvent) -> List[FillEvent]:
+        order = resting.order
+        available = self._available(market)
+        if order.order_type == "MARKET":
+            quantity = resting.remaining if available is None else min(resting.remaining, available)
+            fills = self.handler.execute(dataclasses.replace(order, quantity=quantity), market) if quantity else []
+            filled = sum(fill.quantity for fill in fills)
+            resting.remaining -= filled
+            self._consume(market, filled)
+            return fills
+        if order.order_type == "LIMIT":
+            price = float(order.limit_price)  # type: ignore[arg-type]
+        else:
+            stop = float(order.stop_price)  # type: ignore[arg-type]
+            reference = max(stop, market.price) if order.direction == "BUY" else min(stop, market.price)
+            price = self.handler.market_price(order.direction, reference)
+        ratio = self.handler.config.resting_fill_ratio
+        quantity = resting.remaining
+        if order.allow_partial and ratio < 1.0:
+            quantity = min(resting.remaining, max(1, math.ceil(resting.remaining * ratio)))
+        if available is not None:
+            quantity = min(quantity, available)
+        if quantity <= 0:
+            return []
+        resting.remaining -= quantity
+        self._consume(market, quantity)
+        return [self.handler.fill(order, quantity, price, market.timestamp)]
+
+    def _available(self, market: MarketEvent) -> Optional[int]:
+        """Shares this bar can still absorb across all orders on the symbol (None: uncapped)."""
+        capacity = self.handler.capacity(market)
+        if capacity is None:
+            return None
+        stamp, used = self._volume_used.get(market.symbol, (market.timestamp, 0))
+        return capacity - used if stamp == market.timestamp else capacity
+
+    def _consume(self, market: MarketEvent, quantity: int) -> None:
+        if self.handler.capacity(market) is None:
+            return
+        stamp, used = self._volume_used.get(market.symbol, (market.timestamp, 0))
+        used = used if stamp == market.timestamp else 0
+        self._volume_used[market.symbol] = (market.timestamp, used + quantity)
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import heapq
 from collections import deque
-from typing import Deque, Iterator, Optional
+from itertools import count
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
 
-from .events import Event
+from .events import Event, EventType
+
+# Default tie-breakers for events sharing a timestamp: new market data is
+# applied before timers fire and before orders are matched against it.
+EVENT_PRIORITY = {
+    EventType.MARKET: 0,
+    EventType.TIMER: 1,
+    EventType.SIGNAL: 2,
+    EventType.ORDER: 3,
+    EventType.FILL: 4,
+}
 
 
 class EventQueue:
@@ -26,3 +38,73 @@ class EventQueue:
     def __iter__(self) -> Iterator[Event]:
         while self._queue:
             yield self._queue.popleft()
+
+
+class EventScheduler:
+    """
+    Heap-ordered event scheduler keyed by (timestamp, priority, sequence).
+
+    Events pop in timestamp order; ties go to the lower priority (see
+    `EVENT_PRIORITY`) and then to insertion order, so simultaneous events
+    are deterministic. `now` is the timestamp of the last popped event and
+    nothing may be scheduled before it. Push and pop are O(log n).
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, int, Event]] = []
+        self._sequence = count()
+        self.now = float("-inf")
+
+    def schedule_at(self, event: Event, timestamp: float, priority: Optional[int] = None) -> None:
+        if timestamp < self.now:
+            raise ValueError(f"cannot schedule at {timestamp}; clock is already at {self.now}")
+        rank = EVENT_PRIORITY.get(event.event_type, 0) if priority is None else priority
+        heapq.heappush(self._heap, (timestamp, rank, next(self._sequence), event))
+
+    def schedule_after(self, event: Event, delay: float, priority: Optional[int] = None) -> None:
+        if delay < 0:
+            raise ValueError("delay cannot be negative")
+        if self.now == float("-inf"):
+            raise RuntimeError("schedule_after needs a current time; pop an event first")
+        self.schedule_at(event, self.now + delay, priority)
+
+    def put(self, event: Event, priority: Optional[int] = None) -> None:
+        """Schedule at the event's own `timestamp`, or at `now` when it has none."""
+        timestamp = getattr(event, "timestamp", None)
+        self.schedule_at(event, self.now if timestamp is None else timestamp, priority)
+
+    def extend(self, events: Iterable[Event]) -> None:
+        """Bulk-schedule timestamped events in O(n) with a single heapify."""
+        for event in events:
+            timestamp = getattr(event, "timestamp", None)
+            if timestamp is None or timestamp < self.now:
+                raise ValueError("bulk-scheduled events need a timestamp at or after the clock")
+            self._heap.append((timestamp, EVENT_PRIORITY.get(event.event_type, 0), next(self._sequence), event))
+        heapq.heapify(self._heap)
+
+    def get(self) -> Optional[Event]:
+        if not self._heap:
+            return None
+        timestamp, _, _, event = heapq.heappop(self._heap)
+        self.now = timestamp
+        return event
+
+    def pop_batch(self) -> Tuple[float, List[Event]]:
+        """Pop every event scheduled at the earliest timestamp, in (priority, sequence) order."""
+        if not self._heap:
+            raise IndexError("pop from an empty scheduler")
+        timestamp = self._heap[0][0]
+        batch: List[Event] = []
+        while self._heap and self._heap[0][0] == timestamp:
+            batch.append(heapq.heappop(self._heap)[3])
+        self.now = timestamp
+        return timestamp, batch
+
+    def peek_time(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def peek(self) -> Optional[Event]:
+        return self._heap[0][3] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
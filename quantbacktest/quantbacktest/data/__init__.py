@@ -6,14 +6,23 @@ and provider fallbacks. Step 1 exposes only light scaffolding so later
 milestones can plug in full-featured providers without touching callers.
 """
 
+from .arrays import MarketArrays
+from .asof import AsOfJoiner, SideTable
 from .cache import LocalDataCache
+from .dtypes import DtypePolicy, DtypeReport
 from .manager import DataManager
+from .manifest import CacheManifest
+from .prefetch import Prefetcher
+from .panel import PanelLoader, UniversePanel
+from .resample import ResamplingProvider, resample_bars
+from .resilience import CircuitBreaker, NegativeCache
+from .snapshots import DatasetSnapshot, SnapshotProvider, SnapshotStore
 from .settings import DataSettings, ProviderConfig
 from .providers.base import DataProvider, DataRequest
 from .providers.local_csv import LocalCSVProvider
 from .providers.yahoo import YahooFinanceProvider
 from .validator import DataValidator, DataValidationError
-from .errors import DataFetchError, DataProviderError
+from .errors import DataFetchError, DataNotFoundError, DataProviderError
 
 __all__ = [
     "DataManager",
@@ -22,10 +31,27 @@ __all__ = [
     "DataProvider",
     "DataRequest",
     "LocalDataCache",
+    "CacheManifest",
+    "DtypePolicy",
+    "DtypeReport",
+    "MarketArrays",
+    "AsOfJoiner",
+    "SideTable",
+    "Prefetcher",
+    "PanelLoader",
+    "UniversePanel",
     "LocalCSVProvider",
     "DataValidator",
     "DataValidationError",
     "DataFetchError",
     "DataProviderError",
+    "DataNotFoundError",
+    "CircuitBreaker",
+    "NegativeCache",
     "YahooFinanceProvider",
+    "ResamplingProvider",
+    "resample_bars",
+    "SnapshotStore",
+    "SnapshotProvider",
+    "DatasetSnapshot",
 ]
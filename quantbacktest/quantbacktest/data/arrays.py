@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..core.events import MarketEvent
+from .errors import DataValidationError
+
+_UNITS_PER_SECOND = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+@dataclass(slots=True)
+class MarketArrays:
+    """
+    Engine-ready columnar view of a validated frame.
+
+    `timestamps` are int64 UTC epoch ticks in `unit` and each entry of `fields`
+    is a contiguous float64 array. Both share memory with the source frame
+    whenever its dtypes already match, so building this view copies nothing.
+    """
+
+    symbol: str
+    timestamps: np.ndarray
+    unit: str
+    fields: Dict[str, np.ndarray]
+
+    @classmethod
+    def from_frame(
+        cls,
+        symbol: str,
+        frame: pd.DataFrame,
+        fields: Sequence[str] = ("open", "high", "low", "close", "volume"),
+    ) -> "MarketArrays":
+        timestamps = frame["timestamp"]
+        if not isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+            raise DataValidationError("timestamps must be timezone-aware; validate the frame first")
+        return cls(
+            symbol=symbol.upper(),
+            timestamps=timestamps.array.asi8,
+            unit=timestamps.dtype.unit,
+            fields={name: np.ascontiguousarray(frame[name].to_numpy(dtype="float64", copy=False)) for name in fields},
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def epoch_seconds(self) -> np.ndarray:
+        return self.timestamps / _UNITS_PER_SECOND[self.unit]
+
+    def epoch_ns(self) -> np.ndarray:
+        return self.timestamps * (1_000_000_000 // _UNITS_PER_SECOND[self.unit])
+
+    def to_events(self, price_field: str = "close", metadata_fields: Sequence[str] = ()) -> List[MarketEvent]:
+        """
+        Build `MarketEvent`s with vectorized conversions and no per-row parsing.
+
+        `open`/`high`/`low`/`volume` are copied onto each event when those
+        fields are present. `metadata_fields` (e.g. columns added by
+        `AsOfJoiner.join_arrays`) are copied into each event's `metadata`,
+        skipping NaN (not yet known) values.
+        """
+        symbol = self.symbol
+        prices = self.fields[price_field].tolist()
+        seconds = self.epoch_seconds().tolist()
+        opens, highs, lows, volumes = (
+            self.fields[name].tolist() if name in self.fields else repeat(None)
+            for name in ("open", "high", "low", "volume")
+        )
+        if not metadata_fields:
+            return [
+                MarketEvent(symbol, price, ts, None, *bar)
+                for price, ts, *bar in zip(prices, seconds, opens, highs, lows, volumes)
+            ]
+        columns = [(name, self.fields[name].tolist()) for name in metadata_fields]
+        return [
+            MarketEvent(
+                symbol,
+                price,
+                ts,
+                {name: values[row] for name, values in columns if values[row] == values[row]},
+                *bar,
+            )
+            for row, (price, ts, *bar) in enumerate(zip(prices, seconds, opens, highs, lows, volumes))
+        ]
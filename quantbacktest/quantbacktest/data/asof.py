@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .arrays import MarketArrays
+from .cache import LocalDataCache
+from .manifest import frame_hash, timestamp_ns
+from .panel import UniversePanel
+
+
+@dataclass(slots=True)
+class SideTable:
+    """
+    A sparse, timestamped table (fundamentals, sentiment, borrow rates, ...).
+
+    A row becomes visible at `time_column + publication_lag`, or at
+    `available_column` when the source records its own publication time.
+    Rows older than `max_age` at the event time are treated as missing.
+    Without a `symbol_column` every row applies to all symbols.
+    """
+
+    name: str
+    frame: pd.DataFrame
+    fields: Sequence[str]
+    time_column: str = "timestamp"
+    symbol_column: Optional[str] = "symbol"
+    publication_lag: Union[str, pd.Timedelta] = "0s"
+    available_column: Optional[str] = None
+    max_age: Optional[Union[str, pd.Timedelta]] = None
+
+    def column_name(self, field: str) -> str:
+        return f"{self.name}_{field}"
+
+    def fingerprint(self) -> str:
+        spec = {
+            "name": self.name,
+            "content": frame_hash(self.frame),
+            "fields": list(self.fields),
+            "time": self.time_column,
+            "symbol": self.symbol_column,
+            "lag": pd.Timedelta(self.publication_lag).value,
+            "available": self.available_column,
+            "max_age": None if self.max_age is None else pd.Timedelta(self.max_age).value,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class AsOfJoiner:
+    """
+    Point-in-time join of side tables onto an event timeline.
+
+    Each event receives, per field, the latest side-table value whose
+    visibility time is at or before the event timestamp, so nothing is seen
+    before it was published. Side tables are sorted once and events are
+    matched with `searchsorted` per symbol, i.e. O((n + m) log m) instead of
+    a per-event scan. Results are cached as array bundles keyed by the side
+    table's content, the join settings, and the event timeline.
+    """
+
+    def __init__(self, tables: Sequence[SideTable], cache: Optional[LocalDataCache] = None) -> None:
+        names = [table.name for table in tables]
+        if len(set(names)) != len(names):
+            raise ValueError("side table names must be unique")
+        self.tables = list(tables)
+        self.cache = cache
+
+    def join(self, timestamps_ns: np.ndarray, symbols: Union[str, Sequence[str], np.ndarray]) -> Dict[str, np.ndarray]:
+        """Return `{"<table>_<field>": float64 array}` aligned with `timestamps_ns` (NaN where unknown)."""
+        ticks = np.asarray(timestamps_ns, dtype=np.int64)
+        if isinstance(symbols, str):
+            targets = np.full(len(ticks), symbols.upper())
+        else:
+            targets = np.char.upper(np.asarray(symbols, dtype=str))
+        if len(targets) != len(ticks):
+            raise ValueError("symbols and timestamps must have the same length")
+        joined: Dict[str, np.ndarray] = {}
+        for table in self.tables:
+            joined.update(self._join_table(table, ticks, targets))
+        return joined
+
+    def join_frame(self, frame: pd.DataFrame, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Append joined columns to a frame with `timestamp` (and `symbol` unless given)."""
+        symbols = symbol if symbol is not None else frame["symbol"].astype(str).to_numpy()
+        return frame.assign(**self.join(timestamp_ns(frame["timestamp"]), symbols))
+
+    def join_arrays(self, arrays: MarketArrays) -> MarketArrays:
+        """Return `arrays` with the joined columns added to `fields`."""
+        return replace(arrays, fields={**arrays.fields, **self.join(arrays.epoch_ns(), arrays.symbol)})
+
+    def join_panel(self, panel: UniversePanel) -> Dict[str, np.ndarray]:
+        """Joined fields as (time x symbol) matrices on the panel grid."""
+        rows, cols = len(panel.timestamps), len(panel.symbols)
+        flat = self.join(np.repeat(panel.timestamps, cols), np.tile(np.asarray(panel.symbols, dtype=str), rows))
+        return {name: values.reshape(rows, cols) for name, values in flat.items()}
+
+    def _join_table(self, table: SideTable, ticks: np.ndarray, targets: np.ndarray) -> Dict[str, np.ndarray]:
+        key = None
+        if self.cache is not None:
+            digest = hashlib.sha256(table.fingerprint().encode("utf-8"))
+            digest.update(ticks.tobytes())
+            digest.update("\0".join(targets.tolist()).encode("utf-8"))
+            key = f"asof_{table.name}_{digest.hexdigest()[:24]}"
+            cached = self.cache.load_arrays(key)
+            if cached is not None:
+                return cached
+
+        frame = table.frame
+        if table.available_column is not None:
+            visible = timestamp_ns(frame[table.available_column])
+        else:
+            visible = timestamp_ns(frame[table.time_column]) + pd.Timedelta(table.publication_lag).value
+        if table.symbol_column is not None:
+            owners = frame[table.symbol_column].astype(str).str.upper().to_numpy(dtype=str)
+        else:
+            owners = np.full(len(frame), "", dtype=str)
+        values = [frame[field].to_numpy(dtype="float64") for field in table.fields]
+
+        # Sort once by (symbol, visibility time); stable so later duplicates win.
+        order = np.lexsort((visible, owners))
+        owners, visible = owners[order], visible[order]
+        values = [column[order] for column in values]
+
+        out = [np.full(len(ticks), np.nan) for _ in table.fields]
+        max_age = None if table.max_age is None else pd.Timedelta(table.max_age).value
+        groups: List[Tuple[str, np.ndarray]]
+        if table.symbol_column is None:
+            groups = [("", np.arange(len(ticks)))]
+        else:
+            unique, inverse = np.unique(targets, return_inverse=True)
+            by_symbol = np.argsort(inverse, kind="stable")
+            bounds = np.searchsorted(inverse[by_symbol], np.arange(len(unique) + 1))
+            groups = [(str(symbol), by_symbol[bounds[code] : bounds[code + 1]]) for code, symbol in enumerate(unique)]
+        for owner, rows in groups:
+            lo, hi = np.searchsorted(owners, owner, side="left"), np.searchsorted(owners, owner, side="right")
+            if lo == hi:
+                continue
+            match = np.searchsorted(visible[lo:hi], ticks[rows], side="right") - 1
+            found = match >= 0
+            if max_age is not None:
+                found &= ticks[rows] - visible[lo:hi][np.maximum(match, 0)] <= max_age
+            hit_rows, source = rows[found], lo + match[found]
+            for column, target in zip(values, out):
+                target[hit_rows] = column[source]
+
+        joined = {table.column_name(field): column for field, column in zip(table.fields, out)}
+        if key is not None and self.cache is not None:
+            self.cache.store_arrays(key, joined)
+        return joined
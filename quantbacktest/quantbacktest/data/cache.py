@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from typing_extensions import Self
+
+from .cache_index import CacheEntry, CacheIndex
+from .locks import FileLock
+from .manifest import CacheManifest, timestamp_ns
+
 
 @dataclass(slots=True)
 class LocalDataCache:
@@ -15,18 +24,40 @@ class LocalDataCache:
     Later steps will extend this to store parquet/feather data and perform
     schema checks. For the skeleton we focus on deterministic read/write and
     easy dependency injection for tests.
+
+    Every entry is tracked in a SQLite `CacheIndex` (`index.sqlite`), which
+    answers existence checks and drives LRU eviction once the cache grows
+    past `max_bytes`. `close()` (or leaving a `with` block) closes the index.
     """
 
     root: Path
     serializer: Callable[[Dict[str, Any]], str] = json.dumps
     deserializer: Callable[[str], Dict[str, Any]] = json.loads
     frame_suffix: str = "csv"
+    max_bytes: Optional[int] = None
     frames_dir: Path = field(init=False)
+    arrays_dir: Path = field(init=False)
+    index: CacheIndex = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.root.mkdir(parents=True, exist_ok=True)
         self.frames_dir = self.root / "frames"
         self.frames_dir.mkdir(parents=True, exist_ok=True)
+        self.arrays_dir = self.root / "arrays"
+        index_path = self.root / "index.sqlite"
+        adopt = not index_path.exists()
+        self.index = CacheIndex(index_path)
+        if adopt:
+            self._adopt_existing()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.index.close()
 
     def _path_for(self, key: str) -> Path:
         if not key:
@@ -38,32 +69,292 @@ class LocalDataCache:
         safe_key = key.replace("/", "_")
         return self.frames_dir / f"{safe_key}.{self.frame_suffix}"
 
+    def _manifest_path_for(self, key: str) -> Path:
+        safe_key = key.replace("/", "_")
+        return self.frames_dir / f"{safe_key}.manifest.json"
+
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Return cached data if present."""
         path = self._path_for(key)
-        if not path.exists():
+        try:
+            payload = self.deserializer(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
             return None
-        return self.deserializer(path.read_text(encoding="utf-8"))
+        self._touch("json", key, path)
+        return payload
 
     def set(self, key: str, payload: Dict[str, Any]) -> None:
         """Persist normalized data to disk."""
         path = self._path_for(key)
-        path.write_text(self.serializer(payload), encoding="utf-8")
+        _atomic_write(path, lambda tmp: tmp.write_text(self.serializer(payload), encoding="utf-8"))
+        self.index.record("json", key, _size(path))
+        self.prune(keep=("json", key))
+
+    def contains(self, key: str, kind: str = "frame") -> bool:
+        """Index-only existence check; no filesystem access."""
+        return self.index.contains(kind, key)
 
     def clear(self) -> None:
-        """Remove all cached items."""
-        for child in self.root.glob("*.json"):
-            child.unlink(missing_ok=True)
-        for child in self.frames_dir.glob(f"*.{self.frame_suffix}"):
-            child.unlink(missing_ok=True)
+        """Remove all cached items, including files the index does not know about."""
+        for entry in self.index.entries():
+            self._remove_files(entry.kind, entry.key)
+        self.index.clear()
+        # Files written before the index existed, or whose rows were lost, are swept by pattern.
+        patterns = [
+            (self.root, "*.json"),
+            (self.frames_dir, f"*.{self.frame_suffix}"),
+            (self.frames_dir, "*.manifest.json"),
+            (self.arrays_dir, "*.npz"),
+        ]
+        for directory, pattern in patterns:
+            for child in directory.glob(pattern):
+                child.unlink(missing_ok=True)
+
+    # --- budget and maintenance --------------------------------------------
+    def prune(self, max_bytes: Optional[int] = None, keep: Optional[Tuple[str, str]] = None) -> List[CacheEntry]:
+        """
+        Evict least recently used entries until the cache fits in `max_bytes`
+        (default: the configured budget). `keep` protects one (kind, key) pair,
+        typically the entry that was just written.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        if budget is None:
+            return []
+        total = self.index.total_bytes()
+        evicted: List[CacheEntry] = []
+        if total <= budget:
+            return evicted
+        for entry in self.index.entries():
+            if total <= budget:
+                break
+            if keep == (entry.kind, entry.key):
+                continue
+            self._remove_files(entry.kind, entry.key)
+            self.index.remove(entry.kind, entry.key)
+            total -= entry.size_bytes
+            evicted.append(entry)
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "bytes": self.index.total_bytes(),
+            "max_bytes": self.max_bytes,
+            "kinds": self.index.stats(),
+        }
+
+    def verify(self, deep: bool = False, repair: bool = False) -> Dict[str, List[str]]:
+        """
+        Cross-check the index against the files on disk.
+
+        Reports indexed entries whose files are gone or changed size, and with
+        `deep=True` frames whose content no longer matches their manifest's
+        hash. `repair=True` drops broken entries (and their files) from the cache.
+        """
+        report: Dict[str, List[str]] = {"missing": [], "size_mismatch": [], "corrupt": []}
+        for entry in self.index.entries():
+            paths = self._paths_for(entry.kind, entry.key)
+            problem = None
+            if not paths[0].exists():
+                problem = "missing"
+            elif sum(_size(path) for path in paths) != entry.size_bytes:
+                problem = "size_mismatch"
+            elif deep and entry.kind == "frame" and not self._frame_matches_manifest(entry.key):
+                problem = "corrupt"
+            if problem is None:
+                continue
+            report[problem].append(f"{entry.kind}:{entry.key}")
+            if repair:
+                self._remove_files(entry.kind, entry.key)
+                self.index.remove(entry.kind, entry.key)
+        return report
 
     # --- DataFrame helpers -------------------------------------------------
     def load_frame(self, key: str) -> Optional[pd.DataFrame]:
         path = self._frame_path_for(key)
-        if not path.exists():
+        try:
+            if self.frame_suffix == "npz":
+                with np.load(path, allow_pickle=False) as bundle:
+                    frame = _frame_from_arrays({name: bundle[name] for name in bundle.files})
+            else:
+                frame = pd.read_csv(path, parse_dates=["timestamp"], float_precision="round_trip")
+        except FileNotFoundError:
             return None
-        return pd.read_csv(path, parse_dates=["timestamp"])
+        self._touch("frame", key, path, frame=frame)
+        return frame
+
+    def store_frame(self, key: str, frame: pd.DataFrame, manifest: Optional[CacheManifest] = None) -> None:
+        """
+        Persist a frame (and its manifest) via write-to-temp-and-rename.
 
-    def store_frame(self, key: str, frame: pd.DataFrame) -> None:
+        Readers in other processes therefore see either the previous file or
+        the complete new one, never a partially written frame. With
+        `frame_suffix="npz"` frames are stored columnar and keep their dtypes
+        (timestamps as int64 epoch nanoseconds, categoricals as codes).
+        """
         path = self._frame_path_for(key)
-        frame.to_csv(path, index=False)
+        if self.frame_suffix == "npz":
+
+            def write(tmp: Path) -> None:
+                with tmp.open("wb") as handle:
+                    np.savez(handle, **_frame_to_arrays(frame))  # type: ignore[arg-type]
+
+            _atomic_write(path, write)
+        else:
+            _atomic_write(path, lambda tmp: frame.to_csv(tmp, index=False))
+        manifest_path = self._manifest_path_for(key)
+        if manifest is None:
+            # A stale manifest must never vouch for a frame it did not describe.
+            manifest_path.unlink(missing_ok=True)
+        else:
+            _atomic_write(manifest_path, lambda tmp: tmp.write_text(manifest.to_json(), encoding="utf-8"))
+        self._index_frame(key, manifest, len(frame))
+        self.prune(keep=("frame", key))
+
+    def lock(self, key: str, timeout: Optional[float] = None) -> FileLock:
+        """Return a cross-process lock guarding fetch-and-store for `key`."""
+        safe_key = key.replace("/", "_")
+        return FileLock(self.root / "locks" / f"{safe_key}.lock", timeout=timeout)
+
+    # --- numpy array bundles ----------------------------------------------
+    def load_arrays(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load a bundle of named arrays stored with `store_arrays` (None on miss)."""
+        path = self._arrays_path_for(key)
+        try:
+            with np.load(path, allow_pickle=False) as bundle:
+                arrays = {name: bundle[name] for name in bundle.files}
+        except FileNotFoundError:
+            return None
+        self._touch("arrays", key, path)
+        return arrays
+
+    def store_arrays(self, key: str, arrays: Mapping[str, np.ndarray]) -> None:
+        self.arrays_dir.mkdir(parents=True, exist_ok=True)
+        path = self._arrays_path_for(key)
+
+        def write(tmp: Path) -> None:
+            with tmp.open("wb") as handle:
+                np.savez(handle, **arrays)  # type: ignore[arg-type]
+
+        _atomic_write(path, write)
+        self.index.record("arrays", key, _size(path))
+        self.prune(keep=("arrays", key))
+
+    def load_manifest(self, key: str) -> Optional[CacheManifest]:
+        path = self._manifest_path_for(key)
+        if not path.exists():
+            return None
+        try:
+            return CacheManifest.from_json(path.read_text(encoding="utf-8"))
+        except (ValueError, TypeError):
+            return None
+
+    # --- index bookkeeping -------------------------------------------------
+    def _arrays_path_for(self, key: str) -> Path:
+        return self.arrays_dir / f"{key.replace('/', '_')}.npz"
+
+    def _paths_for(self, kind: str, key: str) -> List[Path]:
+        if kind == "frame":
+            return [self._frame_path_for(key), self._manifest_path_for(key)]
+        if kind == "arrays":
+            return [self._arrays_path_for(key)]
+        return [self._path_for(key)]
+
+    def _remove_files(self, kind: str, key: str) -> None:
+        for path in self._paths_for(kind, key):
+            path.unlink(missing_ok=True)
+
+    def _index_frame(self, key: str, manifest: Optional[CacheManifest], row_count: Optional[int] = None) -> None:
+        size = sum(_size(path) for path in self._paths_for("frame", key))
+        if manifest is None:
+            self.index.record("frame", key, size, row_count=row_count)
+        else:
+            self.index.record("frame", key, size, manifest.row_count, manifest.start_ns, manifest.end_ns)
+
+    def _touch(self, kind: str, key: str, path: Path, frame: Optional[pd.DataFrame] = None) -> None:
+        if self.index.touch(kind, key):
+            return
+        # Written by a process that predates the index; start tracking it now.
+        if frame is not None:
+            self._index_frame(key, self.load_manifest(key), len(frame))
+        else:
+            self.index.record(kind, key, _size(path))
+
+    def _adopt_existing(self) -> None:
+        """Index files left by a cache created before the index existed (one-time scan)."""
+        for path in self.root.glob("*.json"):
+            self.index.record("json", path.stem, _size(path))
+        for path in self.frames_dir.glob(f"*.{self.frame_suffix}"):
+            key = path.name[: -len(self.frame_suffix) - 1]
+            self._index_frame(key, self.load_manifest(key))
+        if self.arrays_dir.exists():
+            for path in self.arrays_dir.glob("*.npz"):
+                self.index.record("arrays", path.stem, _size(path))
+
+    def _frame_matches_manifest(self, key: str) -> bool:
+        manifest = self.load_manifest(key)
+        if manifest is None:
+            return True
+        try:
+            if self.frame_suffix == "npz":
+                frame = self.load_frame(key)
+            else:
+                # Exact float parsing so the full content hash is comparable.
+                frame = pd.read_csv(self._frame_path_for(key), parse_dates=["timestamp"], float_precision="round_trip")
+        except (OSError, ValueError):
+            return False
+        return frame is not None and manifest.matches(frame, manifest.validator_version, mode="hash")
+
+
+def _frame_to_arrays(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    columns = [str(col) for col in frame.columns]
+    kinds: List[str] = []
+    arrays: Dict[str, np.ndarray] = {}
+    for name in columns:
+        values = frame[name]
+        if isinstance(values.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(values):
+            kinds.append("datetime")
+            arrays[name] = timestamp_ns(values)
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            kinds.append("category")
+            arrays[name] = values.cat.codes.to_numpy()
+            arrays[f"{name}__categories"] = values.cat.categories.astype(str).to_numpy(dtype=str)
+        elif isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+            kinds.append("numeric")
+            arrays[name] = values.to_numpy()
+        else:
+            kinds.append("string")
+            arrays[name] = values.astype(str).to_numpy(dtype=str)
+    arrays["__columns__"] = np.asarray(columns, dtype=str)
+    arrays["__kinds__"] = np.asarray(kinds, dtype=str)
+    return arrays
+
+
+def _frame_from_arrays(arrays: Mapping[str, np.ndarray]) -> pd.DataFrame:
+    data: Dict[str, Any] = {}
+    for name, kind in zip(arrays["__columns__"].tolist(), arrays["__kinds__"].tolist()):
+        values = arrays[name]
+        if kind == "datetime":
+            data[name] = pd.to_datetime(values, utc=True)
+        elif kind == "category":
+            categories = pd.Index(arrays[f"{name}__categories"].tolist())
+            data[name] = pd.Categorical.from_codes(values.astype(np.int64), categories=categories)
+        else:
+            data[name] = values
+    return pd.DataFrame(data)
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _atomic_write(path: Path, write: Callable[[Path], Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
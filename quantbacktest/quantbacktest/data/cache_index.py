@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from typing_extensions import Self
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    row_count INTEGER,
+    start_ns INTEGER,
+    end_ns INTEGER,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (last_access);
+"""
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    kind: str
+    key: str
+    size_bytes: int
+    row_count: Optional[int]
+    start_ns: Optional[int]
+    end_ns: Optional[int]
+    last_access: float
+
+
+class CacheIndex:
+    """
+    SQLite index of cache entries: size, row count, covered range, last access.
+
+    Lets `LocalDataCache` answer existence and size questions and pick LRU
+    eviction victims without scanning the cache directories. The database
+    runs in WAL mode so several processes can share one cache.
+
+    Touches of entries already known to be indexed are buffered and written
+    in one batch before anything reads access order (`entries`, `get`), on
+    `close`, or every `flush_every` touches, so a hot read loop does not
+    issue one UPDATE per read. Close the index, or use it as a context
+    manager, to flush and release the connection.
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time, flush_every: int = 256) -> None:
+        self.path = Path(path)
+        self.clock = clock
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._known: Set[Tuple[str, str]] = set()
+        self._pending: Dict[Tuple[str, str], float] = {}
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        kind: str,
+        key: str,
+        size_bytes: int,
+        row_count: Optional[int] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, key, size_bytes, row_count, start_ns, end_ns, self.clock()),
+            )
+            self._pending.pop((kind, key), None)
+            self._known.add((kind, key))
+
+    def touch(self, kind: str, key: str) -> bool:
+        """Mark an entry as just used; returns False when it is not indexed."""
+        with self._lock:
+            if (kind, key) in self._known:
+                self._pending[(kind, key)] = self.clock()
+                if len(self._pending) >= self.flush_every:
+                    self._flush()
+                return True
+            cursor = self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE kind = ? AND key = ?", (self.clock(), kind, key)
+            )
+            if cursor.rowcount > 0:
+                self._known.add((kind, key))
+        return cursor.rowcount > 0
+
+    def flush(self) -> None:
+        """Write buffered touches."""
+        with self._lock:
+            self._flush()
+
+    def contains(self, kind: str, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return row is not None
+
+    def get(self, kind: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            self._flush()
+            row = self._conn.execute("SELECT * FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def remove(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+            self._pending.pop((kind, key), None)
+            self._known.discard((kind, key))
+
+    def entries(self) -> Iterator[CacheEntry]:
+        """Yield entries least recently used first."""
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute("SELECT * FROM entries ORDER BY last_access, rowid").fetchall()
+        for row in rows:
+            yield CacheEntry(*row)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()
+        return int(total)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            grouped = self._conn.execute(
+                "SELECT kind, COUNT(*), SUM(size_bytes), SUM(COALESCE(row_count, 0)) FROM entries GROUP BY kind"
+            ).fetchall()
+        return {kind: {"entries": count, "bytes": size, "rows": rows} for kind, count, size, rows in grouped}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._pending.clear()
+            self._known.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def _flush(self) -> None:
+        if self._pending:
+            rows = [(accessed, kind, key) for (kind, key), accessed in self._pending.items()]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("UPDATE entries SET last_access = ? WHERE kind = ? AND key = ?", rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._pending.clear()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from .cache import LocalDataCache
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="quantbacktest data cache maintenance CLI")
+    parser.add_argument("--cache-dir", required=True, help="Root directory of the LocalDataCache")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Show entry counts and bytes per kind")
+    prune = commands.add_parser("prune", help="Evict least recently used entries down to a byte budget")
+    prune.add_argument("--max-bytes", type=int, required=True)
+    verify = commands.add_parser("verify", help="Check indexed entries against the files on disk")
+    verify.add_argument("--deep", action="store_true", help="Re-hash frames against their manifests")
+    verify.add_argument("--repair", action="store_true", help="Drop broken entries from the cache")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    with LocalDataCache(root=Path(args.cache_dir)) as cache:
+        if args.command == "stats":
+            summary = cache.stats()
+        elif args.command == "prune":
+            evicted = cache.prune(max_bytes=args.max_bytes)
+            summary = {"evicted": [asdict(entry) for entry in evicted], "bytes": cache.index.total_bytes()}
+        else:
+            summary = cache.verify(deep=args.deep, repair=args.repair)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+_UINT32_MAX = np.iinfo(np.uint32).max
+
+
+@dataclass(slots=True)
+class ColumnDowncast:
+    column: str
+    source_dtype: str
+    dtype: str
+    max_abs_error: float = 0.0
+    max_rel_error: float = 0.0
+    accepted: bool = True
+
+
+@dataclass(slots=True)
+class DtypeReport:
+    """Outcome of applying a `DtypePolicy`: per-column decisions and memory saved."""
+
+    columns: Dict[str, ColumnDowncast] = field(default_factory=dict)
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    @property
+    def rejected(self) -> List[str]:
+        return [name for name, entry in self.columns.items() if not entry.accepted]
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "columns": {name: entry.dtype for name, entry in self.columns.items()},
+            "rejected": self.rejected,
+            "max_rel_error": max((entry.max_rel_error for entry in self.columns.values()), default=0.0),
+        }
+
+
+@dataclass(slots=True)
+class DtypePolicy:
+    """
+    Compact dtypes for validated OHLCV frames.
+
+    Prices become `price_dtype` (float32 by default) only when the round trip
+    stays within half a tick (`tick_size`) or, without a tick size, within
+    `price_rtol` relative error of the float64 source; otherwise the column
+    keeps its dtype and is reported as rejected. Volume becomes uint32 when it
+    is integral and fits, float32 when that stays within `price_rtol`, and is
+    left alone otherwise. String columns listed in `categorical_columns`
+    become categoricals. Timestamps are left as datetime64 (int64 epoch ticks).
+    """
+
+    price_columns: Sequence[str] = ("open", "high", "low", "close", "adj_close")
+    price_dtype: str = "float32"
+    tick_size: Optional[float] = None
+    price_rtol: float = 1e-6
+    volume_column: str = "volume"
+    categorical_columns: Sequence[str] = ("symbol",)
+
+    def apply(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, DtypeReport]:
+        """Return a downcast copy of `frame` (or `frame` itself if nothing changes) and a report."""
+        report = DtypeReport(bytes_before=int(frame.memory_usage(deep=True).sum()))
+        converted: Dict[str, Union[np.ndarray, pd.Series]] = {}
+        for name in self.price_columns:
+            if name in frame.columns and frame[name].dtype.kind == "f":
+                decision, values = self._downcast_float(frame[name], self.price_dtype, self._price_ok)
+                report.columns[name] = decision
+                if values is not None:
+                    converted[name] = values
+        if self.volume_column in frame.columns and frame[self.volume_column].dtype.kind in "fiu":
+            decision, values = self._downcast_volume(frame[self.volume_column])
+            report.columns[self.volume_column] = decision
+            if values is not None:
+                converted[self.volume_column] = values
+        for name in self.categorical_columns:
+            if name in frame.columns and not isinstance(frame[name].dtype, pd.CategoricalDtype):
+                converted[name] = frame[name].astype("category")
+                report.columns[name] = ColumnDowncast(name, str(frame[name].dtype), "category")
+        if not converted:
+            report.bytes_after = report.bytes_before
+            return frame, report
+        result = frame.assign(**converted)
+        report.bytes_after = int(result.memory_usage(deep=True).sum())
+        return result, report
+
+    def _price_ok(self, decision: ColumnDowncast) -> bool:
+        if self.tick_size is not None:
+            return decision.max_abs_error < self.tick_size / 2
+        return decision.max_rel_error <= self.price_rtol
+
+    def _volume_ok(self, decision: ColumnDowncast) -> bool:
+        return decision.max_rel_error <= self.price_rtol
+
+    def _downcast_float(
+        self, series: pd.Series, dtype: str, acceptable: Callable[[ColumnDowncast], bool]
+    ) -> Tuple[ColumnDowncast, Optional[np.ndarray]]:
+        source_dtype = str(series.dtype)
+        if source_dtype == dtype:
+            return ColumnDowncast(str(series.name), source_dtype, dtype), None
+        source = series.to_numpy(dtype=np.float64)
+        cast = source.astype(dtype)
+        decision = _measure(str(series.name), source_dtype, dtype, source, cast)
+        if not acceptable(decision):
+            decision.dtype = source_dtype
+            decision.accepted = False
+            return decision, None
+        return decision, cast
+
+    def _downcast_volume(self, series: pd.Series) -> Tuple[ColumnDowncast, Optional[np.ndarray]]:
+        name = str(series.name)
+        if series.dtype in (np.uint32, np.float32):
+            return ColumnDowncast(name, str(series.dtype), str(series.dtype)), None
+        source = series.to_numpy(dtype=np.float64)
+        if len(source) == 0 or (
+            (source >= 0).all() and source.max() <= _UINT32_MAX and (np.floor(source) == source).all()
+        ):
+            return ColumnDowncast(name, str(series.dtype), "uint32"), source.astype(np.uint32)
+        return self._downcast_float(series, "float32", self._volume_ok)
+
+
+def _measure(name: str, source_dtype: str, dtype: str, source: np.ndarray, cast: np.ndarray) -> ColumnDowncast:
+    error = np.abs(cast.astype(np.float64) - source)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.where(source != 0, error / np.abs(source), error)
+    return ColumnDowncast(
+        column=name,
+        source_dtype=source_dtype,
+        dtype=dtype,
+        max_abs_error=float(np.nanmax(error, initial=0.0)),
+        max_rel_error=float(np.nanmax(relative, initial=0.0)),
+    )
@@ -8,10 +8,15 @@ class DataProviderError(RuntimeError):
     """Raised when a provider cannot fulfill a request."""
 
 
+class DataNotFoundError(DataProviderError):
+    """Raised when a provider is healthy but has no data for the request (e.g. delisted symbol)."""
+
+
 @dataclass(slots=True)
 class DataFetchError(RuntimeError):
     message: str
     causes: List[str]
+    not_found: bool = False  # every provider answered that it has no data, so retrying will not help
 
     def __str__(self) -> str:
         joined = "; ".join(self.causes)
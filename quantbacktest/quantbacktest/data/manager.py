@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import threading
+from collections import deque
+from contextlib import AbstractContextManager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from logging import Logger
-from typing import Iterable, List
+from typing import Any, Collection, Deque, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
 
 import pandas as pd
 
 from ..utils.logging import get_logger
+from ..utils.tracing import Tracer
+from .arrays import MarketArrays
 from .cache import LocalDataCache
-from .errors import DataFetchError, DataProviderError, DataValidationError
+from .dtypes import DtypePolicy
+from .errors import DataFetchError, DataNotFoundError, DataProviderError, DataValidationError
+from .manifest import CacheManifest
+from .prefetch import Prefetcher
 from .providers.base import DataProvider, DataRequest
+from .resilience import CircuitBreaker, NegativeCache
 from .validator import DataValidator
 
 
@@ -18,32 +28,233 @@ class DataManager:
     cache: LocalDataCache
     providers: Iterable[DataProvider]
     validator: DataValidator = field(default_factory=DataValidator)
+    cache_verification: Literal["full", "spot", "hash"] = "spot"
+    lock_timeout: Optional[float] = None
+    breaker_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    negative_cache: NegativeCache = field(default_factory=NegativeCache)
+    hedge_delay: Optional[float] = None
+    hedge_immediately: Collection[str] = ()
+    dtype_policy: Optional[DtypePolicy] = None
+    tracer: Optional[Tracer] = None
     _providers: List[DataProvider] = field(init=False, repr=False)
+    _breakers: Dict[str, CircuitBreaker] = field(init=False, repr=False)
     logger: Logger = field(init=False, repr=False)
+    _inflight: Dict[str, "Future[pd.DataFrame]"] = field(init=False, repr=False)
+    _inflight_lock: threading.Lock = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "_providers", list(self.providers))
         if not self._providers:
             raise ValueError("at least one provider must be configured")
+        names = [provider.name for provider in self._providers]
+        if len(set(names)) != len(names):
+            # Breakers, the negative cache and `hedge_immediately` all identify providers by name.
+            raise ValueError(f"provider names must be unique, got {names}")
         object.__setattr__(self, "logger", get_logger(self.__class__.__name__))
+        object.__setattr__(self, "_inflight", {})
+        object.__setattr__(self, "_inflight_lock", threading.Lock())
+        breakers = {
+            provider.name: CircuitBreaker(
+                failure_threshold=self.breaker_threshold, reset_timeout=self.breaker_reset_seconds
+            )
+            for provider in self._providers
+        }
+        object.__setattr__(self, "_breakers", breakers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Circuit breaker and negative-cache counters for monitoring."""
+        return {
+            "providers": {name: breaker.snapshot() for name, breaker in self._breakers.items()},
+            "negative_cache": self.negative_cache.snapshot(),
+        }
 
     def fetch(self, request: DataRequest) -> pd.DataFrame:
+        if self.tracer is None:
+            return self._fetch(request)
+        with self.tracer.span("data.fetch", "data", symbol=request.symbol) as args:
+            frame = self._fetch(request)
+            args["rows"] = len(frame)
+            return frame
+
+    def _fetch(self, request: DataRequest) -> pd.DataFrame:
         cache_key = request.cache_key()
-        cached = self.cache.load_frame(cache_key)
+        cached = self._load_cached(cache_key, request)
         if cached is not None:
-            self.logger.debug("cache hit for %s", cache_key)
-            return self.validator.validate(cached, request)
+            return cached
+
+        # Single-flight: concurrent misses for the same key wait on one leader.
+        with self._inflight_lock:
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                leader: Future[pd.DataFrame] = Future()
+                self._inflight[cache_key] = leader
+        if pending is not None:
+            self.logger.debug("joining in-flight fetch for %s", cache_key)
+            return self.validator.slice_range(pending.result(), request)
+
+        try:
+            # The file lock extends single-flight across processes sharing the cache.
+            with self.cache.lock(cache_key, timeout=self.lock_timeout):
+                frame = self._load_cached(cache_key, request)
+                if frame is None:
+                    if self.hedge_delay is not None or self.hedge_immediately:
+                        frame = self._fetch_hedged(cache_key, request)
+                    else:
+                        frame = self._fetch_from_providers(cache_key, request)
+        except BaseException as exc:
+            leader.set_exception(exc)
+            raise
+        else:
+            leader.set_result(frame)
+            return frame
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+
+    def fetch_arrays(
+        self,
+        request: DataRequest,
+        fields: Sequence[str] = ("open", "high", "low", "close", "volume"),
+    ) -> MarketArrays:
+        """
+        Fetch `request` and return engine-ready arrays that share memory with the validated frame.
 
+        `MarketArrays.to_events()` then turns them into `MarketEvent`s without
+        per-row timestamp parsing.
+        """
+        return MarketArrays.from_frame(request.symbol, self.fetch(request), fields)
+
+    def prefetch(
+        self, requests: Iterable[DataRequest], depth: int = 2, return_exceptions: bool = False
+    ) -> Prefetcher[pd.DataFrame]:
+        """Iterate `(request, frame)` in order while up to `depth` upcoming requests load in the background."""
+        return Prefetcher(self.fetch, requests, depth=depth, return_exceptions=return_exceptions)
+
+    def _load_cached(self, cache_key: str, request: DataRequest) -> Optional[pd.DataFrame]:
+        cached = self.cache.load_frame(cache_key)
+        if cached is None:
+            return None
+        self.logger.debug("cache hit for %s", cache_key)
+        if self.dtype_policy is not None:
+            # No-op for columnar caches; re-narrows frames parsed back from CSV.
+            cached, _ = self.dtype_policy.apply(cached)
+        if self._manifest_is_current(cache_key, cached, request):
+            return self.validator.slice_range(cached, request)
+        return self._validate(cached, request)
+
+    def _fetch_from_providers(self, cache_key: str, request: DataRequest) -> pd.DataFrame:
         failures: List[str] = []
         for provider in self._providers:
-            try:
+            frame, failure = self._attempt(provider, cache_key, request)
+            if frame is not None:
+                return self._store(cache_key, frame, provider)
+            failures.append(failure)
+        raise DataFetchError(message="All providers failed", causes=failures, not_found=self._known_missing(cache_key))
+
+    def _fetch_hedged(self, cache_key: str, request: DataRequest) -> pd.DataFrame:
+        """
+        Race the provider chain instead of walking it serially.
+
+        The first provider (plus any named in `hedge_immediately`) starts at
+        once; the next one in chain order starts whenever `hedge_delay`
+        elapses without a usable frame or a running attempt fails. The first
+        frame that passes validation wins and the remaining attempts are
+        cancelled if not yet started, or left to finish and ignored.
+        """
+        waiting: Deque[DataProvider] = deque(self._providers)
+        running: Dict["Future[Tuple[Optional[pd.DataFrame], str]]", DataProvider] = {}
+        failures: List[str] = []
+        executor = ThreadPoolExecutor(max_workers=len(self._providers), thread_name_prefix="hedge")
+
+        def launch(provider: DataProvider) -> None:
+            waiting.remove(provider)
+            running[executor.submit(self._attempt, provider, cache_key, request)] = provider
+
+        try:
+            launch(waiting[0])
+            for provider in [p for p in waiting if p.name in self.hedge_immediately]:
+                launch(provider)
+            while running:
+                done, _ = wait(list(running), timeout=self.hedge_delay if waiting else None, return_when=FIRST_COMPLETED)
+                if not done:
+                    self.logger.debug("hedging %s with %s", cache_key, waiting[0].name)
+                    launch(waiting[0])
+                    continue
+                for future in done:
+                    provider = running.pop(future)
+                    frame, failure = future.result()
+                    if frame is not None:
+                        return self._store(cache_key, frame, provider)
+                    failures.append(failure)
+                if waiting:
+                    launch(waiting[0])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise DataFetchError(message="All providers failed", causes=failures, not_found=self._known_missing(cache_key))
+
+    def _known_missing(self, cache_key: str) -> bool:
+        return all(self.negative_cache.contains(provider.name, cache_key) for provider in self._providers)
+
+    def _attempt(
+        self, provider: DataProvider, cache_key: str, request: DataRequest
+    ) -> Tuple[Optional[pd.DataFrame], str]:
+        """Fetch and validate from one provider, returning the frame or a failure description."""
+        if self.negative_cache.contains(provider.name, cache_key):
+            return None, f"{provider.name}: known missing (negative cache)"
+        breaker = self._breakers[provider.name]
+        if not breaker.allow():
+            return None, f"{provider.name}: circuit open"
+        try:
+            with self._span("data.provider", provider=provider.name, symbol=request.symbol):
                 raw_frame = provider.fetch(request)
-                validated = self.validator.validate(raw_frame, request)
-                self.cache.store_frame(cache_key, validated)
-                self.logger.info("fetched %s rows from %s", len(validated), provider.name)
-                return validated
-            except (DataProviderError, DataValidationError) as exc:
-                failures.append(f"{provider.name}: {exc}")
-                self.logger.warning("provider %s failed: %s", provider.name, exc)
-
-        raise DataFetchError(message="All providers failed", causes=failures)
+        except DataNotFoundError as exc:
+            # The provider answered; it simply has nothing for this key.
+            breaker.record_success()
+            self.negative_cache.add(provider.name, cache_key)
+            self.logger.warning("provider %s has no data: %s", provider.name, exc)
+            return None, f"{provider.name}: {exc}"
+        except DataProviderError as exc:
+            breaker.record_failure()
+            self.logger.warning("provider %s failed: %s", provider.name, exc)
+            return None, f"{provider.name}: {exc}"
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        try:
+            return self._validate(raw_frame, request), ""
+        except DataValidationError as exc:
+            self.logger.warning("provider %s failed: %s", provider.name, exc)
+            return None, f"{provider.name}: {exc}"
+
+    def _validate(self, frame: pd.DataFrame, request: DataRequest) -> pd.DataFrame:
+        with self._span("data.validate", symbol=request.symbol, rows=len(frame)):
+            return self.validator.validate(frame, request)
+
+    def _span(self, name: str, **args: Any) -> AbstractContextManager[Any]:
+        return nullcontext() if self.tracer is None else self.tracer.span(name, "data", **args)
+
+    def _store(self, cache_key: str, frame: pd.DataFrame, provider: DataProvider) -> pd.DataFrame:
+        if self.dtype_policy is not None:
+            frame, report = self.dtype_policy.apply(frame)
+            if report.rejected:
+                self.logger.warning("dtype policy kept %s at full precision for %s", report.rejected, cache_key)
+            self.logger.debug("dtype policy for %s: %s", cache_key, report.summary())
+        manifest = CacheManifest.from_frame(cache_key, frame, self.validator.version)
+        self.cache.store_frame(cache_key, frame, manifest=manifest)
+        self.logger.info("fetched %s rows from %s", len(frame), provider.name)
+        return frame
+
+    def _manifest_is_current(self, cache_key: str, frame: pd.DataFrame, request: DataRequest) -> bool:
+        if self.cache_verification == "full":
+            return False
+        manifest = self.cache.load_manifest(cache_key)
+        if manifest is None:
+            return False
+        if not manifest.matches(frame, self.validator.version, mode=self.cache_verification):
+            self.logger.debug("manifest mismatch for %s; revalidating", cache_key)
+            return False
+        # Out-of-range data must still surface as a validation error.
+        # Naive datetimes are treated as UTC, matching DataValidator.
+        return manifest.start_ns >= pd.Timestamp(request.start).value and manifest.end_ns <= pd.Timestamp(request.end).value
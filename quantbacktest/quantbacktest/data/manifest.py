@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+SPOT_CHECK_ROWS = 32
+
+
+@dataclass(slots=True)
+class CacheManifest:
+    """
+    Describes a validated frame at the moment it was written to the cache.
+
+    Cache hits whose manifest still matches the loaded frame can skip full
+    validation and go straight to the range slice.
+    """
+
+    key: str
+    columns: List[str]
+    row_count: int
+    start_ns: int
+    end_ns: int
+    content_hash: str
+    sample_hash: str
+    validator_version: str
+
+    @classmethod
+    def from_frame(cls, key: str, frame: pd.DataFrame, validator_version: str) -> "CacheManifest":
+        timestamps = timestamp_ns(frame["timestamp"])
+        return cls(
+            key=key,
+            columns=[str(col) for col in frame.columns],
+            row_count=len(frame),
+            start_ns=int(timestamps[0]) if len(timestamps) else 0,
+            end_ns=int(timestamps[-1]) if len(timestamps) else 0,
+            content_hash=frame_hash(frame),
+            sample_hash=frame_hash(frame, rows=spot_check_rows(len(frame))),
+            validator_version=validator_version,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "CacheManifest":
+        data: Dict[str, Any] = json.loads(payload)
+        return cls(**data)
+
+    def matches(self, frame: pd.DataFrame, validator_version: str, mode: str = "spot") -> bool:
+        """
+        Return True when `frame` is the one described by this manifest.
+
+        `spot` compares schema, row count, timestamp bounds, and a hash over a
+        fixed sample of rows; `hash` recomputes the full content hash.
+        """
+        if self.validator_version != validator_version:
+            return False
+        if [str(col) for col in frame.columns] != self.columns or len(frame) != self.row_count:
+            return False
+        if self.row_count == 0:
+            return True
+        try:
+            bounds = timestamp_ns(frame["timestamp"].iloc[np.array([0, -1], dtype=np.int64)])
+        except (TypeError, ValueError):
+            return False
+        if int(bounds[0]) != self.start_ns or int(bounds[-1]) != self.end_ns:
+            return False
+        if mode == "hash":
+            return frame_hash(frame) == self.content_hash
+        return frame_hash(frame, rows=spot_check_rows(len(frame))) == self.sample_hash
+
+
+def timestamp_ns(series: pd.Series) -> np.ndarray:
+    """Return UTC epoch nanoseconds for a timestamp series."""
+    timestamps = pd.to_datetime(series, utc=True)
+    return timestamps.dt.as_unit("ns").to_numpy(dtype="int64")
+
+
+def spot_check_rows(row_count: int, samples: int = SPOT_CHECK_ROWS) -> np.ndarray:
+    if row_count <= samples:
+        return np.arange(row_count)
+    return np.unique(np.linspace(0, row_count - 1, samples).astype(np.int64))
+
+
+def frame_hash(frame: pd.DataFrame, rows: Optional[Union[Sequence[int], np.ndarray]] = None) -> str:
+    """
+    Hash a frame in a representation that survives a cache round trip.
+
+    Timestamps are hashed as epoch nanoseconds and numeric columns as float64
+    so CSV parsing differences (int vs float, datetime unit) do not change the digest.
+    """
+    subset = frame if rows is None else frame.iloc[np.asarray(rows, dtype=np.int64)]
+    digest = hashlib.sha256()
+    for column in subset.columns:
+        digest.update(str(column).encode("utf-8"))
+        values = subset[column]
+        if column == "timestamp":
+            array = timestamp_ns(values)
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            array = values.to_numpy(dtype="float64")
+        else:
+            array = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy()
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Literal, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logging import get_logger
+from .errors import DataFetchError
+from .manager import DataManager
+from .manifest import timestamp_ns
+from .providers.base import DataRequest
+
+FillPolicy = Literal["none", "ffill", "zero"]
+DEFAULT_FILL: Dict[str, FillPolicy] = {"volume": "zero"}
+
+
+@dataclass(slots=True)
+class UniversePanel:
+    """
+    Aligned (time x symbol) matrices for a universe of symbols.
+
+    `values[field]` holds float64 arrays of shape (len(timestamps), len(symbols));
+    `valid` marks cells that were actually observed (before any fill policy).
+    """
+
+    symbols: List[str]
+    timestamps: np.ndarray
+    values: Dict[str, np.ndarray]
+    valid: np.ndarray
+    missing: List[str] = field(default_factory=list)
+
+    def matrix(self, name: str) -> np.ndarray:
+        return self.values[name]
+
+    def column(self, symbol: str) -> int:
+        return self.symbols.index(symbol)
+
+    def to_frame(self, name: str) -> pd.DataFrame:
+        index = pd.DatetimeIndex(pd.to_datetime(self.timestamps, utc=True), name="timestamp")
+        return pd.DataFrame(self.values[name], index=index, columns=self.symbols)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {f"field_{name}": matrix for name, matrix in self.values.items()}
+        arrays.update(
+            symbols=np.asarray(self.symbols, dtype=str),
+            timestamps=self.timestamps,
+            valid=self.valid,
+            missing=np.asarray(self.missing, dtype=str),
+        )
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "UniversePanel":
+        return cls(
+            symbols=[str(symbol) for symbol in arrays["symbols"]],
+            timestamps=arrays["timestamps"],
+            values={name[len("field_"):]: matrix for name, matrix in arrays.items() if name.startswith("field_")},
+            valid=arrays["valid"],
+            missing=[str(symbol) for symbol in arrays["missing"]],
+        )
+
+
+class PanelLoader:
+    """
+    Builds `UniversePanel`s from a `DataManager`.
+
+    Up to `prefetch` upcoming symbols load on background threads while the
+    current one is processed. Each frame is reduced to compact numpy arrays
+    as soon as it is consumed, the union timestamp grid is computed once, and
+    values are written straight into preallocated matrices. Panels are cached
+    as `.npz` bundles in the manager's cache, keyed by universe, range,
+    interval, fields, and fill policy. A panel is only cached when each of
+    its missing symbols was reported as not found by every provider.
+    """
+
+    def __init__(
+        self,
+        manager: DataManager,
+        fields: Sequence[str] = ("open", "high", "low", "close", "volume"),
+        fill: Optional[Mapping[str, FillPolicy]] = None,
+        default_fill: FillPolicy = "ffill",
+        prefetch: int = 4,
+    ) -> None:
+        self.manager = manager
+        self.fields = tuple(fields)
+        self.fill = dict(DEFAULT_FILL if fill is None else fill)
+        self.default_fill = default_fill
+        self.prefetch = prefetch
+        self.logger = get_logger(self.__class__.__name__)
+
+    def load(
+        self,
+        symbols: Sequence[str],
+        start: datetime,
+        end: datetime,
+        interval: str = "1d",
+        adjusted: bool = True,
+        use_cache: bool = True,
+    ) -> UniversePanel:
+        key = self.cache_key(symbols, start, end, interval, adjusted)
+        if use_cache:
+            cached = self.manager.cache.load_arrays(key)
+            if cached is not None:
+                self.logger.debug("panel cache hit for %s", key)
+                return UniversePanel.from_arrays(cached)
+
+        series: List[Optional[Tuple[np.ndarray, List[np.ndarray]]]] = []
+        missing: List[str] = []
+        retryable = False
+        requests = [
+            DataRequest(symbol=symbol, start=start, end=end, interval=interval, adjusted=adjusted)
+            for symbol in symbols
+        ]
+        for request, frame in self.manager.prefetch(requests, depth=self.prefetch, return_exceptions=True):
+            if isinstance(frame, DataFetchError):
+                self.logger.warning("panel symbol %s unavailable: %s", request.symbol, frame)
+                missing.append(request.symbol)
+                series.append(None)
+                retryable = retryable or not frame.not_found
+                continue
+            if isinstance(frame, Exception):
+                raise frame
+            ticks = timestamp_ns(frame["timestamp"])
+            series.append((ticks, [frame[name].to_numpy(dtype="float64") for name in self.fields]))
+
+        observed = [entry[0] for entry in series if entry is not None]
+        grid = np.unique(np.concatenate(observed)) if observed else np.empty(0, dtype=np.int64)
+        shape = (len(grid), len(series))
+        values = {name: np.full(shape, np.nan) for name in self.fields}
+        valid = np.zeros(shape, dtype=bool)
+        for col, entry in enumerate(series):
+            if entry is None:
+                continue
+            ticks, columns = entry
+            rows = np.searchsorted(grid, ticks)
+            valid[rows, col] = True
+            for name, column in zip(self.fields, columns):
+                values[name][rows, col] = column
+        series.clear()
+
+        for name in self.fields:
+            apply_fill(values[name], valid, self.fill.get(name, self.default_fill))
+
+        panel = UniversePanel(
+            symbols=[symbol.upper() for symbol in symbols],
+            timestamps=grid,
+            values=values,
+            valid=valid,
+            missing=[symbol.upper() for symbol in missing],
+        )
+        if use_cache and not retryable:
+            self.manager.cache.store_arrays(key, panel.to_arrays())
+        elif use_cache:
+            # Outages and open circuits may clear, so the next load should try those symbols again.
+            self.logger.debug("not caching panel %s: some symbols failed for retryable reasons", key)
+        return panel
+
+    def cache_key(
+        self, symbols: Sequence[str], start: datetime, end: datetime, interval: str, adjusted: bool
+    ) -> str:
+        spec = {
+            "symbols": [symbol.upper() for symbol in symbols],
+            "start": pd.Timestamp(start).value,
+            "end": pd.Timestamp(end).value,
+            "interval": interval,
+            "adjusted": adjusted,
+            "fields": list(self.fields),
+            "fill": {name: self.fill.get(name, self.default_fill) for name in self.fields},
+        }
+        digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+        return f"panel_{interval}_{digest}"
+
+
+def apply_fill(matrix: np.ndarray, valid: np.ndarray, policy: FillPolicy) -> None:
+    """Fill unobserved cells of `matrix` in place according to `policy`."""
+    if policy == "none":
+        return
+    if policy == "zero":
+        matrix[~valid] = 0.0
+        return
+    if policy != "ffill":
+        raise ValueError(f"unknown fill policy '{policy}'")
+    # Row index of the most recent observation per column; cells before the first
+    # observation keep NaN because they point at an unobserved row.
+    rows = np.where(valid, np.arange(matrix.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    matrix[:] = matrix[rows, np.arange(matrix.shape[1])]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Generic, Iterable, Iterator, Tuple, TypeVar, Union
+
+from .providers.base import DataRequest
+
+T = TypeVar("T")
+
+
+class Prefetcher(Generic[T]):
+    """
+    Loads a planned sequence of requests ahead of the consumer.
+
+    Up to `depth` upcoming requests are fetched on background threads while
+    the caller works on the current one; results are yielded in request
+    order as `(request, result)` pairs. Nothing past `depth` is started until
+    the consumer catches up, so at most `depth` results are buffered beyond
+    the one being consumed. A failed fetch re-raises in the consumer, or is
+    yielded as `(request, exception)` when `return_exceptions=True`.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[DataRequest], T],
+        requests: Iterable[DataRequest],
+        depth: int = 2,
+        return_exceptions: bool = False,
+    ) -> None:
+        if depth <= 0:
+            raise ValueError("depth must be positive")
+        self.fetch = fetch
+        self.requests = requests
+        self.depth = depth
+        self.return_exceptions = return_exceptions
+        self.delivered = 0
+        self.wait_seconds = 0.0
+
+    def __iter__(self) -> Iterator[Tuple[DataRequest, Union[T, Exception]]]:
+        upcoming = iter(self.requests)
+        pending: Deque[Tuple[DataRequest, "Future[T]"]] = deque()
+        executor = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix="prefetch")
+
+        def submit_next() -> None:
+            request = next(upcoming, None)
+            if request is not None:
+                pending.append((request, executor.submit(self.fetch, request)))
+
+        try:
+            for _ in range(self.depth):
+                submit_next()
+            while pending:
+                request, future = pending.popleft()
+                # Keep `depth` requests in flight while the consumer works on this one.
+                submit_next()
+                started = time.perf_counter()
+                try:
+                    result: Union[T, Exception] = future.result()
+                except Exception as exc:
+                    if not self.return_exceptions:
+                        raise
+                    result = exc
+                finally:
+                    self.wait_seconds += time.perf_counter() - started
+                self.delivered += 1
+                yield request, result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, float]:
+        """Items delivered and total time the consumer spent blocked on a fetch."""
+        return {"delivered": self.delivered, "wait_seconds": self.wait_seconds, "depth": self.depth}
@@ -1,10 +1,12 @@
 """Provider registry."""
 
 from .base import DataProvider, DataRequest
+from .csv_index import CSVTimeIndex
 from .local_csv import LocalCSVProvider
 from .yahoo import YahooFinanceProvider
 
 __all__ = [
+    "CSVTimeIndex",
     "DataProvider",
     "DataRequest",
     "LocalCSVProvider",
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import bisect
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from ..errors import DataProviderError
+
+
+@dataclass(slots=True)
+class CSVTimeIndex:
+    """
+    Sparse timestamp -> byte-offset index for a timestamp-sorted CSV file.
+
+    One entry is recorded every `stride` data rows. The index remembers the
+    size and mtime of the file it was built from so a sidecar that no longer
+    describes the file is rebuilt instead of trusted.
+    """
+
+    source: str
+    stride: int
+    file_size: int
+    mtime_ns: int
+    header: List[str]
+    timestamps: List[int] = field(default_factory=list)
+    offsets: List[int] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, path: Path, stride: int, timestamp_column: str) -> "CSVTimeIndex":
+        if stride <= 0:
+            raise ValueError("stride must be positive")
+        stat = path.stat()
+        with path.open("rb") as handle:
+            header_line = handle.readline()
+            header = [col.strip() for col in header_line.decode("utf-8").strip().split(",")]
+            if timestamp_column not in header:
+                raise DataProviderError(f"{path} has no '{timestamp_column}' column")
+            position = header.index(timestamp_column)
+            index = cls(
+                source=str(path),
+                stride=stride,
+                file_size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                header=header,
+            )
+            offset = len(header_line)
+            for row, line in enumerate(handle):
+                if row % stride == 0 and line.strip():
+                    value = line.decode("utf-8").split(",", position + 1)[position]
+                    index.timestamps.append(_epoch_ns(value))
+                    index.offsets.append(offset)
+                offset += len(line)
+        return index
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: Path,
+        stride: int,
+        timestamp_column: str,
+        index_path: Optional[Path] = None,
+    ) -> "CSVTimeIndex":
+        sidecar = index_path or sidecar_path(path)
+        if sidecar.exists():
+            try:
+                cached = cls(**json.loads(sidecar.read_text(encoding="utf-8")))
+            except (ValueError, TypeError):
+                cached = None
+            if cached is not None and cached.is_current(path, stride):
+                return cached
+        index = cls.build(path, stride, timestamp_column)
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        sidecar.write_text(json.dumps(asdict(index)), encoding="utf-8")
+        return index
+
+    def is_current(self, path: Path, stride: int) -> bool:
+        stat = path.stat()
+        return self.stride == stride and self.file_size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    def offset_for(self, start_ns: int) -> Optional[int]:
+        """Byte offset of the last indexed row at or before `start_ns` (None when the file is empty)."""
+        if not self.offsets:
+            return None
+        position = bisect.bisect_right(self.timestamps, start_ns) - 1
+        return self.offsets[max(position, 0)]
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.tsidx.json")
+
+
+def _epoch_ns(value: str) -> int:
+    stamp = pd.Timestamp(value.strip().strip('"'))
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return int(stamp.value)
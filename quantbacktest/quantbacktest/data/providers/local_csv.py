@@ -1,33 +1,144 @@
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Sequence
 
 import pandas as pd
 
-from ..errors import DataProviderError
+from ..errors import DataNotFoundError, DataProviderError, DataValidationError
 from .base import DataProvider, DataRequest
+from .csv_index import CSVTimeIndex, sidecar_path
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..validator import DataValidator
+
+DEFAULT_CHUNK_DTYPES: Dict[str, str] = {
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+}
 
 
 class LocalCSVProvider(DataProvider):
     """
     Loads deterministic offline datasets from disk.
 
-    Intended for tests and air-gapped research environments.
+    Intended for tests and air-gapped research environments. When `chunksize`
+    is set, `fetch` streams the file and only materializes rows inside the
+    requested range; `stream` exposes the chunks directly. With `index_stride`
+    set, streaming seeks via a sidecar `CSVTimeIndex` instead of scanning from
+    the top of the file.
     """
 
     name = "local-csv"
 
-    def __init__(self, data_dir: Path, pattern: str = "synthetic_{symbol}.csv") -> None:
+    def __init__(
+        self,
+        data_dir: Path,
+        pattern: str = "synthetic_{symbol}.csv",
+        chunksize: Optional[int] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+        index_stride: Optional[int] = None,
+        index_dir: Optional[Path] = None,
+    ) -> None:
+        if chunksize is not None and chunksize <= 0:
+            raise ValueError("chunksize must be positive")
+        if index_stride is not None and index_stride <= 0:
+            raise ValueError("index_stride must be positive")
         self.data_dir = data_dir
         self.pattern = pattern
+        self.chunksize = chunksize
+        self.dtypes = dict(DEFAULT_CHUNK_DTYPES if dtypes is None else dtypes)
+        self.index_stride = index_stride
+        self.index_dir = index_dir
 
     def fetch(self, request: DataRequest) -> pd.DataFrame:
-        symbol_slug = request.symbol.lower()
-        filename = self.pattern.format(symbol=symbol_slug, interval=request.interval)
-        path = self.data_dir / filename
-        if not path.exists():
-            raise DataProviderError(f"local fixture missing: {path}")
+        path = self._path_for(request)
+        if self.chunksize or self.index_stride:
+            chunks = list(self.stream(request))
+            if not chunks:
+                raise DataNotFoundError(f"no rows in requested range: {path}")
+            return pd.concat(chunks, ignore_index=True)
         frame = pd.read_csv(path)
         if "timestamp" not in frame.columns and "date" in frame.columns:
             frame = frame.rename(columns={"date": "timestamp"})
         return frame
+
+    def stream(
+        self,
+        request: DataRequest,
+        chunksize: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+        validator: Optional["DataValidator"] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield in-range chunks of a timestamp-sorted CSV file.
+
+        Only `columns` (plus the timestamp) are parsed, numeric columns use the
+        configured dtype hints, and reading stops at the first row past
+        `request.end`, so memory is bounded by `chunksize` rather than the file.
+        Each yielded chunk has been passed through `validator` when one is given.
+        """
+        path = self._path_for(request)
+        size = chunksize or self.chunksize or 100_000
+        header = pd.read_csv(path, nrows=0).columns
+        ts_col = "timestamp" if "timestamp" in header else "date" if "date" in header else None
+        if ts_col is None:
+            raise DataProviderError(f"local fixture has no timestamp column: {path}")
+        wanted = [col for col in header if col != ts_col and (columns is None or col in columns)]
+        dtypes = {col: dtype for col, dtype in self.dtypes.items() if col in wanted}
+
+        start = _utc_timestamp(request.start)
+        end = _utc_timestamp(request.end)
+        offset = self.time_index(path, ts_col).offset_for(start.value) if self.index_stride else None
+        last_seen: Optional[pd.Timestamp] = None
+        with path.open("rb") as handle:
+            header_kwargs: Dict[str, Any] = {}
+            if offset is not None:
+                # Jump past everything before the last indexed row at or before `start`.
+                handle.seek(offset)
+                header_kwargs = {"header": None, "names": list(header)}
+            with pd.read_csv(
+                handle, usecols=[ts_col, *wanted], dtype=dtypes, chunksize=size, **header_kwargs
+            ) as reader:
+                for chunk in reader:
+                    if ts_col != "timestamp":
+                        chunk = chunk.rename(columns={ts_col: "timestamp"})
+                    chunk["timestamp"] = pd.to_datetime(chunk["timestamp"], utc=True)
+                    timestamps = chunk["timestamp"]
+                    if not timestamps.is_monotonic_increasing:
+                        raise DataValidationError("timestamps must be sorted for streaming reads")
+                    if last_seen is not None and timestamps.iloc[0] <= last_seen:
+                        raise DataValidationError("timestamps must increase across chunks for streaming reads")
+                    last_seen = timestamps.iloc[-1]
+
+                    lower = timestamps.searchsorted(start, side="left")
+                    upper = timestamps.searchsorted(end, side="right")
+                    if lower < upper:
+                        window = chunk.iloc[lower:upper].reset_index(drop=True)
+                        yield validator.validate(window, request) if validator is not None else window
+                    if upper < len(chunk):
+                        return
+
+    def time_index(self, path: Path, timestamp_column: str = "timestamp") -> CSVTimeIndex:
+        """Load the sidecar time index for `path`, rebuilding it if the file changed."""
+        if not self.index_stride:
+            raise ValueError("index_stride is not configured")
+        index_path = self.index_dir / sidecar_path(path).name if self.index_dir else None
+        return CSVTimeIndex.load_or_build(path, self.index_stride, timestamp_column, index_path=index_path)
+
+    def _path_for(self, request: DataRequest) -> Path:
+        symbol_slug = request.symbol.lower()
+        filename = self.pattern.format(symbol=symbol_slug, interval=request.interval)
+        path = self.data_dir / filename
+        if not path.exists():
+            raise DataNotFoundError(f"local fixture missing: {path}")
+        return path
+
+
+def _utc_timestamp(value: datetime) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    return stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
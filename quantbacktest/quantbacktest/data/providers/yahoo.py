@@ -7,7 +7,7 @@ from typing import Optional
 import pandas as pd
 import yfinance as yf  # type: ignore[import-untyped]
 
-from ..errors import DataProviderError
+from ..errors import DataNotFoundError, DataProviderError
 from .base import DataProvider, DataRequest
 
 
@@ -40,7 +40,7 @@ class YahooFinanceProvider(DataProvider):
                 )
 
                 if df.empty:
-                    raise DataProviderError("yfinance returned no data")
+                    raise DataNotFoundError("yfinance returned no data")
 
                 # Put the index into a regular column
                 df = df.reset_index()
@@ -100,6 +100,9 @@ class YahooFinanceProvider(DataProvider):
                 # ---- 5) Return exactly what the validator expects ----
                 return df[["timestamp", "open", "high", "low", "close", "volume"]]
 
+            except DataNotFoundError:
+                # Retrying cannot conjure data for a delisted symbol or empty range.
+                raise
             except Exception as exc:  # pragma: no cover - network path
                 last_error = exc
                 if attempt < self.retries:
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import pandas as pd
+
+from .errors import DataFetchError, DataNotFoundError, DataProviderError, DataValidationError
+from .manifest import timestamp_ns
+from .providers.base import DataProvider, DataRequest
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .manager import DataManager
+
+_INTERVAL_PATTERN = re.compile(r"^(\d+)(m|h|d|wk)$")
+_UNIT_NS = {
+    "m": 60 * 1_000_000_000,
+    "h": 3_600 * 1_000_000_000,
+    "d": 86_400 * 1_000_000_000,
+    "wk": 7 * 86_400 * 1_000_000_000,
+}
+
+
+def interval_ns(interval: str) -> int:
+    """Width of a fixed-size bar interval (`5m`, `1h`, `1d`, `1wk`) in nanoseconds."""
+    match = _INTERVAL_PATTERN.match(interval.strip().lower())
+    if not match:
+        raise ValueError(f"unsupported bar interval '{interval}'")
+    count, unit = match.groups()
+    if int(count) <= 0:
+        raise ValueError(f"unsupported bar interval '{interval}'")
+    return int(count) * _UNIT_NS[unit]
+
+
+def resample_bars(
+    frame: pd.DataFrame,
+    interval: str,
+    session_start: str = "00:00",
+    session_end: Optional[str] = None,
+    timezone: str = "UTC",
+) -> pd.DataFrame:
+    """
+    Aggregate timestamp-sorted OHLCV bars into coarser fixed-width bars.
+
+    Buckets are anchored at `session_start` in `timezone` wall-clock time, so
+    `1h` bars for a 09:30 New York open start at 09:30, 10:30, ... across DST
+    changes, and `1d` bars run from one session open to the next (weeks start
+    on Monday). Rows outside `[session_start, session_end)` are dropped when
+    `session_end` is given. Each bar is labelled with its bucket start and
+    aggregates open=first, high=max, low=min, close=last, volume=sum.
+    """
+    width = interval_ns(interval)
+    columns = ["timestamp", "open", "high", "low", "close", "volume"]
+    utc_ns = timestamp_ns(frame["timestamp"])
+    local_ns = utc_ns + _utc_offsets_ns(frame["timestamp"], timezone)
+    day_ns = _UNIT_NS["d"]
+    anchor = _clock_ns(session_start)
+    since_open = (local_ns - anchor) % day_ns
+
+    rows = np.arange(len(frame))
+    if session_end is not None:
+        session_length = (_clock_ns(session_end) - anchor) % day_ns or day_ns
+        rows = np.flatnonzero(since_open < session_length)
+    if not len(rows):
+        return pd.DataFrame({name: [] for name in columns}).astype({"timestamp": "datetime64[ns, UTC]"})
+    utc_ns, local_ns, since_open = utc_ns[rows], local_ns[rows], since_open[rows]
+
+    session_day = (local_ns - anchor) // day_ns
+    if width < day_ns:
+        bucket = session_day * (day_ns // width + 1) + since_open // width
+        bucket_start = local_ns - since_open % width
+    else:
+        days = width // day_ns
+        # Epoch day 0 is a Thursday; shift so weekly buckets begin on Monday.
+        shifted = session_day + (3 if interval.strip().lower().endswith("wk") else 0)
+        bucket = shifted // days
+        bucket_start = (session_day - shifted % days) * day_ns + anchor
+
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+    # Convert labels back to UTC using each bucket's first observation's offset.
+    labels = utc_ns[starts] - (local_ns[starts] - bucket_start[starts])
+
+    def values(name: str) -> np.ndarray:
+        return frame[name].to_numpy(dtype="float64")[rows]
+
+    return pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(labels, utc=True),
+            "open": values("open")[starts],
+            "high": np.maximum.reduceat(values("high"), starts),
+            "low": np.minimum.reduceat(values("low"), starts),
+            "close": values("close")[ends],
+            "volume": np.add.reduceat(values("volume"), starts),
+        }
+    )
+
+
+def _clock_ns(value: str) -> int:
+    """Nanoseconds after midnight for an `HH:MM` or `HH:MM:SS` wall-clock time."""
+    text = value.strip()
+    return int(pd.Timedelta(text if text.count(":") == 2 else f"{text}:00").value)
+
+
+def _utc_offsets_ns(timestamps: pd.Series, timezone: str) -> np.ndarray:
+    if timezone.upper() == "UTC":
+        return np.zeros(len(timestamps), dtype=np.int64)
+    utc = pd.to_datetime(timestamps, utc=True)
+    local = utc.dt.tz_convert(timezone).dt.tz_localize(None).dt.as_unit("ns").to_numpy(dtype="int64")
+    return local - utc.dt.tz_localize(None).dt.as_unit("ns").to_numpy(dtype="int64")
+
+
+class ResamplingProvider(DataProvider):
+    """
+    Derives coarser intervals from finer bars served by another `DataManager`.
+
+    Place it ahead of network providers in a chain; the outer `DataManager`
+    caches each derived interval under its own cache key, so e.g. `5m`, `1h`
+    and `1d` are computed once from cached `1m` bars instead of downloaded.
+    """
+
+    name = "resample"
+
+    def __init__(
+        self,
+        source: "DataManager",
+        base_interval: str = "1m",
+        session_start: str = "00:00",
+        session_end: Optional[str] = None,
+        timezone: str = "UTC",
+    ) -> None:
+        self.source = source
+        self.base_interval = base_interval
+        self.base_ns = interval_ns(base_interval)
+        self.session_start = session_start
+        self.session_end = session_end
+        self.timezone = timezone
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        try:
+            target_ns = interval_ns(request.interval)
+        except ValueError as exc:
+            raise DataNotFoundError(str(exc)) from exc
+        if target_ns <= self.base_ns or target_ns % self.base_ns:
+            raise DataNotFoundError(
+                f"{request.interval} is not a multiple of base interval {self.base_interval}"
+            )
+        base_request = DataRequest(
+            symbol=request.symbol,
+            start=request.start,
+            end=request.end,
+            interval=self.base_interval,
+            adjusted=request.adjusted,
+        )
+        try:
+            base = self.source.fetch(base_request)
+        except (DataFetchError, DataValidationError) as exc:
+            raise DataProviderError(f"base interval {self.base_interval} unavailable: {exc}") from exc
+        bars = resample_bars(
+            base,
+            request.interval,
+            session_start=self.session_start,
+            session_end=self.session_end,
+            timezone=self.timezone,
+        )
+        # The first bucket may start before the request window; it only holds in-window data.
+        window_start = pd.Timestamp(request.start)
+        window_start = window_start.tz_localize("UTC") if window_start.tzinfo is None else window_start
+        bars["timestamp"] = bars["timestamp"].where(bars["timestamp"] >= window_start, window_start)
+        return bars
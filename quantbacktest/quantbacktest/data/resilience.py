@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Tuple
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    until `reset_timeout` seconds have passed, then lets a single half-open
+    probe through; the probe's outcome closes or re-opens the circuit.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    state: str = field(default="closed", init=False)
+    consecutive_failures: int = field(default=0, init=False)
+    opened_at: float = field(default=0.0, init=False)
+    trips: int = field(default=0, init=False)
+    rejected: int = field(default=0, init=False)
+    _probe_in_flight: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold <= 0:
+            raise ValueError("failure_threshold must be positive")
+        if self.reset_timeout < 0:
+            raise ValueError("reset_timeout cannot be negative")
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = self.clock()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+@dataclass(slots=True)
+class NegativeCache:
+    """
+    Remembers (provider, cache key) pairs that are known to have no data.
+
+    Entries expire after `ttl` seconds so delistings or late backfills are
+    eventually retried.
+    """
+
+    ttl: float = 300.0
+    clock: Callable[[], float] = time.monotonic
+    hits: int = field(default=0, init=False)
+    _entries: Dict[Tuple[str, str], float] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def add(self, provider: str, key: str) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(provider, key)] = self.clock() + self.ttl
+
+    def contains(self, provider: str, key: str) -> bool:
+        with self._lock:
+            expires = self._entries.get((provider, key))
+            if expires is None:
+                return False
+            if self.clock() >= expires:
+                del self._entries[(provider, key)]
+                return False
+            self.hits += 1
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            now = self.clock()
+            return sum(1 for expires in self._entries.values() if expires > now)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {"entries": len(self), "hits": self.hits, "ttl": self.ttl}
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Sequence
 
 from .cache import LocalDataCache
+from .dtypes import DtypePolicy
 from .manager import DataManager
 from .providers.base import DataProvider
 from .providers.local_csv import LocalCSVProvider
@@ -23,6 +24,9 @@ class DataSettings:
     cache_dir: Path
     provider_chain: Sequence[ProviderConfig]
     data_dir: Path | None = None
+    cache_max_bytes: int | None = None
+    cache_format: str = "csv"
+    dtype_policy: DtypePolicy | None = None
 
     @classmethod
     def defaults(cls, cache_dir: Path, data_dir: Path | None = None) -> "DataSettings":
@@ -36,7 +40,7 @@ class DataSettings:
         )
 
     def build_manager(self) -> DataManager:
-        cache = LocalDataCache(root=self.cache_dir)
+        cache = LocalDataCache(root=self.cache_dir, frame_suffix=self.cache_format, max_bytes=self.cache_max_bytes)
         providers: list[DataProvider] = []
         for config in self.provider_chain:
             if config.name == "local_csv":
@@ -49,4 +53,4 @@ class DataSettings:
                 raise ValueError(f"Unknown provider '{config.name}'")
         if not providers:
             raise ValueError("No providers configured for DataSettings")
-        return DataManager(cache=cache, providers=providers, validator=DataValidator())
+        return DataManager(cache=cache, providers=providers, validator=DataValidator(), dtype_policy=self.dtype_policy)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import _atomic_write
+from .errors import DataNotFoundError, DataValidationError
+from .manifest import frame_hash, timestamp_ns
+from .providers.base import DataRequest
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .manager import DataManager
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+@dataclass(slots=True)
+class SnapshotEntry:
+    """One pinned request: where its frame came from and which chunks rebuild it."""
+
+    cache_key: str
+    symbol: str
+    start: str
+    end: str
+    interval: str
+    adjusted: bool
+    columns: List[str]
+    row_count: int
+    chunks: List[str]
+    dtypes: Dict[str, str] = field(default_factory=dict)
+
+    def request(self) -> DataRequest:
+        return DataRequest(
+            symbol=self.symbol,
+            start=datetime.fromisoformat(self.start),
+            end=datetime.fromisoformat(self.end),
+            interval=self.interval,
+            adjusted=self.adjusted,
+        )
+
+
+@dataclass(slots=True)
+class DatasetSnapshot:
+    snapshot_id: str
+    created_at: float
+    entries: Dict[str, SnapshotEntry] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        payload = {
+            "snapshot_id": self.snapshot_id,
+            "created_at": self.created_at,
+            "entries": [asdict(entry) for entry in self.entries.values()],
+        }
+        return json.dumps(payload, indent=2)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "DatasetSnapshot":
+        data: Dict[str, Any] = json.loads(payload)
+        entries = [SnapshotEntry(**entry) for entry in data["entries"]]
+        return cls(
+            snapshot_id=data["snapshot_id"],
+            created_at=data["created_at"],
+            entries={entry.cache_key: entry for entry in entries},
+        )
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of frame chunks plus snapshot manifests.
+
+    Frames are cut into chunks at boundaries derived from their timestamps
+    (not row offsets), so overlapping or extended ranges of the same series
+    produce identical chunks and each chunk is written once. A snapshot pins
+    a set of requests to chunk hashes; its id is the hash of that mapping,
+    so the same data always yields the same id and a run's inputs can be
+    rebuilt without any provider call.
+    """
+
+    def __init__(self, root: Path, chunk_rows: int = 4096) -> None:
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self.root = Path(root)
+        self.chunk_rows = chunk_rows
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- writing -----------------------------------------------------------
+    def create(self, frames: Iterable[Tuple[DataRequest, pd.DataFrame]]) -> str:
+        """Pin validated frames and return the snapshot id."""
+        entries: Dict[str, SnapshotEntry] = {}
+        for request, frame in frames:
+            cache_key = request.cache_key()
+            entries[cache_key] = SnapshotEntry(
+                cache_key=cache_key,
+                symbol=request.symbol,
+                start=request.start.isoformat(),
+                end=request.end.isoformat(),
+                interval=request.interval,
+                adjusted=request.adjusted,
+                columns=[str(col) for col in frame.columns],
+                row_count=len(frame),
+                chunks=self.put_frame(frame),
+                dtypes={
+                    str(col): str(dtype)
+                    for col, dtype in frame.dtypes.items()
+                    if col == "timestamp" or _is_number(frame[col])
+                },
+            )
+        ordered = {key: entries[key] for key in sorted(entries)}
+        spec = json.dumps([asdict(entry) for entry in ordered.values()], sort_keys=True)
+        snapshot_id = hashlib.sha256(spec.encode("utf-8")).hexdigest()[:24]
+        path = self._snapshot_path(snapshot_id)
+        if not path.exists():
+            snapshot = DatasetSnapshot(snapshot_id=snapshot_id, created_at=time.time(), entries=ordered)
+            _atomic_write(path, lambda tmp: tmp.write_text(snapshot.to_json(), encoding="utf-8"))
+        return snapshot_id
+
+    def capture(self, manager: "DataManager", requests: Iterable[DataRequest]) -> str:
+        """Fetch each request through `manager` (cache first) and pin the results."""
+        return self.create((request, manager.fetch(request)) for request in requests)
+
+    def put_frame(self, frame: pd.DataFrame) -> List[str]:
+        """Store `frame` as content-addressed chunks, skipping chunks already present."""
+        if not len(frame):
+            return []
+        bounds = _chunk_starts(timestamp_ns(frame["timestamp"]), self.chunk_rows)
+        hashes: List[str] = []
+        for start, stop in zip(bounds, [*bounds[1:], len(frame)]):
+            chunk = frame.iloc[start:stop]
+            digest = frame_hash(chunk)
+            path = self._object_path(digest)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                arrays = _encode(chunk)
+
+                def write(tmp: Path, arrays: Dict[str, np.ndarray] = arrays) -> None:
+                    with tmp.open("wb") as handle:
+                        np.savez(handle, **arrays)  # type: ignore[arg-type]
+
+                _atomic_write(path, write)
+            hashes.append(digest)
+        return hashes
+
+    # --- reading -----------------------------------------------------------
+    def load(self, snapshot_id: str) -> DatasetSnapshot:
+        path = self._snapshot_path(snapshot_id)
+        if not path.exists():
+            raise DataNotFoundError(f"unknown snapshot '{snapshot_id}'")
+        return DatasetSnapshot.from_json(path.read_text(encoding="utf-8"))
+
+    def frame(self, snapshot_id: str, request: DataRequest, verify: bool = True) -> pd.DataFrame:
+        entry = self.load(snapshot_id).entries.get(request.cache_key())
+        if entry is None:
+            raise DataNotFoundError(f"{request.cache_key()} is not pinned in snapshot {snapshot_id}")
+        return self._assemble(entry, verify)
+
+    def rehydrate(self, snapshot_id: str, verify: bool = True) -> Dict[str, pd.DataFrame]:
+        """Rebuild every pinned frame, keyed by cache key."""
+        snapshot = self.load(snapshot_id)
+        return {key: self._assemble(entry, verify) for key, entry in snapshot.entries.items()}
+
+    def stats(self) -> Dict[str, int]:
+        objects = list(self.objects_dir.glob("*/*.npz"))
+        return {
+            "snapshots": sum(1 for _ in self.snapshots_dir.glob("*.json")),
+            "chunks": len(objects),
+            "bytes": sum(path.stat().st_size for path in objects),
+        }
+
+    def _assemble(self, entry: SnapshotEntry, verify: bool) -> pd.DataFrame:
+        parts = [self._load_chunk(digest, entry.columns, verify) for digest in entry.chunks]
+        if not parts:
+            frame = pd.DataFrame({name: [] for name in entry.columns})
+            frame = frame.astype({"timestamp": "datetime64[ns, UTC]"}) if "timestamp" in frame else frame
+        else:
+            frame = pd.concat(parts, ignore_index=True)
+        # Chunks are shared by content, so a chunk may have been written from a frame with other numeric dtypes.
+        return frame.astype(entry.dtypes) if entry.dtypes else frame
+
+    def _load_chunk(self, digest: str, columns: List[str], verify: bool) -> pd.DataFrame:
+        try:
+            with np.load(self._object_path(digest), allow_pickle=False) as bundle:
+                data = {name: bundle[name] for name in columns}
+        except FileNotFoundError as exc:
+            raise DataNotFoundError(f"snapshot chunk {digest} is missing") from exc
+        if "timestamp" in data:
+            data["timestamp"] = pd.to_datetime(data["timestamp"], utc=True)
+        chunk = pd.DataFrame(data, columns=columns)
+        if verify and frame_hash(chunk) != digest:
+            raise DataValidationError(f"snapshot chunk {digest} is corrupted")
+        return chunk
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.npz"
+
+    def _snapshot_path(self, snapshot_id: str) -> Path:
+        return self.snapshots_dir / f"{snapshot_id}.json"
+
+
+class SnapshotProvider:
+    """Serves requests pinned in a snapshot so a `DataManager` can replay a run offline."""
+
+    name = "snapshot"
+
+    def __init__(self, store: SnapshotStore, snapshot_id: str) -> None:
+        self.store = store
+        self.snapshot_id = snapshot_id
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        return self.store.frame(self.snapshot_id, request)
+
+
+def _chunk_starts(ticks: np.ndarray, target_rows: int) -> List[int]:
+    """
+    Content-defined chunk boundaries: a row starts a chunk when a hash of its
+    timestamp is divisible by `target_rows`, giving chunks of about that size
+    that line up across frames sharing the same timestamps.
+    """
+    mixed = (ticks.astype(np.uint64) * _MIX) >> np.uint64(32)
+    starts = np.flatnonzero(mixed % np.uint64(target_rows) == 0)
+    if not len(starts) or starts[0] != 0:
+        starts = np.r_[0, starts]
+    return [int(start) for start in starts]
+
+
+def _encode(chunk: pd.DataFrame) -> Dict[str, np.ndarray]:
+    arrays: Dict[str, np.ndarray] = {}
+    for column in chunk.columns:
+        values = chunk[column]
+        if column == "timestamp":
+            arrays[str(column)] = timestamp_ns(values)
+        elif _is_number(values) and pd.api.types.is_integer_dtype(values):
+            arrays[str(column)] = values.to_numpy(dtype="int64")
+        elif _is_number(values):
+            arrays[str(column)] = values.to_numpy(dtype="float64")
+        else:
+            arrays[str(column)] = values.astype(str).to_numpy(dtype=str)
+    return arrays
+
+
+def _is_number(values: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
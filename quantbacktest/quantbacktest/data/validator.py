@@ -2,24 +2,36 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
 from .errors import DataValidationError
 from .providers.base import DataRequest
 
+# Bump whenever validation rules change so cached manifests are re-checked.
+VALIDATOR_VERSION = "1"
+_NS_PER_UNIT = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
 
 @dataclass(slots=True)
 class DataValidator:
     required_columns: Iterable[str] = field(
         default_factory=lambda: ("timestamp", "open", "high", "low", "close", "volume")
     )
+    version: str = VALIDATOR_VERSION
+    fast_path: bool = True
 
     def validate(self, frame: pd.DataFrame, request: DataRequest) -> pd.DataFrame:
         if frame is None or frame.empty:
             raise DataValidationError("received empty data frame")
 
+        if self.fast_path:
+            validated = self._validate_canonical(frame, request)
+            if validated is not None:
+                return validated
+
         df = frame.copy()
 
         # --- Normalize column names: handle both Index and MultiIndex ---
@@ -52,7 +64,7 @@ class DataValidator:
             df = df.sort_values("timestamp", ignore_index=True)
 
         # Ensure no NaNs in required columns
-        if df[required_cols].isna().any().any():
+        if df[required_cols].isna().to_numpy().any():
             raise DataValidationError("NaN values detected in required columns")
 
         # Enforce requested date range (no look-ahead / leakage)
@@ -64,8 +76,70 @@ class DataValidator:
         if df["timestamp"].max() > request_end:
             raise DataValidationError("data extends beyond request end; potential lookahead")
 
-        df = df[(df["timestamp"] >= request_start) & (df["timestamp"] <= request_end)].reset_index(drop=True)
-        return df
+        return self.slice_range(df, request)
+
+    def slice_range(self, frame: pd.DataFrame, request: DataRequest) -> pd.DataFrame:
+        """
+        Trim an already-validated, timestamp-sorted frame to the request window.
+
+        Used for cache hits whose manifest matches, so no normalization or
+        integrity checks are repeated.
+        """
+        timestamps = frame["timestamp"]
+        lower = timestamps.searchsorted(pd.Timestamp(_ensure_utc(request.start)), side="left")
+        upper = timestamps.searchsorted(pd.Timestamp(_ensure_utc(request.end)), side="right")
+        if lower == 0 and upper == len(frame):
+            return frame
+        return frame.iloc[lower:upper].reset_index(drop=True)
+
+    def _validate_canonical(self, frame: pd.DataFrame, request: DataRequest) -> Optional[pd.DataFrame]:
+        """
+        Validate a frame that already has the canonical schema without copying it.
+
+        Returns None when the frame needs normalization (non-canonical columns,
+        naive or non-UTC timestamps, unsorted or duplicate rows) so the caller
+        can fall back to the full path, which also produces the detailed errors.
+        """
+        if isinstance(frame.columns, pd.MultiIndex) or not isinstance(frame.index, pd.RangeIndex):
+            return None
+        if frame.index.start != 0 or frame.index.step != 1:
+            return None
+        required_cols = list(self.required_columns)
+        columns = set(frame.columns)
+        if any(not isinstance(col, str) or col != col.lower() for col in columns):
+            return None
+        if not columns.issuperset(required_cols):
+            return None
+
+        timestamps = frame["timestamp"]
+        dtype = timestamps.dtype
+        if not isinstance(dtype, pd.DatetimeTZDtype) or str(dtype.tz) != "UTC":
+            return None
+        values = [frame[col] for col in required_cols if col != "timestamp"]
+        if any(not isinstance(col.dtype, np.dtype) or col.dtype.kind not in "fiu" for col in values):
+            return None
+
+        # Strictly increasing int64 timestamps imply sorted, duplicate-free and NaT-free
+        # (NaT is the int64 minimum, so it can only appear first).
+        ticks = timestamps.array.asi8
+        if ticks[0] == np.iinfo(np.int64).min or (len(ticks) > 1 and not (ticks[1:] > ticks[:-1]).all()):
+            return None
+
+        for col in values:
+            if col.dtype.kind == "f" and np.isnan(col.to_numpy(copy=False)).any():
+                raise DataValidationError("NaN values detected in required columns")
+
+        scale = _NS_PER_UNIT[dtype.unit]
+        request_start = pd.Timestamp(_ensure_utc(request.start)).value
+        request_end = pd.Timestamp(_ensure_utc(request.end)).value
+        # Ceil the start and floor the end so coarser units never admit out-of-range rows.
+        lower_bound = -(-request_start // scale)
+        upper_bound = request_end // scale
+        if ticks[0] < lower_bound:
+            raise DataValidationError("data begins before request start; potential leakage")
+        if ticks[-1] > upper_bound:
+            raise DataValidationError("data extends beyond request end; potential lookahead")
+        return frame
 
 
 def _normalize_timestamps(series: pd.Series) -> pd.Series:
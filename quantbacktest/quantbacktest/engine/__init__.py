@@ -3,13 +3,19 @@
 from .base import BacktestRunner, BacktestSettings
 from .context import EngineContext
 from .demo import run_placeholder_backtest
+from .dispatch import EventDispatcher, HandlerStats
 from .modes import EngineMode, EngineResult
+from .netting import NettingStats, SignalNetter
 
 __all__ = [
     "BacktestRunner",
     "BacktestSettings",
     "EngineContext",
+    "EventDispatcher",
+    "HandlerStats",
     "run_placeholder_backtest",
     "EngineMode",
     "EngineResult",
+    "NettingStats",
+    "SignalNetter",
 ]
@@ -1,27 +1,41 @@
 from __future__ import annotations
 
+import dataclasses
 import json
 import time
-from dataclasses import dataclass
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from itertools import count
+from time import perf_counter_ns
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Literal, cast
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Literal, Tuple, cast
 
-from ..core.events import FillEvent, MarketEvent, OrderEvent, SignalEvent
+import numpy as np
+
+from ..core.events import Event, EventType, FillEvent, MarketEvent, OrderEvent, SignalEvent, TimerEvent
 from ..core.execution import ExecutionConfig, SimulatedExecutionHandler
-from ..core.queue import EventQueue
-from ..portfolio import PortfolioState
+from ..core.orderbook import OrderBook
+from ..core.queue import EventScheduler
+from ..portfolio import PortfolioState, Rebalancer, RiskEngine, RiskLimits
 from ..strategy.base import Strategy
 from ..strategy.context import StrategyContext
 from ..strategy.indicators import IndicatorCache
 from ..utils.logging import get_logger
 from ..utils.random import DeterministicRandom
+from ..utils.tracing import Tracer
 from .context import EngineContext
+from .dispatch import EventDispatcher, Handler
 from .modes import EngineMode, EngineResult, EngineSegmentResult, SegmentPlan
+from .netting import SignalNetter
 from ..metrics.report import build_metrics_report
 from .scheduler import RunScheduler
 
 
+_OrderSide = Literal["BUY", "SELL"]
+_STAGES = ("strategy", "execution", "portfolio", "scheduling")
+
+
 @dataclass(slots=True)
 class BacktestSettings:
     run_id: str = "skeleton"
@@ -33,6 +47,29 @@ class BacktestSettings:
     grid_parameters: Sequence[Dict[str, float]] | None = None
     enable_progress: bool = True
     enable_checkpointing: bool = True
+    data_snapshot: Optional[str] = None
+    order_latency: float = 0.0
+    net_signals: bool = True
+    rebalancer: Rebalancer = field(default_factory=Rebalancer)
+    risk_limits: Optional[RiskLimits] = None
+    instrument_handlers: bool = False
+    stage_timers: bool = True
+    timer_sample_every: int = 61  # prime, so sampling does not lock onto a fixed symbol rotation
+    trace: bool = False
+
+
+@dataclass(slots=True)
+class _SegmentState:
+    plan: SegmentPlan
+    portfolio: PortfolioState
+    scheduler: EventScheduler
+    order_book: OrderBook
+    netter: SignalNetter
+    dispatcher: EventDispatcher
+    risk: Optional[RiskEngine] = None
+    latest_market: Dict[str, MarketEvent] = field(default_factory=dict)
+    fills: List[FillEvent] = field(default_factory=list)
+    pending: List[SignalEvent] = field(default_factory=list)
 
 
 class BacktestRunner:
@@ -41,6 +78,7 @@ class BacktestRunner:
         strategy: Strategy,
         settings: BacktestSettings | None = None,
         execution_handler: SimulatedExecutionHandler | None = None,
+        tracer: Tracer | None = None,
     ) -> None:
         self.strategy = strategy
         self.settings = settings or BacktestSettings()
@@ -50,10 +88,27 @@ class BacktestRunner:
         self.portfolio: Optional[PortfolioState] = None
         self.last_snapshot: Optional[dict[str, float]] = None
         self.strategy_context: Optional[StrategyContext] = None
+        self._extra_handlers: List[Tuple[EventType, Handler, Optional[str]]] = []
         self.output_dir = self.settings.output_dir / self.settings.run_id
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Pass one tracer to runners in a thread pool to see them on a shared timeline;
+        # the caller that owns a shared tracer writes it, since it holds every runner's spans.
+        self._owns_tracer = tracer is None and self.settings.trace
+        if self._owns_tracer:
+            tracer = Tracer(process_name=self.settings.run_id)
+        self.tracer = tracer
 
     def run(self, market_events: Iterable[MarketEvent]) -> EngineResult:
+        if self.tracer is None:
+            return self._run(market_events)
+        try:
+            with self.tracer.span("run", run_id=self.settings.run_id, mode=self.settings.mode.value):
+                return self._run(market_events)
+        finally:
+            if self._owns_tracer:
+                self.tracer.write(self.output_dir / "trace.json")
+
+    def _run(self, market_events: Iterable[MarketEvent]) -> EngineResult:
         context = EngineContext(
             portfolio=PortfolioState(base_currency="USD", starting_cash=self.settings.initial_cash),
             run_id=self.settings.run_id,
@@ -65,24 +120,31 @@ class BacktestRunner:
             walk_forward_window=self.settings.walk_forward_window,
             grid_parameters=self.settings.grid_parameters,
         )
-        plans = scheduler.plan(market_events)
+        with self._span("plan", "scheduling"):
+            plans = scheduler.plan(market_events)
         if not plans:
             raise ValueError("No market events supplied to BacktestRunner.")
 
         metadata_path = self.output_dir / "metadata.json"
         segment_results: List[EngineSegmentResult] = []
         status = "completed"
+        io_ns = 0
 
         try:
             for idx, plan in enumerate(plans, 1):
                 if self.settings.enable_progress:
                     self.logger.info("run %s segment %s (%d/%d)", self.settings.run_id, plan.segment_id, idx, len(plans))
-                self._prepare_strategy_context(context.portfolio, plan)
-                self._apply_parameters(plan.parameters)
-                result = self._execute_segment(plan, context.portfolio)
+                with self._span("segment", segment_id=plan.segment_id, events=len(plan.events)):
+                    with self._span("strategy.prepare", "strategy"):
+                        self._prepare_strategy_context(context.portfolio, plan)
+                        self._apply_parameters(plan.parameters)
+                    result = self._execute_segment(plan, context.portfolio)
                 segment_results.append(result)
                 if self.settings.enable_checkpointing:
-                    self._write_metadata(metadata_path, segment_results, status="in_progress")
+                    started = perf_counter_ns()
+                    with self._span("checkpoint", "io", segment_id=plan.segment_id):
+                        self._write_metadata(metadata_path, segment_results, status="in_progress")
+                    io_ns += perf_counter_ns() - started
         except Exception as exc:  # pragma: no cover - crash path
             status = "crashed"
             self._write_metadata(metadata_path, segment_results, status=status, error=str(exc))
@@ -90,77 +152,315 @@ class BacktestRunner:
 
         self.last_snapshot = context.portfolio.snapshot()
         self.portfolio = context.portfolio
-        self._write_metadata(metadata_path, segment_results, status=status)
-        build_metrics_report(
-            EngineResult(
-                run_id=self.settings.run_id,
-                mode=self.settings.mode,
-                segments=segment_results,
-                metadata_path=str(metadata_path),
-                status=status,
-            ),
-            self.output_dir,
-        )
-        return EngineResult(
+        engine_result = EngineResult(
             run_id=self.settings.run_id,
             mode=self.settings.mode,
             segments=segment_results,
             metadata_path=str(metadata_path),
             status=status,
         )
+        started = perf_counter_ns()
+        # The final write reports the I/O spent before it; the report build is added afterwards.
+        engine_result.timings = self._run_timings(segment_results, io_ns)
+        with self._span("report", "io"):
+            self._write_metadata(metadata_path, segment_results, status=status, timings=engine_result.timings)
+            build_metrics_report(engine_result, self.output_dir)
+        if engine_result.timings is not None:
+            engine_result.timings["stages"]["io"] += (perf_counter_ns() - started) / 1e9
+        return engine_result
+
+    def add_handler(self, event_type: EventType, handler: Handler, name: Optional[str] = None) -> None:
+        """Register an extra stage; it runs after the built-in handlers for `event_type` in every segment."""
+        self._extra_handlers.append((event_type, handler, name))
 
     # --- internal helpers -------------------------------------------------
-    def _execute_segment(self, plan: SegmentPlan, portfolio: PortfolioState) -> EngineSegmentResult:
-        start = time.time()
-        queue = EventQueue()
-        fills: List[FillEvent] = []
-        latest_market: dict[str, MarketEvent] = {}
+    def _span(self, name: str, category: str = "engine", **args: Any) -> AbstractContextManager[Any]:
+        return nullcontext() if self.tracer is None else self.tracer.span(name, category, **args)
 
-        for market_event in plan.events:
-            queue.put(market_event)
+    def _execute_segment(self, plan: SegmentPlan, portfolio: PortfolioState) -> EngineSegmentResult:
+        start = perf_counter_ns()
+        timing = self.settings.stage_timers or self.settings.instrument_handlers or self.tracer is not None
+        sample_every = 1 if self.settings.instrument_handlers else max(1, self.settings.timer_sample_every)
+        risk = RiskEngine(self.settings.risk_limits, portfolio) if self.settings.risk_limits is not None else None
+        state = _SegmentState(
+            plan=plan,
+            portfolio=portfolio,
+            scheduler=EventScheduler(),
+            order_book=OrderBook(self.execution_handler, on_close=risk.release if risk is not None else None),
+            netter=SignalNetter(self._signal_quantity, lambda quantity: len(self.execution_handler.slices(quantity))),
+            dispatcher=EventDispatcher(instrument=timing, tracer=self.tracer),
+            risk=risk,
+        )
+        if risk is not None:
+            state.order_book.on_replace = lambda order: self._recheck_risk(risk, order, state.latest_market)
+        if self.strategy_context is not None:
+            self.strategy_context.scheduler = state.scheduler
+            self.strategy_context.order_book = state.order_book
+        self._register_handlers(state)
 
-        while len(queue):
-            qitem = queue.get()
-            if qitem is None:
-                continue
-            if isinstance(qitem, MarketEvent):
-                portfolio.mark_price(qitem.symbol, qitem.price)
-                latest_market[qitem.symbol] = qitem
-                for signal in self.strategy.on_market_data(qitem):
-                    order = self._signal_to_order(signal)
-                    queue.put(order)
-            elif isinstance(qitem, OrderEvent):
-                market_snapshot = latest_market.get(qitem.symbol)
-                if market_snapshot is None:
-                    continue
-                fill_list = self.execution_handler.execute(qitem, market_snapshot)
-                for fill in fill_list:
-                    portfolio.apply_fill(fill)
-                    fills.append(fill)
+        # Orders become eligible `order_latency` seconds after the event that produced
+        # them and fill against the latest bar at that time.
+        scheduler = state.scheduler
+        scheduler.extend(plan.events)
+        loop_started = perf_counter_ns()
+        if timing:
+            events = self._run_timed_loop(state, sample_every)
+        else:
+            dispatch = state.dispatcher.dispatch
+            while len(scheduler):
+                event = scheduler.get()
+                if event is not None:
+                    dispatch(event)
+        loop_ns = perf_counter_ns() - loop_started
 
+        if self.strategy_context is not None:
+            self.strategy_context.scheduler = None
+            self.strategy_context.order_book = None
+        if len(state.order_book):
+            self.logger.debug("segment %s ended with %d open orders", plan.segment_id, len(state.order_book))
+        if state.netter.stats.orders_avoided:
+            self.logger.debug("segment %s netting: %s", plan.segment_id, state.netter.stats.as_dict())
         snapshot = portfolio.snapshot()
-        duration_ms = (time.time() - start) * 1000.0
+        duration_ms = (perf_counter_ns() - start) / 1e6
         return EngineSegmentResult(
             segment_id=plan.segment_id,
-            fills=fills,
+            fills=state.fills,
             portfolio_snapshot=snapshot,
             parameters=plan.parameters,
             duration_ms=duration_ms,
+            netting=state.netter.stats.as_dict() if self.settings.net_signals else None,
+            risk=state.risk.stats.as_dict() if state.risk is not None else None,
+            handler_stats=state.dispatcher.stats() if self.settings.instrument_handlers else None,
+            stage_timings=self._segment_timings(state, events, loop_ns, sample_every) if timing else None,
         )
 
-    def _signal_to_order(self, signal: SignalEvent) -> OrderEvent:
-        direction_str = "BUY" if signal.direction.upper() == "LONG" else "SELL"
-        direction = cast(Literal["BUY", "SELL"], direction_str)
-        quantity = max(1, int(abs(signal.strength) * 100))
+    def _run_timed_loop(self, state: _SegmentState, sample_every: int) -> int:
+        """
+        The segment loop, timing the first event and every `sample_every`-th one after it.
+
+        Sampling the first event means even a segment shorter than
+        `sample_every` reports every stage it touched. Returns the event count.
+        """
+        scheduler = state.scheduler
+        dispatch = state.dispatcher.dispatch
+        sample = state.dispatcher.dispatch_timed
+        countdown = 1
+        while len(scheduler):
+            event = scheduler.get()
+            if event is None:
+                continue
+            countdown -= 1
+            if countdown:
+                dispatch(event)
+            else:
+                countdown = sample_every
+                sample(event)
+        sampled = state.dispatcher.sampled
+        return (sampled - 1) * sample_every + (sample_every - countdown) + 1 if sampled else 0
+
+    @staticmethod
+    def _segment_timings(state: _SegmentState, events: int, loop_ns: int, sample_every: int) -> Dict[str, Any]:
+        """Scale sampled handler time up to the whole segment and charge the remainder to scheduling."""
+        sampled = state.dispatcher.sampled
+        scale = events / sampled if sampled else 0.0
+        stages = dict.fromkeys(_STAGES, 0.0)
+        for stage, total_ns in state.dispatcher.stage_ns().items():
+            stages[stage] = stages.get(stage, 0.0) + total_ns * scale / 1e9
+        loop_seconds = loop_ns / 1e9
+        # Queue pops and dispatch itself are not inside any handler.
+        stages["scheduling"] += max(0.0, loop_seconds - sum(stages.values()))
+        return {
+            "events": events,
+            "market_events": len(state.plan.events),
+            "fills": len(state.fills),
+            "loop_seconds": loop_seconds,
+            "events_per_second": events / loop_seconds if loop_seconds else 0.0,
+            "sample_every": sample_every,
+            "stages": stages,
+        }
+
+    @staticmethod
+    def _run_timings(segments: List[EngineSegmentResult], io_ns: int) -> Optional[Dict[str, Any]]:
+        timed = [segment.stage_timings for segment in segments if segment.stage_timings is not None]
+        if not timed:
+            return None
+        stages = dict.fromkeys(_STAGES, 0.0)
+        for timings in timed:
+            for stage, seconds in timings["stages"].items():
+                stages[stage] = stages.get(stage, 0.0) + seconds
+        stages["io"] = io_ns / 1e9
+        events = sum(timings["events"] for timings in timed)
+        loop_seconds = sum(timings["loop_seconds"] for timings in timed)
+        return {
+            "events": events,
+            "loop_seconds": loop_seconds,
+            "events_per_second": events / loop_seconds if loop_seconds else 0.0,
+            "stages": stages,
+        }
+
+    def _register_handlers(self, state: _SegmentState) -> None:
+        register = state.dispatcher.register
+        register(EventType.MARKET, partial(self._mark_to_market, state), "portfolio.mark")
+        if state.risk is not None:
+            register(EventType.MARKET, partial(self._mark_risk, state.risk), "risk.mark")
+            register(EventType.FILL, partial(self._book_risk_fill, state.risk), "risk.fill")
+        register(EventType.MARKET, partial(self._match_resting, state), "execution.match")
+        register(EventType.MARKET, partial(self._run_strategy, state), "strategy.market")
+        register(EventType.MARKET, partial(self._flush_signals, state), "scheduling.route")
+        if callable(getattr(self.strategy, "on_timer", None)):
+            register(EventType.TIMER, partial(self._run_timer, state), "strategy.timer")
+            register(EventType.TIMER, partial(self._flush_signals, state), "scheduling.route")
+        register(EventType.ORDER, partial(self._submit_order, state), "execution.order")
+        register(EventType.FILL, partial(self._book_fill, state), "portfolio.fill")
+        for event_type, handler, name in self._extra_handlers:
+            register(event_type, handler, name)
+
+    # --- event handlers (pre-bound to a segment's state) ----------------------
+    def _mark_to_market(self, state: _SegmentState, event: MarketEvent) -> None:
+        state.portfolio.mark_price(event.symbol, event.price)
+        state.latest_market[event.symbol] = event
+
+    @staticmethod
+    def _mark_risk(risk: RiskEngine, event: MarketEvent) -> None:
+        risk.on_market(event.symbol, event.price)
+
+    @staticmethod
+    def _book_risk_fill(risk: RiskEngine, fill: FillEvent) -> None:
+        signed = fill.quantity if fill.direction == "BUY" else -fill.quantity
+        risk.on_fill(fill.symbol, signed, fill.fill_price, fill.order_id)
+
+    def _match_resting(self, state: _SegmentState, event: MarketEvent) -> None:
+        for fill in state.order_book.on_market(event):
+            state.dispatcher.dispatch(fill)
+
+    def _run_strategy(self, state: _SegmentState, event: MarketEvent) -> None:
+        state.pending.extend(self.strategy.on_market_data(event))
+
+    def _run_timer(self, state: _SegmentState, event: TimerEvent) -> None:
+        state.pending.extend(self.strategy.on_timer(event) or ())  # type: ignore[attr-defined]
+
+    def _submit_order(self, state: _SegmentState, order: OrderEvent) -> None:
+        market_snapshot = state.latest_market.get(order.symbol)
+        if market_snapshot is None and order.order_type == "MARKET":
+            if state.risk is not None:
+                state.risk.release(order.order_id)
+            return
+        # Limit and stop orders rest in the book until a later bar crosses them.
+        for fill in state.order_book.submit(order, market_snapshot):
+            state.dispatcher.dispatch(fill)
+        if state.risk is not None and order.order_id not in state.order_book:
+            state.risk.release(order.order_id)  # whatever did not fill will not fill later
+
+    def _book_fill(self, state: _SegmentState, fill: FillEvent) -> None:
+        state.portfolio.apply_fill(fill)
+        state.fills.append(fill)
+
+    def _flush_signals(self, state: _SegmentState, event: Optional[Event] = None) -> None:
+        # Signals from every bar and timer at this timestamp are netted together.
+        if state.pending and not self._more_signals_due(state.scheduler):
+            self._route_signals(
+                state.pending, state.netter, state.scheduler, state.latest_market, state.portfolio, state.risk
+            )
+            state.pending.clear()
+
+    def _more_signals_due(self, scheduler: EventScheduler) -> bool:
+        """True while the next event is another bar or timer at the current timestamp."""
+        upcoming = scheduler.peek()
+        return (
+            self.settings.net_signals
+            and upcoming is not None
+            and scheduler.peek_time() == scheduler.now
+            and upcoming.event_type in (EventType.MARKET, EventType.TIMER)
+        )
+
+    def _route_signals(
+        self,
+        signals: List[SignalEvent],
+        netter: SignalNetter,
+        scheduler: EventScheduler,
+        latest_market: Dict[str, MarketEvent],
+        portfolio: PortfolioState,
+        risk: Optional[RiskEngine] = None,
+    ) -> None:
+        routed: List[OrderEvent] = []
+        weights = {signal.symbol: signal.target_weight for signal in signals if signal.target_weight is not None}
+        if weights:
+            # Target-weight signals are sized together by the rebalancer; the last weight per symbol wins.
+            signals = [signal for signal in signals if signal.target_weight is None]
+            prices = {symbol: market.price for symbol, market in latest_market.items()}
+            plan = self.settings.rebalancer.plan(weights, prices, portfolio)
+            batch = plan.orders(scheduler.now, lambda: f"ord-{next(self._order_counter)}")
+            if risk is not None:
+                rows = np.flatnonzero(plan.delta)
+                order_ids = [order.order_id for order in batch]
+                approved = risk.check_batch(plan.symbols[rows].tolist(), plan.delta[rows], plan.prices[rows], order_ids)
+                plan.delta[rows] = approved
+                plan.target = plan.current + plan.delta
+                batch = [
+                    dataclasses.replace(order, quantity=abs(quantity))
+                    for order, quantity in zip(batch, approved.tolist())
+                    if quantity
+                ]
+            routed.extend(batch)
+            self.logger.debug("rebalance at %s: %s", scheduler.now, plan.summary())
+        if self.settings.net_signals:
+            orders = [self._signal_to_order(signal, delta) for signal, delta in netter.net(signals)]
+        else:
+            orders = [self._signal_to_order(signal) for signal in signals]
+        routed.extend(orders if risk is None else self._check_risk(risk, orders, latest_market))
+        for order in routed:
+            scheduler.schedule_after(order, self.settings.order_latency)
+
+    @staticmethod
+    def _check_risk(
+        risk: RiskEngine, orders: List[OrderEvent], latest_market: Dict[str, MarketEvent]
+    ) -> List[OrderEvent]:
+        """Pass each order through the risk engine, dropping rejected ones and resizing clipped ones."""
+        checked: List[OrderEvent] = []
+        for order in orders:
+            signed = order.quantity if order.direction == "BUY" else -order.quantity
+            market = latest_market.get(order.symbol)
+            approved = risk.check(order.symbol, signed, market.price if market is not None else None, order.order_id)
+            if approved == signed:
+                checked.append(order)
+            elif approved:
+                checked.append(dataclasses.replace(order, quantity=abs(approved)))
+        return checked
+
+    @classmethod
+    def _recheck_risk(
+        cls, risk: RiskEngine, order: OrderEvent, latest_market: Dict[str, MarketEvent]
+    ) -> Optional[OrderEvent]:
+        """An amended order gives up its old reservation and is checked again at its new size."""
+        risk.release(order.order_id)
+        checked = cls._check_risk(risk, [order], latest_market)
+        return checked[0] if checked else None
+
+    @staticmethod
+    def _signal_quantity(signal: SignalEvent) -> int:
+        return max(1, int(abs(signal.strength) * 100))
+
+    def _signal_to_order(self, signal: SignalEvent, signed_quantity: Optional[int] = None) -> OrderEvent:
+        """Size a signal as an order; `signed_quantity` overrides both size and side (netted signals)."""
+        if signed_quantity is None:
+            direction_str = "BUY" if signal.direction.upper() == "LONG" else "SELL"
+            quantity = self._signal_quantity(signal)
+        else:
+            direction_str = "BUY" if signed_quantity > 0 else "SELL"
+            quantity = abs(signed_quantity)
+        direction = cast(_OrderSide, direction_str)
         order_id = f"ord-{next(self._order_counter)}"
         return OrderEvent(
             order_id=order_id,
             symbol=signal.symbol,
             quantity=quantity,
             direction=direction,
-            order_type="MARKET",
+            order_type=signal.order_type,
+            limit_price=signal.limit_price,
             signal_id=signal.signal_id,
             timestamp=signal.timestamp,
+            stop_price=signal.stop_price,
+            time_in_force=signal.time_in_force,
         )
 
     def _write_metadata(
@@ -169,11 +469,13 @@ class BacktestRunner:
         segments: List[EngineSegmentResult],
         status: str,
         error: Optional[str] = None,
+        timings: Optional[Dict[str, Any]] = None,
     ) -> None:
-        payload = {
+        payload: Dict[str, Any] = {
             "run_id": self.settings.run_id,
             "mode": self.settings.mode.value,
             "status": status,
+            "data_snapshot": self.settings.data_snapshot,
             "segments": [
                 {
                     "segment_id": segment.segment_id,
@@ -181,11 +483,16 @@ class BacktestRunner:
                     "duration_ms": segment.duration_ms,
                     "parameters": segment.parameters,
                     "portfolio": segment.portfolio_snapshot,
+                    "netting": segment.netting,
+                    "risk": segment.risk,
+                    "timings": segment.stage_timings,
                 }
                 for segment in segments
             ],
             "timestamp": time.time(),
         }
+        if timings is not None:
+            payload["timings"] = timings
         if error:
             payload["error"] = error
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 from ..core.events import FillEvent, MarketEvent
 
@@ -28,6 +28,10 @@ class EngineSegmentResult:
     portfolio_snapshot: Dict[str, float]
     parameters: Optional[Dict[str, float]] = None
     duration_ms: float = 0.0
+    netting: Optional[Dict[str, int]] = None
+    risk: Optional[Dict[str, Any]] = None
+    handler_stats: Optional[Dict[str, Dict[str, float]]] = None
+    stage_timings: Optional[Dict[str, Any]] = None
 
     @property
     def fill_count(self) -> int:
@@ -41,6 +45,7 @@ class EngineResult:
     segments: List[EngineSegmentResult]
     metadata_path: str
     status: str = "completed"
+    timings: Optional[Dict[str, Any]] = None
 
     @property
     def fills(self) -> List[FillEvent]:
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+from ..core.events import SignalEvent
+
+
+@dataclass(slots=True)
+class NettingStats:
+    signals: int = 0
+    orders: int = 0
+    fills_avoided: int = 0
+    shares_avoided: int = 0
+
+    @property
+    def orders_avoided(self) -> int:
+        return self.signals - self.orders
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "signals": self.signals,
+            "orders": self.orders,
+            "orders_avoided": self.orders_avoided,
+            "fills_avoided": self.fills_avoided,
+            "shares_avoided": self.shares_avoided,
+        }
+
+
+class SignalNetter:
+    """
+    Nets the signals of one decision point into one target delta per symbol.
+
+    Market signals for the same symbol are summed as signed quantities
+    (`size(signal)` shares, positive for LONG) and become a single order for
+    the net delta, or none when they cancel out. Limit and stop signals carry
+    their own prices and pass through unchanged. `fills(quantity)` estimates
+    how many fills an order of that size produces, which lets `stats` report
+    the fills avoided as well as the orders and shares.
+    """
+
+    def __init__(self, size: Callable[[SignalEvent], int], fills: Callable[[int], int] = lambda quantity: 1) -> None:
+        self.size = size
+        self.fills = fills
+        self.stats = NettingStats()
+
+    def net(self, signals: Sequence[SignalEvent]) -> List[Tuple[SignalEvent, int]]:
+        """Return `(template signal, signed quantity)` pairs in order of first appearance."""
+        netted: Dict[str, Tuple[SignalEvent, int]] = {}
+        sequence: List[Union[Tuple[SignalEvent, int], str]] = []
+        contributions: Dict[str, List[int]] = {}
+        for signal in signals:
+            quantity = self.size(signal)
+            signed = quantity if signal.direction.upper() == "LONG" else -quantity
+            if signal.order_type != "MARKET":
+                sequence.append((signal, signed))
+                continue
+            if signal.symbol in netted:
+                template, total = netted[signal.symbol]
+                netted[signal.symbol] = (template, total + signed)
+                contributions[signal.symbol].append(quantity)
+            else:
+                sequence.append(signal.symbol)
+                netted[signal.symbol] = (signal, signed)
+                contributions[signal.symbol] = [quantity]
+
+        orders: List[Tuple[SignalEvent, int]] = []
+        for item in sequence:
+            if not isinstance(item, str):
+                orders.append(item)
+                continue
+            template, delta = netted[item]
+            gross = contributions[item]
+            if len(gross) > 1:  # a lone signal nets to itself and saves nothing
+                self.stats.fills_avoided += sum(map(self.fills, gross)) - (self.fills(abs(delta)) if delta else 0)
+                self.stats.shares_avoided += sum(gross) - abs(delta)
+            if delta:
+                orders.append((template, delta))
+        self.stats.signals += len(signals)
+        self.stats.orders += len(orders)
+        return orders
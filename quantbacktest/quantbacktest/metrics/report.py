@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from ..engine.modes import EngineResult
 from .analyzer import analyze_engine_result
@@ -13,6 +13,7 @@ from .analyzer import analyze_engine_result
 class MetricsReport:
     summary: Dict[str, float]
     segment_metrics: List[Dict[str, Any]]
+    timings: Optional[Dict[str, Any]] = None
 
     def to_markdown(self) -> str:
         header = "| Metric | Value |\n|---|---|\n"
@@ -31,16 +32,20 @@ def build_metrics_report(engine_result: EngineResult, output_dir: Path) -> Metri
                 "fill_count": segment.fill_count,
                 "duration_ms": segment.duration_ms,
                 "parameters": json.dumps(segment.parameters or {}),
+                "events_per_second": (segment.stage_timings or {}).get("events_per_second"),
             }
         )
-    metrics_json = {"summary": summary, "segments": segment_metrics}
+    timings = engine_result.timings
+    metrics_json = {"summary": summary, "segments": segment_metrics, "timings": timings}
     (output_dir / "metrics.json").write_text(json.dumps(metrics_json, indent=2), encoding="utf-8")
     md_path = output_dir / "metrics.md"
-    md_path.write_text(build_markdown(summary, segment_metrics), encoding="utf-8")
-    return MetricsReport(summary=summary, segment_metrics=segment_metrics)
+    md_path.write_text(build_markdown(summary, segment_metrics, timings), encoding="utf-8")
+    return MetricsReport(summary=summary, segment_metrics=segment_metrics, timings=timings)
 
 
-def build_markdown(summary: Dict[str, float], segments: List[Dict[str, Any]]) -> str:
+def build_markdown(
+    summary: Dict[str, float], segments: List[Dict[str, Any]], timings: Optional[Dict[str, Any]] = None
+) -> str:
     md = ["# Metrics Summary", MetricsReport(summary, segments).to_markdown(), "\n## Segments"]
     for segment in segments:
         duration = float(segment.get("duration_ms", 0.0))
@@ -48,4 +53,18 @@ def build_markdown(summary: Dict[str, float], segments: List[Dict[str, Any]]) ->
             f"- `{segment['segment_id']}`: fills={segment['fill_count']} "
             f"duration={duration:.2f} ms params={segment['parameters']}"
         )
+    if timings:
+        md.extend(_timings_markdown(timings))
     return "\n".join(md)
+
+
+def _timings_markdown(timings: Dict[str, Any]) -> List[str]:
+    stages: Dict[str, float] = timings["stages"]
+    total = sum(stages.values()) or 1.0
+    md = [
+        "\n## Stage Timings",
+        f"{timings['events']} events at {timings['events_per_second']:,.0f} events/s\n",
+        "| Stage | Seconds | Share |\n|---|---|---|",
+    ]
+    md.extend(f"| {stage} | {seconds:.4f} | {seconds / total:.1%} |" for stage, seconds in stages.items())
+    return md
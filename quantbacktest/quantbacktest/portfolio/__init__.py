@@ -1,5 +1,7 @@
 """Portfolio accounting scaffolding."""
 
+from .rebalance import RebalancePlan, Rebalancer
+from .risk import RiskEngine, RiskLimits, RiskStats
 from .state import PortfolioState, Position, TradeRecord
 
-__all__ = ["PortfolioState", "Position", "TradeRecord"]
+__all__ = ["PortfolioState", "Position", "TradeRecord", "RebalancePlan", "Rebalancer", "RiskEngine", "RiskLimits", "RiskStats"]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from ..core.events import OrderEvent
+from .state import PortfolioState
+
+
+@dataclass(slots=True)
+class RebalancePlan:
+    """Share deltas for one rebalance, aligned with `symbols`."""
+
+    symbols: np.ndarray
+    prices: np.ndarray
+    current: np.ndarray
+    target: np.ndarray
+    delta: np.ndarray
+    equity: float
+    turnover: float
+    skipped: int = 0
+    scaled: bool = False
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.delta))
+
+    def orders(
+        self,
+        timestamp: Optional[float] = None,
+        next_id: Optional[Callable[[], str]] = None,
+    ) -> List[OrderEvent]:
+        """One market order per non-zero delta, in `symbols` order."""
+        rows = np.flatnonzero(self.delta)
+        make_id = next_id or iter(f"rebal-{index}" for index in range(1, len(rows) + 1)).__next__
+        return [
+            OrderEvent(
+                order_id=make_id(),
+                symbol=symbol,
+                quantity=abs(delta),
+                direction="BUY" if delta > 0 else "SELL",
+                timestamp=timestamp,
+            )
+            for symbol, delta in zip(self.symbols[rows].tolist(), self.delta[rows].tolist())
+        ]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "symbols": len(self.symbols),
+            "orders": len(self),
+            "turnover": self.turnover,
+            "skipped": self.skipped,
+            "scaled": self.scaled,
+        }
+
+
+@dataclass(slots=True)
+class Rebalancer:
+    """
+    Turns target weights into share deltas against a `PortfolioState`.
+
+    Targets are `weight * equity / price` shares. Each delta is rounded toward
+    zero to whole `lot_size` lots, so a rebalance never overshoots its
+    target. A target weight of zero always closes the whole position, odd
+    lots included. Trades below `min_trade_value` notional are dropped.
+    When gross traded notional exceeds `max_turnover` times equity, every
+    delta except the exits is scaled down by the same factor. All of this is
+    numpy over the universe, so thousands of names take milliseconds.
+    Symbols that are held but absent from the targets (including names in
+    `symbols` missing from a weights mapping) are left alone; pass a weight
+    of 0 to exit.
+    """
+
+    lot_size: int = 1
+    min_trade_value: float = 0.0
+    max_turnover: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.lot_size <= 0:
+            raise ValueError("lot_size must be positive")
+        if self.max_turnover is not None and self.max_turnover < 0:
+            raise ValueError("max_turnover cannot be negative")
+
+    def plan(
+        self,
+        weights: Union[Mapping[str, float], Sequence[float], np.ndarray],
+        prices: Union[Mapping[str, float], Sequence[float], np.ndarray],
+        portfolio: PortfolioState,
+        symbols: Optional[Sequence[str]] = None,
+    ) -> RebalancePlan:
+        """
+        Plan a rebalance to `weights`.
+
+        Pass `weights` and `prices` as mappings keyed by symbol, or as arrays
+        aligned with `symbols`. Symbols without a finite positive price are
+        not traded.
+        """
+        if isinstance(weights, Mapping):
+            names = list(weights) if symbols is None else list(symbols)
+            # Names in `symbols` without a weight are held as they are (NaN weights are not traded).
+            target_weights = np.array([weights.get(name, np.nan) for name in names], dtype=float)
+        else:
+            if symbols is None:
+                raise ValueError("symbols are required when weights are given as an array")
+            names = list(symbols)
+            target_weights = np.asarray(weights, dtype=float)
+        if isinstance(prices, Mapping):
+            price = np.array([prices.get(name, np.nan) for name in names], dtype=float)
+        else:
+            price = np.asarray(prices, dtype=float)
+        if not len(target_weights) == len(price) == len(names):
+            raise ValueError("weights, prices and symbols must have the same length")
+
+        positions = portfolio.positions
+        current = np.array(
+            [position.quantity if (position := positions.get(name)) else 0 for name in names], dtype=np.int64
+        )
+        equity = float(portfolio.equity)
+        tradable = np.isfinite(price) & (price > 0) & np.isfinite(target_weights)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw_target = np.where(tradable, target_weights * equity / price, current)
+        exits = tradable & (target_weights == 0)
+        delta = self._round(raw_target - current, exits, current)
+
+        skipped = 0
+        if self.min_trade_value > 0:
+            small = (delta != 0) & ~exits & (np.abs(delta) * np.where(tradable, price, 0.0) < self.min_trade_value)
+            skipped = int(np.count_nonzero(small))
+            delta[small] = 0
+
+        notional = np.abs(delta) * np.where(tradable, price, 0.0)
+        turnover = float(notional.sum() / equity) if equity > 0 else 0.0
+        scaled = False
+        if self.max_turnover is not None and turnover > self.max_turnover:
+            # Exits always close in full, so only the other trades share what is left of the budget.
+            exit_notional = float(notional[exits].sum())
+            other_notional = float(notional[~exits].sum())
+            budget = self.max_turnover * equity - exit_notional
+            factor = min(1.0, max(0.0, budget / other_notional)) if other_notional > 0 else 0.0
+            delta = self._round(delta * factor, exits, current)
+            turnover = float((np.abs(delta) * np.where(tradable, price, 0.0)).sum() / equity)
+            scaled = True
+
+        return RebalancePlan(
+            symbols=np.asarray(names, dtype=object),
+            prices=price,
+            current=current,
+            target=current + delta,
+            delta=delta,
+            equity=equity,
+            turnover=turnover,
+            skipped=skipped,
+            scaled=scaled,
+        )
+
+    def _round(self, delta: np.ndarray, exits: np.ndarray, current: np.ndarray) -> np.ndarray:
+        # Round first so 199.99999999 shares (float noise) still counts as 200.
+        lots = np.trunc(np.round(np.asarray(delta, dtype=float) / self.lot_size, 6)).astype(np.int64) * self.lot_size
+        return np.where(exits, -current, lots)
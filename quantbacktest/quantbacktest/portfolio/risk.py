@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Dict, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .state import PortfolioState
+
+RiskAction = Literal["reject", "clip", "scale"]
+
+
+@dataclass(slots=True)
+class RiskLimits:
+    """
+    Pre-trade limits, each optional.
+
+    `max_leverage` caps gross exposure over equity, `max_gross_exposure`
+    caps it in currency, and `max_position_weight` caps any one name's
+    absolute exposure over equity. `action` decides what happens to an
+    order that would breach a limit: drop it, clip it to the largest size
+    that fits, or (for batches) shrink every risk-increasing order by one
+    common factor so the batch keeps its shape.
+    """
+
+    max_leverage: Optional[float] = None
+    max_gross_exposure: Optional[float] = None
+    max_position_weight: Optional[float] = None
+    action: RiskAction = "clip"
+
+    def __post_init__(self) -> None:
+        for name in ("max_leverage", "max_gross_exposure", "max_position_weight"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} cannot be negative")
+        if self.action not in ("reject", "clip", "scale"):
+            raise ValueError(f"unknown risk action {self.action!r}")
+
+
+@dataclass(slots=True)
+class RiskStats:
+    orders: int = 0
+    approved: int = 0
+    clipped: int = 0
+    rejected: int = 0
+    shares_cut: int = 0
+    breaches: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "orders": self.orders,
+            "approved": self.approved,
+            "clipped": self.clipped,
+            "rejected": self.rejected,
+            "shares_cut": self.shares_cut,
+            "breaches": dict(self.breaches),
+        }
+
+    def _record(self, requested: int, approved: int, limit: Optional[str]) -> None:
+        self.orders += 1
+        if approved == requested:
+            self.approved += 1
+            return
+        if approved == 0:
+            self.rejected += 1
+        else:
+            self.clipped += 1
+        self.shares_cut += abs(requested - approved)
+        if limit is not None:
+            self.breaches[limit] = self.breaches.get(limit, 0) + 1
+
+
+class RiskEngine:
+    """
+    Checks orders against `RiskLimits` using exposures it keeps up to date.
+
+    The engine mirrors each symbol's filled quantity and last price, plus
+    the quantity of orders it approved that have not filled yet. Gross
+    exposure is adjusted on every mark, fill and approval rather than summed
+    over the book, so `check` is O(1) per order. An approved order stays
+    reserved under its `order_id` until fills use it up or `release` is
+    called (the runner releases orders that are cancelled, expire, or end
+    without resting), so orders in flight or resting in the book keep
+    counting against the limits. Orders that shrink a position always pass.
+    `check_batch` applies the same limits to a whole rebalance with numpy.
+    """
+
+    def __init__(self, limits: RiskLimits, portfolio: PortfolioState) -> None:
+        self.limits = limits
+        self.portfolio = portfolio
+        self.stats = RiskStats()
+        self.gross = 0.0
+        self._filled: Dict[str, int] = {}
+        self._reserved: Dict[str, int] = {}
+        self._orders: Dict[str, Tuple[str, int]] = {}
+        self._price: Dict[str, float] = {}
+        self._anonymous = count(1)
+        self.sync()
+
+    def sync(self) -> None:
+        """Rebuild exposures from the portfolio (O(positions)); reservations are dropped."""
+        self._filled = {symbol: position.quantity for symbol, position in self.portfolio.positions.items()}
+        self._price = {symbol: position.last_price for symbol, position in self.portfolio.positions.items()}
+        self._reserved = {}
+        self._orders = {}
+        self.gross = sum(abs(quantity) * self._price[symbol] for symbol, quantity in self._filled.items())
+
+    def exposure(self, symbol: str) -> int:
+        """Filled plus reserved quantity for `symbol`."""
+        return self._filled.get(symbol, 0) + self._reserved.get(symbol, 0)
+
+    def on_market(self, symbol: str, price: float) -> None:
+        quantity = self.exposure(symbol)
+        self.gross += abs(quantity) * (price - self._price.get(symbol, price))
+        self._price[symbol] = price
+
+    def on_fill(self, symbol: str, signed_quantity: int, price: float, order_id: Optional[str] = None) -> None:
+        self._price.setdefault(symbol, price)
+        consumed = 0
+        if order_id is not None and order_id in self._orders:
+            # The fill uses up part of the reservation that was already counted.
+            remaining = self._orders[order_id][1]
+            if (remaining > 0) == (signed_quantity > 0):
+                consumed = min(remaining, signed_quantity) if remaining > 0 else max(remaining, signed_quantity)
+            if remaining == consumed:
+                del self._orders[order_id]
+            else:
+                self._orders[order_id] = (symbol, remaining - consumed)
+        self._adjust(symbol, signed_quantity, -consumed)
+
+    def release(self, order_id: str) -> None:
+        """Drop what is left of an order's reservation (it was cancelled, expired, or will not fill)."""
+        reservation = self._orders.pop(order_id, None)
+        if reservation is not None:
+            self._adjust(reservation[0], 0, -reservation[1])
+
+    def clear_reservations(self) -> None:
+        for order_id in list(self._orders):
+            self.release(order_id)
+
+    @property
+    def open_orders(self) -> int:
+        return len(self._orders)
+
+    def check(
+        self, symbol: str, signed_quantity: int, price: Optional[float] = None, order_id: Optional[str] = None
+    ) -> int:
+        """Return the signed quantity that may trade (0 to reject) and reserve it under `order_id`."""
+        price = self._price.get(symbol) if price is None else price
+        if not signed_quantity or price is None or not price > 0:
+            return signed_quantity  # nothing to size against until the symbol has a price
+        current = self.exposure(symbol)
+        cap, limit = self._share_cap(price, self.gross - abs(current) * price)
+        approved = signed_quantity
+        if abs(current + signed_quantity) > abs(current) and abs(current + signed_quantity) > cap:
+            if self.limits.action == "reject":
+                approved = 0
+            elif signed_quantity > 0:
+                approved = max(0, min(signed_quantity, (cap if current < 0 else max(cap, current)) - current))
+            else:
+                approved = min(0, max(signed_quantity, (-cap if current > 0 else min(-cap, current)) - current))
+        self.stats._record(signed_quantity, approved, limit if approved != signed_quantity else None)
+        if approved:
+            self._reserve(order_id, symbol, approved, price)
+        return approved
+
+    def check_batch(
+        self,
+        symbols: Union[Sequence[str], np.ndarray],
+        deltas: np.ndarray,
+        prices: np.ndarray,
+        order_ids: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        Vectorized `check` for one rebalance: return approved deltas and reserve them under `order_ids`.
+
+        Per-name caps are applied first. If the batch would still breach the
+        gross limit, every risk-increasing delta is scaled by the same factor
+        (or dropped under "reject"). Under "scale" the per-name caps also
+        become one common factor, so the rebalance keeps its proportions.
+        """
+        names = symbols.tolist() if isinstance(symbols, np.ndarray) else list(symbols)
+        requested = np.asarray(deltas, dtype=np.int64)
+        price = np.asarray(prices, dtype=float)
+        current = np.array([self.exposure(name) for name in names], dtype=np.int64)
+        valid = np.isfinite(price) & (price > 0)
+        mark = np.where(valid, price, 0.0)
+        action = self.limits.action
+        increasing = valid & (np.abs(current + requested) > np.abs(current))
+
+        # Per-name caps; the gross cap is handled for the batch as a whole below.
+        name_cap = self._name_caps(mark)
+        upper = np.where(current < 0, name_cap, np.maximum(name_cap, current))
+        lower = np.where(current > 0, -name_cap, np.minimum(-name_cap, current))
+        capped = np.where(
+            requested > 0,
+            np.clip(upper - current, 0, None).clip(max=requested),
+            np.clip(lower - current, None, 0).clip(min=requested),
+        )
+        capped = np.where(increasing, capped, requested)
+        name_breach = capped != requested
+        approved = requested.copy()
+        if action == "reject":
+            approved[name_breach] = 0
+        elif action == "clip":
+            approved = capped
+        elif name_breach.any():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                factor = float(np.min(capped[name_breach] / requested[name_breach]))
+            approved = np.where(increasing, _scale(requested, factor), requested)
+
+        gross_breach = np.zeros(len(names), dtype=bool)
+        gross_cap, gross_limit = self._gross_cap()
+        if gross_cap is not None:
+            change = (np.abs(current + approved) - np.abs(current)) * mark
+            grows = increasing & (approved != 0)
+            added = float(change[grows].sum())
+            room = gross_cap - self.gross - float(change[~grows].sum())
+            if added > room:
+                gross_breach = grows
+                if action == "reject":
+                    approved = np.where(grows, 0, approved)
+                else:
+                    # |x| is convex, so scaling each delta by f adds at most f times its exposure.
+                    factor = max(0.0, room / added)
+                    approved = np.where(grows, _scale(approved, factor), approved)
+
+        ids = [None] * len(names) if order_ids is None else list(order_ids)
+        rows = zip(requested.tolist(), approved.tolist(), mark.tolist(), name_breach.tolist(), gross_breach.tolist())
+        for name, order_id, (want, got, price_now, by_name, by_gross) in zip(names, ids, rows):
+            if not want:
+                continue
+            limit = "position" if by_name else gross_limit if by_gross else None
+            self.stats._record(want, got, limit if got != want else None)
+            if got:
+                self._reserve(order_id, name, got, price_now or None)
+        return approved
+
+    # --- internal helpers -------------------------------------------------
+    def _reserve(self, order_id: Optional[str], symbol: str, signed_quantity: int, price: Optional[float]) -> None:
+        if price is not None:
+            self.on_market(symbol, price)
+        if order_id is None:
+            order_id = f"_anonymous-{next(self._anonymous)}"  # held until `clear_reservations()`
+        previous = self._orders.get(order_id, (symbol, 0))[1]
+        self._orders[order_id] = (symbol, previous + signed_quantity)
+        self._adjust(symbol, 0, signed_quantity)
+
+    def _adjust(self, symbol: str, filled: int, reserved: int) -> None:
+        before = self.exposure(symbol)
+        if filled:
+            self._filled[symbol] = self._filled.get(symbol, 0) + filled
+        if reserved:
+            self._reserved[symbol] = self._reserved.get(symbol, 0) + reserved
+        self.gross += (abs(self.exposure(symbol)) - abs(before)) * self._price.get(symbol, 0.0)
+
+    def _equity(self) -> float:
+        return max(0.0, self.portfolio.equity)
+
+    def _gross_cap(self) -> Tuple[Optional[float], str]:
+        caps = []
+        if self.limits.max_leverage is not None:
+            caps.append((self.limits.max_leverage * self._equity(), "leverage"))
+        if self.limits.max_gross_exposure is not None:
+            caps.append((self.limits.max_gross_exposure, "gross"))
+        if not caps:
+            return None, ""
+        return min(caps)
+
+    def _share_cap(self, price: float, other_gross: float) -> Tuple[int, str]:
+        """Largest absolute position in shares the limits allow, and the binding limit."""
+        cap, limit = math.inf, ""
+        if self.limits.max_position_weight is not None:
+            cap, limit = self.limits.max_position_weight * self._equity() / price, "position"
+        gross_cap, gross_limit = self._gross_cap()
+        if gross_cap is not None and (gross_cap - other_gross) / price < cap:
+            cap, limit = (gross_cap - other_gross) / price, gross_limit
+        return (math.floor(max(0.0, cap) + 1e-9) if math.isfinite(cap) else np.iinfo(np.int64).max), limit
+
+    def _name_caps(self, price: np.ndarray) -> np.ndarray:
+        if self.limits.max_position_weight is None:
+            return np.full(len(price), np.iinfo(np.int64).max // 4, dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cap = np.floor(self.limits.max_position_weight * self._equity() / price + 1e-9)
+        return np.where(price > 0, cap, 0).astype(np.int64)
+
+
+def _scale(deltas: np.ndarray, factor: float) -> np.ndarray:
+    """Scale deltas toward zero by `factor`, truncating to whole shares."""
+    return np.trunc(np.round(deltas * min(1.0, factor), 6)).astype(np.int64)
@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from ..core.events import FillEvent
+    from ..core.execution import FillBatch
 
 
 @dataclass(slots=True)
@@ -51,27 +52,37 @@ class PortfolioState:
         self._revalue()
 
     def apply_fill(self, fill: "FillEvent", currency: Optional[str] = None) -> None:
-        currency = currency or self.base_currency
-        signed_qty = fill.quantity if fill.direction.upper() == "BUY" else -fill.quantity
-        position = self.positions.setdefault(fill.symbol, Position(symbol=fill.symbol))
-        realized = position.update(signed_qty, fill.fill_price)
-        self.realized_pnl += realized
-        cash_change = -signed_qty * fill.fill_price - fill.commission
-        self.cash[currency] = self.cash.get(currency, 0.0) + cash_change
-        self.total_fees += fill.commission
-        self.trade_log.append(
-            TradeRecord(
-                symbol=fill.symbol,
-                quantity=fill.quantity,
-                direction=fill.direction,
-                price=fill.fill_price,
-                commission=fill.commission,
-                currency=currency,
-                timestamp=fill.timestamp,
-            )
+        self._book_fill(
+            fill.symbol,
+            fill.quantity,
+            fill.direction,
+            fill.fill_price,
+            fill.commission,
+            currency or self.base_currency,
+            fill.timestamp,
         )
         self._revalue()
 
+    def apply_fill_batch(self, batch: "FillBatch", currency: Optional[str] = None) -> None:
+        """
+        Apply a columnar `FillBatch` in row order and revalue once at the end.
+
+        Positions, cash and the trade log end up exactly as if each fill had
+        gone through `apply_fill`, without building `FillEvent`s or marking
+        the whole book after every fill.
+        """
+        currency = currency or self.base_currency
+        for symbol, quantity, buy, price, commission, timestamp in zip(
+            batch.symbol.tolist(),
+            batch.quantity.tolist(),
+            batch.buy.tolist(),
+            batch.fill_price.tolist(),
+            batch.commission.tolist(),
+            batch.timestamp.tolist(),
+        ):
+            self._book_fill(symbol, quantity, "BUY" if buy else "SELL", price, commission, currency, timestamp)
+        self._revalue()
+
     def reserve_margin(self, amount: float) -> None:
         self.margin_reserved += amount
         self.cash[self.base_currency] -= amount
@@ -98,6 +109,33 @@ class PortfolioState:
                     f"{trade.price},{trade.commission},{trade.currency}\n"
                 )
 
+    def _book_fill(
+        self,
+        symbol: str,
+        quantity: int,
+        direction: str,
+        price: float,
+        commission: float,
+        currency: str,
+        timestamp: Optional[float],
+    ) -> None:
+        signed_qty = quantity if direction.upper() == "BUY" else -quantity
+        position = self.positions.setdefault(symbol, Position(symbol=symbol))
+        self.realized_pnl += position.update(signed_qty, price)
+        self.cash[currency] = self.cash.get(currency, 0.0) + (-signed_qty * price - commission)
+        self.total_fees += commission
+        self.trade_log.append(
+            TradeRecord(
+                symbol=symbol,
+                quantity=quantity,
+                direction=direction,
+                price=price,
+                commission=commission,
+                currency=currency,
+                timestamp=timestamp,
+            )
+        )
+
     def _revalue(self) -> None:
         mark_to_market = 0.0
         unrealized = 0.0
@@ -144,6 +144,11 @@ class BaseStrategy(Strategy):
             direction=cast(Literal["LONG", "SHORT"], direction_norm),
             signal_id=signal_id,
             timestamp=timestamp,
+            order_type=signal.order_type,
+            limit_price=signal.limit_price,
+            stop_price=signal.stop_price,
+            time_in_force=signal.time_in_force,
+            target_weight=signal.target_weight,
         )
 
     def _ensure_context(self) -> None:
@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+from ..core.events import TimerEvent
+from ..core.orderbook import OrderBook
+from ..core.queue import EventScheduler
 from ..portfolio import PortfolioState
 from .indicators import IndicatorCache
 
@@ -18,6 +21,15 @@ class StrategyContext:
     indicator_cache: IndicatorCache
     random_seed: int
     metadata: Optional[Dict[str, str]] = None
+    scheduler: Optional[EventScheduler] = None
+    order_book: Optional[OrderBook] = None
 
     def snapshot(self) -> Dict[str, float]:
         return self.portfolio.snapshot()
+
+    def schedule_timer(self, name: str, delay: float, payload: Optional[Dict[str, float]] = None) -> None:
+        """Deliver a `TimerEvent` to the strategy's `on_timer` hook `delay` seconds from now."""
+        if self.scheduler is None:
+            raise RuntimeError("timers are only available while the engine is running")
+        fire_at = self.scheduler.now + delay
+        self.scheduler.schedule_at(TimerEvent(name=name, timestamp=fire_at, payload=payload), fire_at)
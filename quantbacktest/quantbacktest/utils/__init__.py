@@ -4,6 +4,7 @@ from .config import ProjectPaths, Settings
 from .logging import configure_logging, get_logger
 from .profiling import profile_callable
 from .random import DeterministicRandom, set_global_seed
+from .tracing import Tracer, merge_traces
 
 __all__ = [
     "ProjectPaths",
@@ -13,4 +14,6 @@ __all__ = [
     "profile_callable",
     "DeterministicRandom",
     "set_global_seed",
+    "Tracer",
+    "merge_traces",
 ]
@@ -4,9 +4,15 @@ import argparse
 import cProfile
 import json
 import pstats
+import statistics
+import tempfile
+import time
 from pathlib import Path
+from typing import Any, Sequence
 
-from ..engine import run_placeholder_backtest
+from ..core.events import MarketEvent
+from ..engine import BacktestRunner, BacktestSettings, run_placeholder_backtest
+from ..strategy.base import StaticSignalStrategy
 
 
 def profile_placeholder_backtest(profile_file: Path) -> dict[str, int]:
@@ -26,6 +32,55 @@ def profile_placeholder_backtest(profile_file: Path) -> dict[str, int]:
     return {"signals": result.signals}
 
 
+def benchmark_stage_timers(
+    sizes: Sequence[int] = (1_000, 4_000, 10_000), symbols: int = 20, repeat: int = 41
+) -> dict[str, Any]:
+    """
+    Time the same synthetic run with stage timers off and on, for each run size in `sizes`.
+
+    Each repetition runs both settings back to back (alternating which goes
+    first) and keeps the ratio of their CPU times. `overhead_pct` comes from
+    the median ratio, which holds up far better on a noisy machine than
+    comparing separate best-of-N times. `max_overhead_pct` is the worst size.
+    """
+    names = [f"S{index:03d}" for index in range(symbols)]
+    weights = {name: 0.1 for name in names[::2]}
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for events in sizes:
+            stream = [
+                MarketEvent(names[index % symbols], 100.0 + (index % 11), float(index // symbols) * 60.0)
+                for index in range(events)
+            ]
+            seconds: dict[bool, list[float]] = {False: [], True: []}
+            ratios: list[float] = []
+            for index in range(repeat):
+                pair = {}
+                for timed in ((False, True) if index % 2 == 0 else (True, False)):
+                    settings = BacktestSettings(
+                        run_id=f"bench-{timed}",
+                        output_dir=Path(scratch),
+                        enable_progress=False,
+                        enable_checkpointing=False,
+                        stage_timers=timed,
+                    )
+                    runner = BacktestRunner(StaticSignalStrategy(weights=weights), settings=settings)
+                    started = time.process_time()
+                    runner.run(stream)
+                    pair[timed] = time.process_time() - started
+                    seconds[timed].append(pair[timed])
+                ratios.append(pair[True] / pair[False])
+            results.append(
+                {
+                    "events": events,
+                    "untimed_seconds": statistics.median(seconds[False]),
+                    "timed_seconds": statistics.median(seconds[True]),
+                    "overhead_pct": (statistics.median(ratios) - 1.0) * 100.0,
+                }
+            )
+    return {"sizes": results, "max_overhead_pct": max(result["overhead_pct"] for result in results)}
+
+
 def emit_hotspots(profile_file: Path, lines: int) -> str:
     payload = profile_file.read_text(encoding="utf-8").splitlines()
     preview = "\n".join(payload[:lines])
@@ -42,12 +97,21 @@ def build_parser() -> argparse.ArgumentParser:
     hotspot_parser = subparsers.add_parser("hotspots", help="Emit optimization hotspots")
     hotspot_parser.add_argument("--profile-file", required=True, help="Path to profile.txt")
     hotspot_parser.add_argument("--lines", type=int, default=20, help="Number of rows to print")
+
+    bench_parser = subparsers.add_parser("benchmark", help="Measure stage-timer overhead on a synthetic run")
+    bench_parser.add_argument(
+        "--events", type=int, nargs="+", default=[1_000, 4_000, 10_000], help="Market events per run, one or more sizes"
+    )
+    bench_parser.add_argument("--repeat", type=int, default=41, help="Paired runs (the median ratio is kept)")
     return parser
 
 
 def main(argv: list[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.command == "benchmark":
+        print(json.dumps(benchmark_stage_timers(sizes=args.events, repeat=args.repeat), indent=2))
+        return
     profile_path = Path(args.profile_file)
     if args.command == "profile":
         summary = profile_placeholder_backtest(profile_path)
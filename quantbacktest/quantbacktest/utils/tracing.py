@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class Tracer:
+    """
+    Records spans as Chrome Trace Event JSON (Perfetto, chrome://tracing).
+
+    Every span is a complete ("X") event stamped with the recording process
+    id and thread id, so runs that share a tracer from a thread pool get one
+    lane per worker thread, and traces written by worker processes keep
+    their own process lanes when combined with `merge_traces`. Timestamps
+    come from `perf_counter_ns`, a system-wide monotonic clock on Linux, so
+    spans from different processes line up on one timeline. Appends rely on
+    `list.append` being atomic, so recording takes no lock.
+    """
+
+    def __init__(self, process_name: Optional[str] = None) -> None:
+        self.process_name = process_name
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[tuple[int, int], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @contextmanager
+    def span(self, name: str, category: str = "engine", **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time the block as one span; the yielded dict can collect more args before the span closes."""
+        started = perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.complete(name, category, started, perf_counter_ns() - started, args)
+
+    def complete(
+        self, name: str, category: str, start_ns: int, duration_ns: int, args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Record a span measured elsewhere (`start_ns` from `perf_counter_ns`)."""
+        thread = threading.current_thread()
+        key = (os.getpid(), thread.ident or 0)
+        if key not in self._threads:
+            self._threads[key] = thread.name
+        event: Dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": duration_ns / 1000,
+            "pid": key[0],
+            "tid": key[1],
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded spans plus the metadata events that name their process and thread lanes."""
+        names: List[Dict[str, Any]] = []
+        for pid in sorted({pid for pid, _ in self._threads}):
+            label = self.process_name or f"pid {pid}"
+            names.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": label}})
+        for (pid, tid), thread_name in sorted(self._threads.items()):
+            names.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return names + list(self._events)
+
+    def write(self, path: Path) -> Path:
+        return _write_trace(path, self.events())
+
+
+def merge_traces(paths: Iterable[Path], output: Path) -> Path:
+    """Combine trace files (e.g. one per pool worker process) into a single timeline."""
+    events: List[Dict[str, Any]] = []
+    for path in paths:
+        events.extend(json.loads(Path(path).read_text(encoding="utf-8"))["traceEvents"])
+    return _write_trace(output, events)
+
+
+def _write_trace(path: Path, events: List[Dict[str, Any]]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    return path
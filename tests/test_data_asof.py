@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from quantbacktest.data import AsOfJoiner, LocalDataCache, MarketArrays, SideTable
+
+
+def _bars(symbol: str) -> pd.DataFrame:
+    stamps = pd.date_range("2020-01-01", periods=6, freq="D", tz="UTC")
+    return pd.DataFrame({"timestamp": stamps, "close": np.arange(6, dtype=float) + 100.0, "symbol": symbol})
+
+
+def _fundamentals() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2020-01-01", "2020-01-03", "2020-01-02", "2019-12-31"], utc=True),
+            "symbol": ["aaa", "AAA", "BBB", "AAA"],
+            "eps": [1.0, 2.0, 10.0, 0.5],
+        }
+    )
+
+
+def test_asof_join_respects_publication_lag_and_symbols() -> None:
+    bars = pd.concat([_bars("AAA"), _bars("BBB")], ignore_index=True)
+    joiner = AsOfJoiner([SideTable("fund", _fundamentals(), fields=("eps",), publication_lag="1D")])
+    joined = joiner.join_frame(bars)
+
+    aaa = joined.loc[joined["symbol"] == "AAA", "fund_eps"].tolist()
+    bbb = joined.loc[joined["symbol"] == "BBB", "fund_eps"].tolist()
+    # Visible one day after the reference date, never earlier.
+    assert aaa == [0.5, 1.0, 1.0, 2.0, 2.0, 2.0]
+    assert np.isnan(bbb[:2]).all() and bbb[2:] == [10.0] * 4
+
+    stale = AsOfJoiner([SideTable("fund", _fundamentals(), fields=("eps",), max_age="1D")]).join_frame(bars)
+    assert np.isnan(stale.loc[5, "fund_eps"]) and stale.loc[3, "fund_eps"] == 2.0
+
+
+def test_asof_join_feeds_event_metadata_and_caches(tmp_path: Path) -> None:
+    rates = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2020-01-01", "2020-01-04"], utc=True),
+            "published_at": pd.to_datetime(["2020-01-02 12:00", "2020-01-04 00:00"], utc=True),
+            "borrow": [0.01, 0.03],
+        }
+    )
+    table = SideTable("rates", rates, fields=("borrow",), symbol_column=None, available_column="published_at")
+    cache = LocalDataCache(root=tmp_path / "cache")
+    arrays = AsOfJoiner([table], cache=cache).join_arrays(MarketArrays.from_frame("AAA", _bars("AAA"), ("close",)))
+    events = arrays.to_events(metadata_fields=("rates_borrow",))
+    # Published at noon on Jan 2, so the Jan 2 bar (midnight) cannot see it yet.
+    assert [event.metadata for event in events] == [{}, {}] + [{"rates_borrow": 0.01}] + [{"rates_borrow": 0.03}] * 3
+    assert cache.index.stats()["arrays"]["entries"] == 1
+
+    again = AsOfJoiner([table], cache=cache).join_arrays(MarketArrays.from_frame("AAA", _bars("AAA"), ("close",)))
+    np.testing.assert_array_equal(again.fields["rates_borrow"], arrays.fields["rates_borrow"])
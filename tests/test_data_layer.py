@@ -1,20 +1,36 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import json
+import threading
+from concurrent.futures import ALL_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as futures_wait
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from quantbacktest.data import (
+    CacheManifest,
+    CircuitBreaker,
     DataManager,
     DataRequest,
     DataSettings,
     DataValidator,
+    DtypePolicy,
     LocalCSVProvider,
     LocalDataCache,
+    MarketArrays,
+    Prefetcher,
 )
-from quantbacktest.data.errors import DataFetchError, DataProviderError, DataValidationError
+from quantbacktest.data.errors import (
+    DataFetchError,
+    DataNotFoundError,
+    DataProviderError,
+    DataValidationError,
+)
+from quantbacktest.data.locks import FileLockTimeout
 from quantbacktest.data.settings import ProviderConfig
 
 
@@ -169,3 +185,566 @@ def test_data_settings_builder(tmp_path: Path) -> None:
         )
     )
     assert len(result) >= 3
+
+
+def test_cache_hit_with_matching_manifest_skips_validation(tmp_path: Path) -> None:
+    cache = LocalDataCache(root=tmp_path / "cache")
+    request = _request()
+    good_frame = pd.DataFrame(
+        {
+            "timestamp": [datetime(2020, 1, day, tzinfo=timezone.utc) for day in (1, 2, 3)],
+            "open": [100.0, 101.0, 102.0],
+            "high": [101.0, 102.0, 103.0],
+            "low": [99.0, 100.0, 101.0],
+            "close": [100.5, 101.5, 102.5],
+            "volume": [1_000_000, 1_200_000, 1_300_000],
+        }
+    )
+    manager = DataManager(cache=cache, providers=[StubProvider(good_frame)])
+    manager.fetch(request)
+    manifest = cache.load_manifest(request.cache_key())
+    assert manifest is not None
+    assert manifest.row_count == 3
+
+    class ExplodingValidator(DataValidator):
+        def validate(self, frame: pd.DataFrame, request: DataRequest) -> pd.DataFrame:
+            raise AssertionError("full validation should be skipped on a verified hit")
+
+    fast = DataManager(cache=cache, providers=[FailingProvider()], validator=ExplodingValidator())
+    assert len(fast.fetch(request)) == 3
+
+    hashed = DataManager(
+        cache=cache, providers=[FailingProvider()], validator=ExplodingValidator(), cache_verification="hash"
+    )
+    assert len(hashed.fetch(request)) == 3
+
+
+def test_csv_cache_hit_with_full_precision_floats_skips_validation(tmp_path: Path) -> None:
+    rng = np.random.default_rng(7)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, 5000))
+    open_ = close + rng.normal(0.0, 0.5, 5000)
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2020-01-01", periods=5000, freq="1min", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + rng.random(5000),
+            "low": np.minimum(open_, close) - rng.random(5000),
+            "close": close,
+            "volume": rng.integers(1, 1_000_000, 5000),
+        }
+    )
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    request = DataRequest(symbol="AAPL", start=start, end=start + timedelta(days=4))
+
+    class CountingValidator(DataValidator):
+        calls = 0
+
+        def validate(self, frame: pd.DataFrame, request: DataRequest) -> pd.DataFrame:
+            CountingValidator.calls += 1
+            return super().validate(frame, request)
+
+    cache = LocalDataCache(root=tmp_path / "cache")
+    DataManager(cache=cache, providers=[StubProvider(frame)]).fetch(request)
+    for mode in ("spot", "hash"):
+        validator = CountingValidator()
+        manager = DataManager(cache=cache, providers=[FailingProvider()], validator=validator, cache_verification=mode)
+        assert len(manager.fetch(request)) == 5000
+    assert CountingValidator.calls == 0
+
+
+def test_manifest_mismatch_triggers_revalidation(tmp_path: Path) -> None:
+    cache = LocalDataCache(root=tmp_path / "cache")
+    request = _request()
+    frame = pd.DataFrame(
+        {
+            "timestamp": [datetime(2020, 1, 1, tzinfo=timezone.utc), datetime(2020, 1, 2, tzinfo=timezone.utc)],
+            "open": [1.0, 1.5],
+            "high": [1.1, 1.6],
+            "low": [0.9, 1.4],
+            "close": [1.05, 1.55],
+            "volume": [1.0, 2.0],
+        }
+    )
+    stale = CacheManifest.from_frame(request.cache_key(), frame, validator_version="0")
+    cache.store_frame(request.cache_key(), frame, manifest=stale)
+    stale_manifest = cache.load_manifest(request.cache_key())
+    assert stale_manifest is not None
+    assert not stale_manifest.matches(cache.load_frame(request.cache_key()), DataValidator().version)
+
+    tampered = frame.copy()
+    tampered.loc[1, "close"] = 9.99
+    manifest = CacheManifest.from_frame(request.cache_key(), frame, DataValidator().version)
+    assert manifest.matches(frame, DataValidator().version, mode="hash")
+    assert not manifest.matches(tampered, DataValidator().version, mode="hash")
+
+
+def _canonical_frame(days: int = 3) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(
+                [datetime(2020, 1, day, tzinfo=timezone.utc) for day in range(1, days + 1)], utc=True
+            ),
+            "open": [100.0 + day for day in range(days)],
+            "high": [101.0 + day for day in range(days)],
+            "low": [99.0 + day for day in range(days)],
+            "close": [100.5 + day for day in range(days)],
+            "volume": [1_000_000 + day for day in range(days)],
+        }
+    )
+
+
+def test_validator_fast_path_returns_canonical_frame_without_copy() -> None:
+    frame = _canonical_frame()
+    validated = DataValidator().validate(frame, _request())
+    assert validated is frame
+
+    slow = DataValidator(fast_path=False).validate(frame, _request())
+    assert slow is not frame
+    pd.testing.assert_frame_equal(slow, validated)
+
+
+def test_validator_fast_path_enforces_nan_and_range_rules() -> None:
+    frame = _canonical_frame()
+    frame.loc[1, "close"] = float("nan")
+    with pytest.raises(DataValidationError, match="NaN"):
+        DataValidator().validate(frame, _request())
+
+    late = _canonical_frame(days=4)
+    with pytest.raises(DataValidationError, match="lookahead"):
+        DataValidator().validate(late, _request())
+
+    unsorted = _canonical_frame().iloc[[2, 0, 1]].reset_index(drop=True)
+    validated = DataValidator().validate(unsorted, _request())
+    assert validated["timestamp"].is_monotonic_increasing
+
+
+def test_local_csv_provider_streams_only_requested_range(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    rows = ["timestamp,open,high,low,close,volume"]
+    for day in range(1, 31):
+        rows.append(f"2020-01-{day:02d}T00:00:00+00:00,{day}.0,{day + 1}.0,{day - 1}.0,{day}.5,{day * 100}")
+    (data_dir / "synthetic_aapl.csv").write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    provider = LocalCSVProvider(data_dir=data_dir, chunksize=4)
+    request = DataRequest(
+        symbol="AAPL",
+        start=datetime(2020, 1, 6, tzinfo=timezone.utc),
+        end=datetime(2020, 1, 12, tzinfo=timezone.utc),
+    )
+    chunks = list(provider.stream(request, columns=["close"], validator=DataValidator(required_columns=("timestamp", "close"))))
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    assert all(list(chunk.columns) == ["timestamp", "close"] for chunk in chunks)
+    combined = pd.concat(chunks, ignore_index=True)
+    assert len(combined) == 7
+    assert combined["timestamp"].iloc[0] == pd.Timestamp("2020-01-06", tz="UTC")
+    assert combined["close"].dtype == "float64"
+
+    frame = provider.fetch(request)
+    assert len(frame) == 7
+    assert len(DataValidator().validate(frame, request)) == 7
+
+    # A chunk that is out of order on its own would make the range search silently wrong.
+    rows[6], rows[7] = rows[7], rows[6]
+    (data_dir / "synthetic_aapl.csv").write_text("\n".join(rows) + "\n", encoding="utf-8")
+    with pytest.raises(DataValidationError):
+        list(provider.stream(request))
+
+
+def test_local_csv_time_index_seeks_and_invalidates(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    csv_path = data_dir / "synthetic_aapl.csv"
+    rows = ["timestamp,open,high,low,close,volume"]
+    for day in range(1, 31):
+        rows.append(f"2020-01-{day:02d}T00:00:00+00:00,{day}.0,{day + 1}.0,{day - 1}.0,{day}.5,{day * 100}")
+    csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    provider = LocalCSVProvider(data_dir=data_dir, chunksize=3, index_stride=5)
+    request = DataRequest(
+        symbol="AAPL",
+        start=datetime(2020, 1, 23, tzinfo=timezone.utc),
+        end=datetime(2020, 1, 25, tzinfo=timezone.utc),
+    )
+    frame = provider.fetch(request)
+    assert list(frame["close"]) == [23.5, 24.5, 25.5]
+
+    index = provider.time_index(csv_path)
+    assert (data_dir / "synthetic_aapl.csv.tsidx.json").exists()
+    assert len(index.offsets) == 6
+    with csv_path.open("rb") as handle:
+        handle.seek(index.offset_for(pd.Timestamp("2020-01-23", tz="UTC").value))
+        assert handle.readline().startswith(b"2020-01-21")
+
+    rows.append("2020-01-31T00:00:00+00:00,31.0,32.0,30.0,31.5,3100")
+    csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    assert len(provider.time_index(csv_path).offsets) == 7
+
+
+class GatedProvider(StubProvider):
+    name = "gated"
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        super().__init__(frame)
+        self.gate = threading.Event()
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        assert self.gate.wait(timeout=30.0)
+        return super().fetch(request)
+
+
+class CountingCache(LocalDataCache):
+    """Counts frame lookups so a test can tell when every caller has missed."""
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.lookups = 0
+        self.looked_up = threading.Condition()
+
+    def load_frame(self, key: str) -> pd.DataFrame | None:
+        frame = super().load_frame(key)
+        with self.looked_up:
+            self.lookups += 1
+            self.looked_up.notify_all()
+        return frame
+
+
+def test_concurrent_misses_coalesce_into_one_provider_call(tmp_path: Path) -> None:
+    provider = GatedProvider(_canonical_frame())
+    cache = CountingCache(root=tmp_path / "cache")
+    manager = DataManager(cache=cache, providers=[provider])
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(manager.fetch, _request()) for _ in range(4)]
+        # Hold the leader in the provider until all four callers missed (plus the leader's re-check under the lock).
+        with cache.looked_up:
+            assert cache.looked_up.wait_for(lambda: cache.lookups >= 5, timeout=30.0)
+        provider.gate.set()
+        frames = [future.result() for future in futures]
+    assert provider.calls == 1
+    assert all(len(frame) == 3 for frame in frames)
+    assert not list((tmp_path / "cache" / "frames").glob(".*.tmp"))
+
+
+def test_cache_lock_excludes_other_holders(tmp_path: Path) -> None:
+    cache = LocalDataCache(root=tmp_path / "cache")
+    key = _request().cache_key()
+    with cache.lock(key), pytest.raises(FileLockTimeout):
+        cache.lock(key, timeout=0.1).acquire()
+    with cache.lock(key, timeout=0.1):
+        pass
+
+
+class MissingProvider:
+    name = "missing"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        self.calls += 1
+        raise DataNotFoundError("no data for symbol")
+
+
+class CountingFailingProvider(FailingProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        self.calls += 1
+        return super().fetch(request)
+
+
+def test_circuit_breaker_opens_and_half_opens() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] = 11.0
+    assert breaker.allow()  # half-open probe
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["trips"] == 1
+
+
+def test_data_manager_skips_open_circuits_and_known_missing(tmp_path: Path) -> None:
+    failing = CountingFailingProvider()
+    missing = MissingProvider()
+    manager = DataManager(
+        cache=LocalDataCache(root=tmp_path / "cache"),
+        providers=[failing, missing],
+        breaker_threshold=2,
+    )
+    for _ in range(3):
+        with pytest.raises(DataFetchError):
+            manager.fetch(_request())
+    assert failing.calls == 2
+    assert missing.calls == 1
+
+    stats = manager.stats()
+    assert stats["providers"]["failing"]["state"] == "open"
+    assert stats["providers"]["failing"]["rejected"] == 1
+    assert stats["providers"]["missing"]["state"] == "closed"
+    assert stats["negative_cache"]["hits"] == 2
+
+    with pytest.raises(ValueError, match="unique"):
+        DataManager(cache=LocalDataCache(root=tmp_path / "cache"), providers=[missing, MissingProvider()])
+
+
+class ScriptedProvider:
+    """Local stand-in provider with a scripted outcome; `hold()` keeps it busy until `release()`."""
+
+    def __init__(self, name: str, frame: pd.DataFrame | None = None) -> None:
+        self.name = name
+        self.frame = frame
+        self.calls = 0
+        self.finished = False
+        self._gate = threading.Event()
+        self._gate.set()
+
+    def hold(self) -> "ScriptedProvider":
+        self._gate.clear()
+        return self
+
+    def release(self) -> None:
+        self._gate.set()
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        self.calls += 1
+        try:
+            assert self._gate.wait(timeout=30.0)
+            if self.frame is None:
+                raise DataProviderError(f"{self.name} scripted failure")
+            return self.frame
+        finally:
+            self.finished = True
+
+
+def test_hedged_fetch_races_slow_primary(tmp_path: Path) -> None:
+    slow = ScriptedProvider("slow", frame=_canonical_frame()).hold()
+    fast = ScriptedProvider("fast", frame=_canonical_frame())
+    manager = DataManager(
+        cache=LocalDataCache(root=tmp_path / "cache"), providers=[slow, fast], hedge_delay=0.05
+    )
+    frame = manager.fetch(_request())
+    # The primary is still blocked, so the frame can only have come from the hedge.
+    assert not slow.finished and slow.calls == 1
+    assert len(frame) == 3
+    assert fast.calls == 1
+    slow.release()
+
+
+def test_hedged_fetch_starts_named_providers_immediately(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from quantbacktest.data import manager as manager_module
+
+    broken = ScriptedProvider("broken")
+    slow = ScriptedProvider("slow", frame=_canonical_frame()).hold()
+    backup = ScriptedProvider("backup", frame=_canonical_frame(days=2))
+    manager = DataManager(
+        cache=LocalDataCache(root=tmp_path / "cache"),
+        providers=[slow, broken, backup],
+        hedge_immediately=("backup",),
+    )
+    frame = manager.fetch(_request())
+    assert len(frame) == 2
+    assert broken.calls == 0
+    slow.release()
+
+    # A failed attempt starts the next provider at once rather than after `hedge_delay`.
+    timed_out: list[float | None] = []
+
+    def wait(
+        futures: list[Future[object]], timeout: float | None = None, return_when: str = ALL_COMPLETED
+    ) -> tuple[set[Future[object]], set[Future[object]]]:
+        done, not_done = futures_wait(futures, timeout=timeout, return_when=return_when)
+        if not done:
+            timed_out.append(timeout)
+        return done, not_done
+
+    monkeypatch.setattr(manager_module, "wait", wait)
+    failing = DataManager(
+        cache=LocalDataCache(root=tmp_path / "other"),
+        providers=[ScriptedProvider("a"), ScriptedProvider("b")],
+        hedge_delay=10.0,
+    )
+    with pytest.raises(DataFetchError):
+        failing.fetch(_request())
+    assert timed_out == []
+
+
+def test_market_arrays_share_memory_with_validated_frame() -> None:
+    frame = DataValidator().validate(_canonical_frame(), _request())
+    arrays = MarketArrays.from_frame("aapl", frame, fields=("close",))
+    assert np.shares_memory(arrays.fields["close"], frame["close"].to_numpy())
+    assert np.shares_memory(arrays.timestamps, frame["timestamp"].array.asi8)
+
+    events = arrays.to_events()
+    assert [event.symbol for event in events] == ["AAPL"] * 3
+    assert [event.price for event in events] == frame["close"].tolist()
+    assert [event.timestamp for event in events] == [ts.timestamp() for ts in frame["timestamp"]]
+
+
+def test_cache_index_tracks_entries_and_evicts_lru(tmp_path: Path) -> None:
+    cache = LocalDataCache(root=tmp_path / "cache")
+    for key in ("a", "b", "c"):
+        cache.store_frame(key, _canonical_frame(), manifest=CacheManifest.from_frame(key, _canonical_frame(), "1"))
+    assert cache.contains("a") and not cache.contains("zzz")
+    entry = cache.index.get("frame", "a")
+    assert entry is not None and entry.row_count == 3
+    assert entry.start_ns == pd.Timestamp("2020-01-01", tz="UTC").value
+
+    per_entry = entry.size_bytes
+    assert cache.load_frame("a") is not None  # "b" is now least recently used
+    evicted = cache.prune(max_bytes=2 * per_entry)
+    assert [item.key for item in evicted] == ["b"]
+    assert cache.load_frame("b") is None and not cache._manifest_path_for("b").exists()
+
+    cache.max_bytes = 2 * per_entry
+    cache.store_frame("d", _canonical_frame())
+    assert not cache.contains("c") and cache.contains("d") and cache.contains("a")
+
+    # A fresh index adopts files left by an unindexed cache.
+    (cache.root / "index.sqlite").unlink()
+    for suffix in ("-wal", "-shm"):
+        (cache.root / f"index.sqlite{suffix}").unlink(missing_ok=True)
+    reopened = LocalDataCache(root=tmp_path / "cache")
+    assert reopened.contains("a") and reopened.contains("d")
+
+
+def test_cache_clear_removes_unindexed_files(tmp_path: Path) -> None:
+    cache = LocalDataCache(root=tmp_path / "cache")
+    cache.store_frame("a", _canonical_frame(), manifest=CacheManifest.from_frame("a", _canonical_frame(), "1"))
+    cache.set("payload", {"x": 1})
+    cache.store_arrays("panel", {"close": np.arange(3.0)})
+    # One entry lost its index row; another file predates the index entirely.
+    cache.index.remove("frame", "a")
+    (cache.frames_dir / "legacy.csv").write_text("timestamp,close\n", encoding="utf-8")
+
+    cache.clear()
+    leftovers = [path for path in (tmp_path / "cache").rglob("*") if path.is_file() and "index.sqlite" not in path.name]
+    assert leftovers == []
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_index_batches_touches_until_order_is_read(tmp_path: Path) -> None:
+    import sqlite3
+    from itertools import count
+
+    with LocalDataCache(root=tmp_path / "cache") as cache:
+        ticks = count(1)
+        cache.index.clock = lambda: float(next(ticks))
+        for key in ("a", "b"):
+            cache.store_frame(key, _canonical_frame())
+        statements: list[str] = []
+        cache.index._conn.set_trace_callback(statements.append)
+        for _ in range(5):
+            assert cache.load_frame("a") is not None
+        assert not any(statement.startswith("UPDATE") for statement in statements)
+        assert [entry.key for entry in cache.index.entries()] == ["b", "a"]
+        assert sum(statement.startswith("UPDATE") for statement in statements) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        cache.contains("a")
+
+
+def test_cache_cli_reports_and_repairs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from quantbacktest.data.cli import main as cache_cli_main
+
+    cache = LocalDataCache(root=tmp_path / "cache")
+    frame = _canonical_frame()
+    cache.store_frame("good", frame, manifest=CacheManifest.from_frame("good", frame, "1"))
+    cache.store_frame("gone", frame)
+    cache.store_frame("tampered", frame, manifest=CacheManifest.from_frame("tampered", frame, "1"))
+    cache._frame_path_for("gone").unlink()
+    tampered = cache._frame_path_for("tampered")
+    tampered.write_text(tampered.read_text().replace("100.5", "900.5"))
+
+    cache_cli_main(["--cache-dir", str(cache.root), "verify", "--deep", "--repair"])
+    report = json.loads(capsys.readouterr().out)
+    assert report["missing"] == ["frame:gone"]
+    assert report["corrupt"] == ["frame:tampered"]
+
+    cache_cli_main(["--cache-dir", str(cache.root), "stats"])
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["kinds"]["frame"]["entries"] == 1
+
+    cache_cli_main(["--cache-dir", str(cache.root), "prune", "--max-bytes", "0"])
+    assert json.loads(capsys.readouterr().out)["bytes"] == 0
+    assert not cache.contains("good")
+
+
+def test_prefetcher_overlaps_fetches_in_order_with_bounded_lookahead(tmp_path: Path) -> None:
+    started: list[str] = []
+    consumed: list[str] = []
+    fetched = threading.Condition()
+
+    def fetch(request: DataRequest) -> str:
+        with fetched:
+            started.append(request.symbol)
+            fetched.notify_all()
+        if request.symbol == "BAD":
+            raise DataFetchError(message="missing", causes=[])
+        return request.symbol.lower()
+
+    symbols = ["A", "B", "BAD", "C", "D", "E"]
+    requests = [
+        DataRequest(symbol=s, start=datetime(2020, 1, 1), end=datetime(2020, 1, 2)) for s in symbols
+    ]
+    depth = 2
+    prefetcher = Prefetcher(fetch, requests, depth=depth, return_exceptions=True)
+    for index, (request, result) in enumerate(prefetcher):
+        # Started so far: everything consumed, the request being consumed, and at most `depth` beyond it.
+        assert len(started) <= len(consumed) + 1 + depth
+        consumed.append(request.symbol)
+        if request.symbol == "BAD":
+            assert isinstance(result, DataFetchError)
+        else:
+            assert result == request.symbol.lower()
+        # The next `depth` requests load in the background while this one is being consumed.
+        ahead = set(symbols[index + 1 : index + 1 + depth])
+        with fetched:
+            assert fetched.wait_for(lambda ahead=ahead: ahead <= set(started), timeout=30.0)
+    assert consumed == symbols
+    stats = prefetcher.stats()
+    assert stats["delivered"] == len(symbols)
+
+    with pytest.raises(DataFetchError):
+        list(Prefetcher(fetch, requests, depth=2))
+
+
+@pytest.mark.parametrize("frame_suffix", ["csv", "npz"])
+def test_dtype_policy_narrows_at_ingest_and_survives_cache(tmp_path: Path, frame_suffix: str) -> None:
+    frame = _canonical_frame().assign(symbol="AAPL")
+    frame["close"] = [100.01, 101.37, 102.99]
+    provider = StubProvider(frame)
+    cache = LocalDataCache(root=tmp_path / "cache", frame_suffix=frame_suffix)
+    manager = DataManager(cache=cache, providers=[provider], dtype_policy=DtypePolicy(tick_size=0.01))
+
+    fetched = manager.fetch(_request())
+    assert fetched["close"].dtype == np.float32
+    assert fetched["volume"].dtype == np.uint32
+    assert isinstance(fetched["symbol"].dtype, pd.CategoricalDtype)
+    np.testing.assert_allclose(fetched["close"].to_numpy(), frame["close"].to_numpy(), atol=0.005)
+
+    cached = manager.fetch(_request())
+    assert provider.calls == 1
+    assert cached["close"].dtype == np.float32 and cached["volume"].dtype == np.uint32
+    np.testing.assert_array_equal(cached["close"].to_numpy(), fetched["close"].to_numpy())
+    assert cache.load_manifest(_request().cache_key()).matches(cached, manager.validator.version, mode="hash")
+
+
+def test_dtype_policy_reports_precision_it_cannot_keep() -> None:
+    frame = _canonical_frame()
+    frame["close"] = [16_777_217.0, 16_777_219.0, 16_777_221.0]  # odd integers above 2**24
+    frame["volume"] = [0.5, 1.25, 5e9]
+    narrowed, report = DtypePolicy(tick_size=1.0).apply(frame)
+    assert report.rejected == ["close"]
+    assert narrowed["close"].dtype == np.float64 and narrowed["open"].dtype == np.float32
+    assert report.columns["close"].max_abs_error == 1.0
+    assert narrowed["volume"].dtype == np.float32
+    assert report.bytes_after < report.bytes_before
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from quantbacktest.data import DataManager, DataRequest, LocalDataCache, PanelLoader
+from quantbacktest.data.errors import DataNotFoundError, DataProviderError
+from quantbacktest.utils import Tracer
+
+
+class FrameProvider:
+    name = "frames"
+
+    def __init__(self, frames: dict[str, pd.DataFrame]) -> None:
+        self.frames = frames
+        self.calls = 0
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        self.calls += 1
+        if request.symbol not in self.frames:
+            raise DataNotFoundError(f"no data for {request.symbol}")
+        return self.frames[request.symbol]
+
+
+def _frame(days: list[int], closes: list[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": [datetime(2020, 1, day, tzinfo=timezone.utc) for day in days],
+            "open": closes,
+            "high": closes,
+            "low": closes,
+            "close": closes,
+            "volume": [100.0] * len(days),
+        }
+    )
+
+
+def test_panel_loader_aligns_fills_and_caches(tmp_path: Path) -> None:
+    provider = FrameProvider(
+        {
+            "AAA": _frame([1, 2, 3, 4], [10.0, 11.0, 12.0, 13.0]),
+            "BBB": _frame([2, 4], [20.0, 21.0]),
+        }
+    )
+    manager = DataManager(cache=LocalDataCache(root=tmp_path / "cache"), providers=[provider])
+    loader = PanelLoader(manager, fields=("close", "volume"))
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2020, 1, 5, tzinfo=timezone.utc)
+
+    panel = loader.load(["AAA", "BBB", "ZZZ"], start, end)
+    assert panel.symbols == ["AAA", "BBB", "ZZZ"]
+    assert panel.missing == ["ZZZ"]
+    close = panel.matrix("close")
+    assert close.shape == (4, 3)
+    np.testing.assert_allclose(close[:, 1], [np.nan, 20.0, 20.0, 21.0])
+    np.testing.assert_array_equal(panel.valid[:, 1], [False, True, False, True])
+    np.testing.assert_allclose(panel.matrix("volume")[:, 1], [0.0, 100.0, 0.0, 100.0])
+    assert np.isnan(close[:, 2]).all()
+
+    calls = provider.calls
+    reloaded = loader.load(["AAA", "BBB", "ZZZ"], start, end)
+    assert provider.calls == calls
+    np.testing.assert_array_equal(reloaded.timestamps, panel.timestamps)
+    np.testing.assert_allclose(reloaded.matrix("close"), close)
+    assert reloaded.to_frame("close").index[0] == pd.Timestamp("2020-01-01", tz="UTC")
+
+
+def test_panel_loader_records_data_spans(tmp_path: Path) -> None:
+    provider = FrameProvider({"AAA": _frame([1, 2], [10.0, 11.0]), "BBB": _frame([2], [20.0])})
+    tracer = Tracer()
+    manager = DataManager(cache=LocalDataCache(root=tmp_path / "cache"), providers=[provider], tracer=tracer)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    PanelLoader(manager, fields=("close",)).load(["AAA", "BBB", "ZZZ"], start, datetime(2020, 1, 4, tzinfo=timezone.utc))
+
+    spans = [(event["name"], event["args"].get("symbol")) for event in tracer.events() if event["ph"] == "X"]
+    assert ("data.fetch", "ZZZ") in spans and ("data.validate", "AAA") in spans and ("data.provider", "BBB") in spans
+
+
+def test_panel_with_retryable_failures_is_not_cached(tmp_path: Path) -> None:
+    class FlakyProvider(FrameProvider):
+        failed = False
+
+        def fetch(self, request: DataRequest) -> pd.DataFrame:
+            if request.symbol == "BBB" and not self.failed:
+                self.failed = True
+                raise DataProviderError("connection reset")
+            return super().fetch(request)
+
+    provider = FlakyProvider({"AAA": _frame([1, 2], [10.0, 11.0]), "BBB": _frame([1, 2], [20.0, 21.0])})
+    loader = PanelLoader(DataManager(cache=LocalDataCache(root=tmp_path / "cache"), providers=[provider]), prefetch=1)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2020, 1, 3, tzinfo=timezone.utc)
+
+    assert loader.load(["BBB", "AAA"], start, end).missing == ["BBB"]
+    retried = loader.load(["BBB", "AAA"], start, end)
+    assert retried.missing == [] and retried.matrix("close")[:, 0].tolist() == [20.0, 21.0]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantbacktest.data import DataManager, DataRequest, LocalDataCache
+from quantbacktest.data.resample import ResamplingProvider, interval_ns, resample_bars
+
+
+class MinuteProvider:
+    name = "minutes"
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self.calls = 0
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        self.calls += 1
+        assert request.interval == "1m"
+        return self.frame
+
+
+def _minutes(start: str, periods: int) -> pd.DataFrame:
+    prices = np.arange(periods, dtype="float64")
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(start, periods=periods, freq="1min", tz="UTC"),
+            "open": prices,
+            "high": prices + 1.0,
+            "low": prices - 1.0,
+            "close": prices + 0.5,
+            "volume": np.full(periods, 10.0),
+        }
+    )
+
+
+def test_interval_parsing() -> None:
+    assert interval_ns("5m") == 5 * 60 * 1_000_000_000
+    assert interval_ns("1wk") == 7 * interval_ns("1d")
+    with pytest.raises(ValueError):
+        interval_ns("1mo")
+
+
+def test_resample_bars_aggregates_ohlcv_with_session_alignment() -> None:
+    # 2024-03-11 13:30 UTC is the 09:30 New York open (after the DST change).
+    frame = _minutes("2024-03-11 13:00", 120)
+    bars = resample_bars(frame, "1h", session_start="09:30", session_end="16:00", timezone="America/New_York")
+    assert list(bars["timestamp"]) == [
+        pd.Timestamp("2024-03-11 13:30", tz="UTC"),
+        pd.Timestamp("2024-03-11 14:30", tz="UTC"),
+    ]
+    first = bars.iloc[0]
+    assert first["open"] == 30.0
+    assert first["high"] == 90.0
+    assert first["low"] == 29.0
+    assert first["close"] == 89.5
+    assert first["volume"] == 600.0
+
+
+def test_resampling_provider_derives_and_caches_coarser_intervals(tmp_path: Path) -> None:
+    cache = LocalDataCache(root=tmp_path / "cache")
+    minutes = MinuteProvider(_minutes("2020-01-02 00:00", 60))
+    base = DataManager(cache=cache, providers=[minutes])
+    derived = DataManager(cache=cache, providers=[ResamplingProvider(base, base_interval="1m")])
+
+    start = datetime(2020, 1, 2, tzinfo=timezone.utc)
+    end = datetime(2020, 1, 2, 1, 0, tzinfo=timezone.utc)
+    five = derived.fetch(DataRequest(symbol="AAPL", start=start, end=end, interval="5m"))
+    assert len(five) == 12
+    assert five["volume"].sum() == 600.0
+    fifteen = derived.fetch(DataRequest(symbol="AAPL", start=start, end=end, interval="15m"))
+    assert len(fifteen) == 4
+    assert minutes.calls == 1
+
+    cached = derived.fetch(DataRequest(symbol="AAPL", start=start, end=end, interval="5m"))
+    pd.testing.assert_frame_equal(cached.reset_index(drop=True), five, check_dtype=False)
+    assert minutes.calls == 1
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantbacktest.core.events import MarketEvent
+from quantbacktest.data import DataManager, DataRequest, LocalDataCache, SnapshotProvider, SnapshotStore
+from quantbacktest.data.errors import DataNotFoundError, DataValidationError
+from quantbacktest.engine import BacktestRunner, BacktestSettings
+from quantbacktest.strategy.base import StaticSignalStrategy
+
+
+class MinuteProvider:
+    name = "minutes"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(self, request: DataRequest) -> pd.DataFrame:
+        self.calls += 1
+        stamps = pd.date_range(request.start, request.end, freq="1min", inclusive="left")
+        closes = 100.0 + np.arange(len(stamps)) * 0.01
+        return pd.DataFrame(
+            {"timestamp": stamps, "open": closes, "high": closes, "low": closes, "close": closes, "volume": 1.0}
+        )
+
+
+def _request(days: int) -> DataRequest:
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    return DataRequest(symbol="AAA", start=start, end=start + timedelta(days=days), interval="1m")
+
+
+def test_snapshots_share_chunks_and_rehydrate_offline(tmp_path: Path) -> None:
+    provider = MinuteProvider()
+    manager = DataManager(cache=LocalDataCache(root=tmp_path / "cache"), providers=[provider])
+    store = SnapshotStore(tmp_path / "snapshots", chunk_rows=256)
+    for days in (2, 3):
+        manager.fetch(_request(days))
+
+    short_id = store.capture(manager, [_request(2)])
+    chunks_after_short = store.stats()["chunks"]
+    long_id = store.capture(manager, [_request(3)])
+    assert short_id != long_id
+    assert store.capture(manager, [_request(2)]) == short_id
+
+    short_chunks = store.load(short_id).entries[_request(2).cache_key()].chunks
+    long_chunks = store.load(long_id).entries[_request(3).cache_key()].chunks
+    # Only the tail chunk of the shorter range differs; the rest is shared.
+    assert short_chunks[:-1] == long_chunks[: len(short_chunks) - 1]
+    assert store.stats()["chunks"] < chunks_after_short + len(long_chunks)
+
+    calls = provider.calls
+    replay = DataManager(
+        cache=LocalDataCache(root=tmp_path / "replay"), providers=[SnapshotProvider(store, long_id)]
+    )
+    restored = replay.fetch(_request(3))
+    original = manager.fetch(_request(3))
+    assert provider.calls == calls
+    np.testing.assert_array_equal(restored["close"].to_numpy(), original["close"].to_numpy())
+    assert (restored["timestamp"].array.asi8 == original["timestamp"].array.asi8).all()
+
+    with pytest.raises(DataNotFoundError):
+        store.frame(short_id, _request(3))
+
+
+def test_snapshot_restores_column_dtypes(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots", chunk_rows=256)
+    frame = MinuteProvider().fetch(_request(1))
+    as_floats = frame.assign(volume=2.0)
+    as_ints = frame.assign(volume=np.full(len(frame), 2, dtype=np.int64))
+    store.create([(_request(1), as_floats)])
+    restored = store.frame(store.create([(_request(1), as_ints)]), _request(1))
+
+    # The int frame reuses the float frame's chunks but still comes back as ints.
+    assert store.stats()["chunks"] == len(store.put_frame(as_floats))
+    assert restored.dtypes.to_dict() == as_ints.dtypes.to_dict()
+    pd.testing.assert_frame_equal(restored, as_ints)
+
+
+def test_snapshot_detects_corrupted_chunks(tmp_path: Path) -> None:
+    manager = DataManager(cache=LocalDataCache(root=tmp_path / "cache"), providers=[MinuteProvider()])
+    store = SnapshotStore(tmp_path / "snapshots")
+    snapshot_id = store.capture(manager, [_request(1)])
+    digest = store.load(snapshot_id).entries[_request(1).cache_key()].chunks[0]
+    path = store.objects_dir / digest[:2] / f"{digest}.npz"
+    with np.load(path) as bundle:
+        arrays = {name: bundle[name] for name in bundle.files}
+    arrays["close"] = arrays["close"] + 1.0
+    with path.open("wb") as handle:
+        np.savez(handle, **arrays)
+
+    with pytest.raises(DataValidationError, match="corrupted"):
+        store.rehydrate(snapshot_id)
+    assert len(store.rehydrate(snapshot_id, verify=False)[_request(1).cache_key()]) == 1440
+
+
+def test_runner_records_data_snapshot(tmp_path: Path) -> None:
+    settings = BacktestSettings(run_id="pinned", output_dir=tmp_path, data_snapshot="abc123")
+    runner = BacktestRunner(StaticSignalStrategy(weights={"AAA": 0.1}), settings=settings)
+    runner.run([MarketEvent("AAA", 100.0 + idx, 1_577_836_800.0 + idx * 60.0) for idx in range(3)])
+    payload = json.loads((tmp_path / "pinned" / "metadata.json").read_text())
+    assert payload["data_snapshot"] == "abc123"
@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from pathlib import Path
 
-from quantbacktest.core.events import MarketEvent
+import pytest
+
+from quantbacktest.core.events import MarketEvent, SignalEvent
 from quantbacktest.engine import BacktestRunner, BacktestSettings, EngineMode
 from quantbacktest.strategy.base import StaticSignalStrategy
 from quantbacktest.metrics.analyzer import analyze_engine_result
@@ -39,3 +41,271 @@ def test_walk_forward_creates_multiple_segments(tmp_path: Path) -> None:
     result = runner.run(_events())
     assert len(result.segments) >= 2
     assert all(segment.segment_id.startswith("wf-") for segment in result.segments)
+
+
+def test_event_scheduler_orders_by_time_priority_and_sequence() -> None:
+    from quantbacktest.core import EventScheduler, OrderEvent, TimerEvent
+
+    scheduler = EventScheduler()
+    order = OrderEvent(order_id="o1", symbol="AAPL", quantity=1, direction="BUY")
+    scheduler.schedule_at(order, 10.0)
+    scheduler.extend([MarketEvent("MSFT", 1.0, 10.0), MarketEvent("AAPL", 2.0, 10.0), MarketEvent("AAPL", 3.0, 5.0)])
+    scheduler.put(TimerEvent(name="eod", timestamp=10.0))
+
+    assert scheduler.get().price == 3.0  # type: ignore[union-attr]
+    timestamp, batch = scheduler.pop_batch()
+    assert timestamp == 10.0
+    assert [type(event).__name__ for event in batch] == ["MarketEvent", "MarketEvent", "TimerEvent", "OrderEvent"]
+    assert [event.symbol for event in batch[:2]] == ["MSFT", "AAPL"]  # type: ignore[attr-defined]
+
+    scheduler.schedule_after(TimerEvent(name="later", timestamp=0.0), 2.5)
+    assert scheduler.peek_time() == 12.5
+    with pytest.raises(ValueError):
+        scheduler.schedule_at(order, 9.0)
+
+
+class _TimerStrategy(StaticSignalStrategy):
+    def generate_signals(self, event: MarketEvent):  # type: ignore[override]
+        if self._processed_events == 1:
+            self.context.schedule_timer("rebalance", delay=90.0)  # type: ignore[union-attr]
+        return []
+
+    def on_timer(self, event):  # type: ignore[no-untyped-def]
+        return [SignalEvent(symbol="AAPL", strength=0.2, direction="LONG", timestamp=event.timestamp)]
+
+
+def test_order_latency_and_timers_fill_against_later_bars(tmp_path: Path) -> None:
+    settings = BacktestSettings(run_id="latency", output_dir=tmp_path, order_latency=60.0)
+    runner = BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.2}), settings=settings)
+    fills = runner.run(_events()).segments[0].fills
+    # Signals from bar i fill on bar i + 1; the last bar's order fills against the last bar.
+    assert [fill.fill_price for fill in fills] == pytest.approx([101.0, 102.0, 103.0, 104.0, 104.0], rel=1e-2)
+
+    runner = BacktestRunner(_TimerStrategy(), settings=BacktestSettings(run_id="timer", output_dir=tmp_path))
+    fills = runner.run(_events()).segments[0].fills
+    # Timer fires 90s after bar 0, i.e. between bars 1 and 2, so it fills on bar 1's price.
+    assert len(fills) == 1 and fills[0].fill_price == pytest.approx(101.0, rel=1e-2)
+
+
+class _DipBuyer(StaticSignalStrategy):
+    def generate_signals(self, event: MarketEvent):  # type: ignore[override]
+        if self._processed_events == 1:
+            return [SignalEvent(symbol="AAPL", strength=0.1, direction="LONG", order_type="LIMIT", limit_price=97.0)]
+        return []
+
+
+def test_limit_signals_rest_until_a_later_bar_crosses(tmp_path: Path) -> None:
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+    prices = [100.0, 99.0, 98.0, 96.5, 101.0]
+    events = [MarketEvent("AAPL", price, base + idx * 60.0) for idx, price in enumerate(prices)]
+    runner = BacktestRunner(_DipBuyer(), settings=BacktestSettings(run_id="resting", output_dir=tmp_path))
+    fills = runner.run(events).segments[0].fills
+    assert len(fills) == 1
+    assert fills[0].timestamp == base + 180.0 and fills[0].quantity == 10
+
+
+class _Upsizer(_DipBuyer):
+    def generate_signals(self, event: MarketEvent):  # type: ignore[override]
+        if self._processed_events == 3:
+            book = self.context.order_book  # type: ignore[union-attr]
+            (order,) = book.open_orders("AAPL")
+            book.replace(order.order_id, quantity=100, market=event)
+        return super().generate_signals(event)
+
+
+def test_replaced_orders_are_checked_against_risk_limits(tmp_path: Path) -> None:
+    from quantbacktest.portfolio import RiskLimits
+
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+    prices = [100.0, 99.0, 98.0, 98.0, 96.5]
+    events = [MarketEvent("AAPL", price, base + idx * 60.0) for idx, price in enumerate(prices)]
+    # 0.5% of 1M equity at 98 allows 51 shares, so raising the resting 10 to 100 is clipped.
+    limits = RiskLimits(max_position_weight=0.005)
+    settings = BacktestSettings(run_id="replace-risk", output_dir=tmp_path, risk_limits=limits)
+    fills = BacktestRunner(_Upsizer(), settings=settings).run(events).segments[0].fills
+    assert [(fill.timestamp, fill.quantity) for fill in fills] == [(base + 240.0, 51)]
+
+
+def test_limit_submitted_on_a_bar_ignores_that_bars_range(tmp_path: Path) -> None:
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+    # The first bar closes at 99 but traded down to 96 before the close; the 97 buy limit is sent at that close.
+    events = [
+        MarketEvent("AAPL", 99.0, base, low=96.0, high=100.0),
+        MarketEvent("AAPL", 98.0, base + 60.0, low=97.5, high=99.0),
+        MarketEvent("AAPL", 97.5, base + 120.0, low=96.5, high=98.0),
+    ]
+    runner = BacktestRunner(_DipBuyer(), settings=BacktestSettings(run_id="no-lookahead", output_dir=tmp_path))
+    fills = runner.run(events).segments[0].fills
+    assert [fill.timestamp for fill in fills] == [base + 120.0]
+    assert fills[0].fill_price == pytest.approx(97.0, rel=1e-3)
+
+
+class _Overlapping(StaticSignalStrategy):
+    """Two sleeves trading the same names: a long sleeve and a partly offsetting short one."""
+
+    def generate_signals(self, event: MarketEvent):  # type: ignore[override]
+        return [
+            SignalEvent(symbol=event.symbol, strength=0.3, direction="LONG"),
+            SignalEvent(symbol=event.symbol, strength=0.1, direction="SHORT"),
+            SignalEvent(symbol="AAPL", strength=0.05, direction="SHORT"),
+        ]
+
+
+def test_signal_netting_emits_one_order_per_symbol_and_timestamp(tmp_path: Path) -> None:
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+    events = [MarketEvent(symbol, 100.0, base + idx * 60.0) for idx in range(2) for symbol in ("AAPL", "MSFT")]
+
+    netted = BacktestRunner(_Overlapping(), settings=BacktestSettings(run_id="net", output_dir=tmp_path)).run(events)
+    segment = netted.segments[0]
+    # Per timestamp: AAPL +30 -10 -5 -5 and MSFT +30 -10, each netted to a single order.
+    assert sorted((fill.symbol, fill.quantity, fill.direction) for fill in segment.fills) == [
+        ("AAPL", 10, "BUY"),
+        ("AAPL", 10, "BUY"),
+        ("MSFT", 20, "BUY"),
+        ("MSFT", 20, "BUY"),
+    ]
+    assert segment.netting == {
+        "signals": 12,
+        "orders": 4,
+        "orders_avoided": 8,
+        "fills_avoided": 8,
+        "shares_avoided": 120,
+    }
+
+    settings = BacktestSettings(run_id="gross", output_dir=tmp_path, net_signals=False)
+    gross = BacktestRunner(_Overlapping(), settings=settings).run(events).segments[0]
+    assert len(gross.fills) == 12 and gross.netting is None
+    assert gross.portfolio_snapshot["AAPL"] == segment.portfolio_snapshot["AAPL"] == 20
+
+
+class _Weights(StaticSignalStrategy):
+    def generate_signals(self, event: MarketEvent):  # type: ignore[override]
+        weight = {"AAPL": 0.5, "MSFT": 0.25}[event.symbol] if self._processed_events <= 2 else 0.0
+        return [SignalEvent(symbol=event.symbol, strength=0.0, direction="LONG", target_weight=weight)]
+
+
+def test_target_weight_signals_are_sized_by_the_rebalancer(tmp_path: Path) -> None:
+    from quantbacktest.core.execution import ExecutionConfig, SimulatedExecutionHandler, SlippageModel, SpreadModel
+    from quantbacktest.portfolio import Rebalancer
+
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+    events = [MarketEvent(symbol, 100.0, base + idx * 60.0) for idx in range(2) for symbol in ("AAPL", "MSFT")]
+    settings = BacktestSettings(
+        run_id="weights", output_dir=tmp_path, initial_cash=100_000.0, rebalancer=Rebalancer(lot_size=100)
+    )
+    handler = SimulatedExecutionHandler(ExecutionConfig(slippage=SlippageModel(bps=0.0), spread=SpreadModel(bps=0.0)))
+    runner = BacktestRunner(_Weights(), settings=settings, execution_handler=handler)
+    fills = runner.run(events).segments[0].fills
+    assert [(fill.symbol, fill.quantity, fill.direction) for fill in fills] == [
+        ("AAPL", 500, "BUY"),
+        ("MSFT", 200, "BUY"),
+        ("AAPL", 500, "SELL"),
+        ("MSFT", 200, "SELL"),
+    ]
+
+
+def test_dispatch_table_runs_extra_stages_and_counts_calls(tmp_path: Path) -> None:
+    from quantbacktest.core.events import EventType, FillEvent
+
+    seen: list[FillEvent] = []
+    settings = BacktestSettings(run_id="dispatch", output_dir=tmp_path, instrument_handlers=True)
+    runner = BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.2}), settings=settings)
+    runner.add_handler(EventType.FILL, seen.append, "audit.fills")
+    segment = runner.run(_events()).segments[0]
+
+    assert seen == segment.fills and seen
+    stats = segment.handler_stats
+    assert stats is not None
+    assert stats["strategy.market"]["calls"] == stats["portfolio.mark"]["calls"] == 5
+    assert stats["audit.fills"]["calls"] == stats["portfolio.fill"]["calls"] == len(seen)
+    assert all(entry["seconds"] >= 0 for entry in stats.values())
+
+    plain = BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.2}), settings=BacktestSettings(output_dir=tmp_path))
+    assert plain.run(_events()).segments[0].handler_stats is None
+
+
+def test_stage_timings_reach_metadata_and_metrics_report(tmp_path: Path) -> None:
+    import json
+
+    settings = BacktestSettings(run_id="timed", output_dir=tmp_path)
+    result = BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.2}), settings=settings).run(_events())
+    payload = json.loads((tmp_path / "timed" / "metadata.json").read_text())
+
+    segment = payload["segments"][0]["timings"]
+    assert segment["events"] == 10 and segment["market_events"] == 5 and segment["fills"] == 5
+    assert set(segment["stages"]) == {"strategy", "execution", "portfolio", "scheduling"}
+    assert segment["stages"]["strategy"] > 0 and segment["events_per_second"] > 0
+    assert set(payload["timings"]["stages"]) == {"strategy", "execution", "portfolio", "scheduling", "io"}
+    assert result.timings is not None and result.timings["events"] == 10
+    assert "## Stage Timings" in (tmp_path / "timed" / "metrics.md").read_text()
+
+
+def test_tracer_writes_chrome_trace_with_lane_per_worker(tmp_path: Path) -> None:
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    from quantbacktest.utils import Tracer, merge_traces
+
+    single = BacktestRunner(
+        StaticSignalStrategy(weights={"AAPL": 0.2}),
+        settings=BacktestSettings(run_id="traced", output_dir=tmp_path, trace=True),
+    )
+    single.run(_events())
+    spans = json.loads((tmp_path / "traced" / "trace.json").read_text())["traceEvents"]
+    names = {event["name"] for event in spans if event["ph"] == "X"}
+    assert {"run", "plan", "segment", "strategy.prepare", "strategy.market", "checkpoint", "report"} <= names
+    run = next(event for event in spans if event["name"] == "run")
+    segment = next(event for event in spans if event["name"] == "segment")
+    assert run["ts"] <= segment["ts"] and segment["ts"] + segment["dur"] <= run["ts"] + run["dur"]
+
+    shared = Tracer(process_name="grid")
+
+    def leg(index: int) -> None:
+        settings = BacktestSettings(run_id=f"leg-{index}", output_dir=tmp_path, enable_progress=False)
+        BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.1 * index}), settings=settings, tracer=shared).run(
+            _events()
+        )
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="leg") as pool:
+        list(pool.map(leg, [1, 2]))
+    # Runners never write a tracer they were handed; its owner writes every run at once.
+    assert not (tmp_path / "leg-1" / "trace.json").exists()
+    grid = shared.write(tmp_path / "grid.json")
+    merged = json.loads(merge_traces([tmp_path / "traced" / "trace.json", grid], tmp_path / "all.json").read_text())
+    merged = merged["traceEvents"]
+    lanes = {(event["pid"], event["tid"]) for event in merged if event["name"] == "run"}
+    assert len([event for event in merged if event["name"] == "run"]) == 3
+    assert len(lanes) >= 2 and any(event["args"]["name"] == "grid" for event in merged if event["ph"] == "M")
+
+
+def test_risk_limits_clip_orders_and_report_stats(tmp_path: Path) -> None:
+    import json
+
+    from quantbacktest.portfolio import RiskLimits
+
+    # 0.5% of 1M equity caps AAPL near 49 shares; each bar asks for 20 more.
+    settings = BacktestSettings(run_id="risk", output_dir=tmp_path, risk_limits=RiskLimits(max_position_weight=0.005))
+    result = BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.2}), settings=settings).run(_events())
+    fills = result.segments[0].fills
+    assert [fill.quantity for fill in fills] == [20, 20, 9]
+    risk = json.loads((tmp_path / "risk" / "metadata.json").read_text())["segments"][0]["risk"]
+    assert risk == {
+        "orders": 5, "approved": 2, "clipped": 1, "rejected": 2, "shares_cut": 51, "breaches": {"position": 3}
+    }
+    assert "risk" in result.segments[0].stage_timings["stages"]
+
+
+def test_risk_reservations_cover_orders_still_in_flight(tmp_path: Path) -> None:
+    from quantbacktest.portfolio import RiskLimits
+
+    # Orders fill two bars after they are sent, so each decision sees earlier orders still in flight.
+    settings = BacktestSettings(
+        run_id="risk-latency",
+        output_dir=tmp_path,
+        order_latency=120.0,
+        risk_limits=RiskLimits(max_position_weight=0.005),
+    )
+    runner = BacktestRunner(StaticSignalStrategy(weights={"AAPL": 0.2}), settings=settings)
+    fills = runner.run(_events()).segments[0].fills
+    assert sum(fill.quantity for fill in fills) <= 49
+    assert runner.portfolio is not None and runner.portfolio.positions["AAPL"].quantity <= 49
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 
 from quantbacktest.core.events import MarketEvent, OrderEvent
+from quantbacktest.core.orderbook import OrderBook
 from quantbacktest.core.execution import (
     CommissionModel,
     ExecutionConfig,
@@ -75,3 +76,132 @@ def test_partial_fill_behavior() -> None:
     assert len(fills) >= 2
     total_qty = sum(fill.quantity for fill in fills)
     assert total_qty == 10
+
+
+def _book() -> OrderBook:
+    return OrderBook(SimulatedExecutionHandler(ExecutionConfig(slippage=SlippageModel(bps=0.0), spread=SpreadModel(bps=0.0))))
+
+
+def _limit(order_id: str, direction: str, price: float, **kwargs: object) -> OrderEvent:
+    return OrderEvent(
+        order_id=order_id, symbol="AAPL", quantity=10, direction=direction, order_type="LIMIT", limit_price=price, **kwargs  # type: ignore[arg-type]
+    )
+
+
+def test_order_book_rests_limits_and_fills_only_crossed_orders() -> None:
+    book = _book()
+    bar = MarketEvent(symbol="AAPL", price=100.0, timestamp=0.0)
+    for order in (_limit("b98", "BUY", 98.0), _limit("b95", "BUY", 95.0), _limit("s103", "SELL", 103.0)):
+        assert book.submit(order, bar) == []
+    assert len(book) == 3
+
+    dip = MarketEvent(symbol="AAPL", price=99.0, timestamp=60.0, metadata={"low": 97.5, "high": 99.5})
+    fills = book.on_market(dip)
+    assert [(fill.order_id, fill.fill_price) for fill in fills] == [("b98", 98.0)]
+    assert "b95" in book and "b98" not in book
+
+    book.replace("s103", limit_price=101.0)
+    stop = OrderEvent(order_id="stp", symbol="AAPL", quantity=5, direction="SELL", order_type="STOP", stop_price=96.0)
+    book.submit(stop, dip)
+    assert book.cancel("b95") is not None and book.cancel("b95") is None
+
+    crash = MarketEvent(symbol="AAPL", price=94.0, timestamp=120.0, metadata={"low": 93.0, "high": 101.5})
+    fills = book.on_market(crash)
+    assert {fill.order_id: fill.fill_price for fill in fills} == {"s103": 101.0, "stp": 94.0}
+    assert len(book) == 0
+
+
+def test_order_book_partial_fills_carry_over_and_orders_expire() -> None:
+    handler = SimulatedExecutionHandler(
+        ExecutionConfig(slippage=SlippageModel(bps=0.0), spread=SpreadModel(bps=0.0), resting_fill_ratio=0.5)
+    )
+    book = OrderBook(handler)
+    book.submit(_limit("part", "BUY", 100.0))
+    book.submit(_limit("day", "BUY", 90.0, time_in_force="DAY", timestamp=1_000.0))
+    assert book.submit(_limit("ioc", "BUY", 90.0, time_in_force="IOC"), MarketEvent("AAPL", 100.0, 1_000.0)) == []
+    assert "ioc" not in book
+
+    quantities = [sum(f.quantity for f in book.on_market(MarketEvent("AAPL", 99.0, t))) for t in (2_000.0, 3_000.0)]
+    assert quantities == [5, 3]
+    assert book.open_orders("AAPL")[0].quantity == 2
+
+    book.on_market(MarketEvent("AAPL", 120.0, 86_400.0))
+    assert book.expired == ["day"] and "part" in book
+
+
+def test_execute_batch_matches_scalar_path() -> None:
+    from quantbacktest.portfolio import PortfolioState
+
+    handler = SimulatedExecutionHandler(
+        ExecutionConfig(
+            slippage=SlippageModel(bps=3.0),
+            spread=SpreadModel(bps=1.5),
+            commissions=CommissionModel(per_share=0.005),
+            partial_fill_ratio=0.3,
+        )
+    )
+    markets = {
+        symbol: MarketEvent(symbol=symbol, price=price, timestamp=7.0)
+        for symbol, price in (("AAA", 101.37), ("BBB", 19.9), ("CCC", 250.0))
+    }
+    orders = [
+        OrderEvent(order_id="o1", symbol="AAA", quantity=37, direction="BUY"),
+        OrderEvent(order_id="o2", symbol="BBB", quantity=1, direction="SELL"),
+        OrderEvent(order_id="o3", symbol="CCC", quantity=12, direction="BUY", order_type="LIMIT", limit_price=240.0),
+        OrderEvent(order_id="o4", symbol="CCC", quantity=9, direction="SELL", order_type="LIMIT", limit_price=249.5),
+        OrderEvent(order_id="o5", symbol="ZZZ", quantity=5, direction="BUY"),
+        OrderEvent(order_id="o6", symbol="AAA", quantity=1000, direction="SELL"),
+    ]
+    scalar = [fill for order in orders if order.symbol in markets for fill in handler.execute(order, markets[order.symbol])]
+    batch = handler.execute_batch(orders, markets)
+    assert batch.events() == scalar
+    assert set(batch.order_id) == {"o1", "o2", "o4", "o6"}
+
+    one_by_one, bulk = PortfolioState(starting_cash=1e6), PortfolioState(starting_cash=1e6)
+    for fill in scalar:
+        one_by_one.apply_fill(fill)
+    bulk.apply_fill_batch(batch)
+    assert bulk.snapshot() == one_by_one.snapshot()
+    assert bulk.trade_log == one_by_one.trade_log
+
+
+def test_participation_cap_carries_remainder_with_sqrt_impact() -> None:
+    import numpy as np
+
+    from quantbacktest.core.execution import SquareRootImpactModel
+
+    impact = SquareRootImpactModel(coefficient=1.0, window=3)
+    closes = np.array([100.0, 101.0, 99.0, 100.0, 102.0])
+    impact.add_series("AAPL", np.arange(5) * 60.0, closes, np.full(5, 1_000.0))
+    handler = SimulatedExecutionHandler(
+        ExecutionConfig(
+            slippage=SlippageModel(bps=0.0), spread=SpreadModel(bps=0.0), max_participation=0.1, impact=impact
+        )
+    )
+    book = OrderBook(handler)
+    bars = [
+        MarketEvent("AAPL", close, i * 60.0, volume=1_000.0, low=close - 1, high=close + 1)
+        for i, close in enumerate(closes.tolist())
+    ]
+
+    first = book.submit(OrderEvent(order_id="big", symbol="AAPL", quantity=250, direction="BUY"), bars[0])
+    limit = book.submit(_limit("lim", "BUY", 105.0), bars[0])
+    # The market order takes the whole 10% of the first bar; the limit waits for volume.
+    assert [fill.quantity for fill in first] == [100] and limit == []
+    assert first[0].fill_price == 100.0  # no history yet, so no impact
+
+    second = book.on_market(bars[3])
+    assert [(fill.order_id, fill.quantity) for fill in second] == [("big", 100)]
+    returns = np.diff(np.log(closes[:3]))
+    expected_bps = returns.std(ddof=1) * np.sqrt(100 / 1_000.0) * 10_000
+    assert second[0].slippage_bps == pytest.approx(expected_bps)
+    assert second[0].fill_price == pytest.approx(100.0 * (1 + expected_bps / 10_000))
+
+    third = book.on_market(bars[4])
+    assert [(fill.order_id, fill.quantity) for fill in third] == [("big", 50), ("lim", 10)]
+    assert len(book) == 0
+
+    orders = [OrderEvent(order_id="a", symbol="AAPL", quantity=300, direction="SELL")]
+    scalar = handler.execute(orders[0], bars[4])
+    assert handler.execute_batch(orders, {"AAPL": bars[4]}).events() == scalar
+    assert sum(fill.quantity for fill in scalar) == 100
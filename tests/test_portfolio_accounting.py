@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 from quantbacktest.core.events import FillEvent
-from quantbacktest.portfolio import PortfolioState
+from quantbacktest.portfolio import PortfolioState, Rebalancer, RiskEngine, RiskLimits
 
 
 def _fill(symbol: str, quantity: int, direction: str, price: float, commission: float = 0.0) -> FillEvent:
@@ -60,3 +63,76 @@ def test_margin_and_trade_export(tmp_path: Path) -> None:
     portfolio.export_trades(export_path)
     content = export_path.read_text()
     assert "QQQ" in content
+
+
+def test_rebalancer_rounds_lots_filters_small_trades_and_caps_turnover() -> None:
+    portfolio = PortfolioState(starting_cash=100_000.0)
+    portfolio.apply_fill(_fill("OLD", 37, "BUY", 10.0))
+    portfolio.apply_fill(_fill("AAA", 100, "BUY", 50.0))
+    prices = {"AAA": 50.0, "BBB": 20.0, "CCC": 1_000.0, "OLD": 10.0}
+
+    targets = {"AAA": 0.1, "BBB": 0.25, "CCC": 0.004, "OLD": 0.0}
+    plan = Rebalancer(lot_size=10, min_trade_value=500.0).plan(targets, prices, portfolio)
+    # AAA: 200 target -> +100; BBB: 1250 -> +1250; CCC: 0.4 shares rounds to 0; OLD exits its odd lot.
+    assert dict(zip(plan.symbols, plan.delta.tolist())) == {"AAA": 100, "BBB": 1250, "CCC": 0, "OLD": -37}
+    assert [(order.symbol, order.quantity, order.direction) for order in plan.orders()] == [
+        ("AAA", 100, "BUY"),
+        ("BBB", 1250, "BUY"),
+        ("OLD", 37, "SELL"),
+    ]
+    assert Rebalancer(min_trade_value=6_000.0).plan({"AAA": 0.1}, prices, portfolio).skipped == 1
+
+    capped = Rebalancer(lot_size=10, max_turnover=0.1).plan({"AAA": 0.1, "BBB": 0.25}, prices, portfolio)
+    assert capped.scaled and capped.turnover <= 0.1
+    assert capped.delta.tolist() == [30, 410]  # a third of each trade, rounded down to lots
+
+    # Exits close in full under the turnover cap; unlisted names in `symbols` are left alone.
+    exiting = Rebalancer(lot_size=10, max_turnover=0.1).plan(
+        {"AAA": 0.1, "BBB": 0.25, "OLD": 0.0}, prices, portfolio, symbols=["AAA", "BBB", "OLD", "CCC"]
+    )
+    assert dict(zip(exiting.symbols, exiting.delta.tolist())) == {"AAA": 30, "BBB": 400, "OLD": -37, "CCC": 0}
+    assert Rebalancer().plan({"BBB": 0.1}, prices, portfolio, symbols=["AAA", "BBB"]).delta[0] == 0
+
+    universe = [f"S{i:04d}" for i in range(3_000)]
+    weights = np.full(len(universe), 1.0 / len(universe))
+    large = Rebalancer(lot_size=1).plan(weights, np.linspace(5.0, 500.0, len(universe)), portfolio, symbols=universe)
+    assert len(large.orders()) == len(large) > 0 and large.turnover <= 1.0
+
+
+def test_risk_engine_clips_rejects_and_scales_against_incremental_exposure() -> None:
+    portfolio = PortfolioState(starting_cash=100_000.0)
+    risk = RiskEngine(RiskLimits(max_leverage=1.0, max_position_weight=0.25), portfolio)
+    risk.on_market("AAA", 100.0)
+    risk.on_market("BBB", 50.0)
+    assert risk.check("AAA", 300) == 250  # 25% of equity at 100
+    assert risk.check("AAA", 100) == 0 and risk.check("AAA", -100) == -100
+    assert risk.stats.as_dict() | {"breaches": None} == {
+        "orders": 3, "approved": 1, "clipped": 1, "rejected": 1, "shares_cut": 150, "breaches": None
+    }
+
+    risk.clear_reservations()
+    portfolio.apply_fill(_fill("AAA", 200, "BUY", 100.0))
+    risk.on_fill("AAA", 200, 100.0)
+    portfolio.mark_price("AAA", 110.0)
+    risk.on_market("AAA", 110.0)
+    assert risk.gross == pytest.approx(portfolio.exposure_summary()["gross_exposure"])
+
+    prices = np.array([110.0, 50.0, 100.0])
+    strict = RiskEngine(RiskLimits(max_leverage=0.5, max_position_weight=0.25, action="reject"), portfolio)
+    assert strict.check_batch(["AAA", "BBB", "CCC"], np.array([100, 200, 100]), prices).tolist() == [0, 200, 100]
+    scaled = RiskEngine(RiskLimits(max_leverage=0.5, action="scale"), portfolio)
+    deltas = scaled.check_batch(["AAA", "BBB", "CCC"], np.array([100, 400, 200]), prices)
+    assert deltas.tolist() == [56, 227, 113]  # 29k of room over 51k requested: one factor for every name
+    assert scaled.gross <= 0.5 * portfolio.equity
+
+
+def test_risk_reservations_last_until_orders_fill_or_are_released() -> None:
+    risk = RiskEngine(RiskLimits(max_position_weight=0.25), PortfolioState(starting_cash=100_000.0))
+    risk.on_market("AAA", 100.0)
+    assert risk.check("AAA", 200, order_id="o1") == 200
+    assert risk.check("AAA", 100, order_id="o2") == 50  # o1 is still in flight and counts
+    risk.on_fill("AAA", 150, 100.0, "o1")
+    assert risk.exposure("AAA") == 250 and risk.open_orders == 2
+    risk.release("o1")  # the unfilled 50 shares of o1 were cancelled
+    risk.release("o2")
+    assert risk.exposure("AAA") == 150 and risk.open_orders == 0 and risk.gross == 15_000.0